@@ -1,9 +1,20 @@
 import enum
-import functools
+import os
+import pickle
+import time
+import warnings
 from collections import deque
-from typing import NewType, Generator, Callable, Deque, Any
+from types import MappingProxyType
+from typing import NewType, Generator, Callable, Deque, Any, Mapping, TYPE_CHECKING
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, InitVar
+
+from race2.frontier import PathTable, ROOT, Frontier, BreadthFirst, DepthFirst
+from race2.stats import Stats, LatencyHistogram
+from race2.store.abstract import EdgeStore
+
+if TYPE_CHECKING:
+    from race2.multiprocessing.snapshot import SnapshotPool
 
 ProcessID = NewType("ProcessID", int)
 StateID = NewType("StateID", int)
@@ -28,6 +39,26 @@ class Stop(BaseException):
     pass
 
 
+@dataclass(frozen=True)
+class Access:
+    """
+    May be yielded by a process instead of a bare `StateID` to declare the shared resources the step that led to
+    `label` has read or written. The sets must cover everything the step may touch regardless of the values it
+    has read. The state of the process is `label`, `Access` is only used by `race2.dpor.DPORVisitor`.
+    """
+
+    label: StateID
+    reads: frozenset[str] = frozenset()
+    writes: frozenset[str] = frozenset()
+
+    def __post_init__(self):
+        object.__setattr__(self, "reads", frozenset(self.reads))
+        object.__setattr__(self, "writes", frozenset(self.writes))
+
+    def is_dependent(self, other: "Access") -> bool:
+        return bool(self.writes & (other.reads | other.writes) or other.writes & self.reads)
+
+
 Path = NewType("Path", list[ProcessID])
 
 
@@ -52,6 +83,16 @@ class Execution:
     )
     handle_step: Callable[[], None] = lambda: None
 
+    # resources declared by the last step, `None` if the step did not yield an `Access`
+    last_access: Access | None = None
+
+    # groups of processes running the same code, any permutation of the processes within a group is assumed to
+    # lead to an equivalent execution. See `Visitor._visit_edge`.
+    symmetric_groups: list[list[ProcessID]] = field(default_factory=list)
+
+    # snapshot of the state shared by the processes (i.e. a copy of a database), passed to `Visitor.invariants`
+    global_state: Callable[[], Any] = lambda: None
+
     def add_process(
             self,
             process_id: ProcessID,
@@ -62,7 +103,7 @@ class Execution:
             raise AssertionError("already exists", process_id)
 
         self.curr_processes[process_id] = fun
-        self._curr_state[process_id] = SpecialState.Entry
+        self._curr_state = self._curr_state.replace(process_id, SpecialState.Entry)
 
         self.handle_terminate_process[process_id] = handle_terminate or (lambda x: None)
 
@@ -87,7 +128,9 @@ class Execution:
             self.handle_terminate_process[
                 new_process_id
             ] = self.handle_terminate_process.pop(process_id)
-        self._curr_state[new_process_id] = self._curr_state.states.pop(process_id)
+        self._curr_state = self._curr_state.remove(process_id).replace(
+            new_process_id, self._curr_state.states[process_id]
+        )
 
     @property
     def available_processes(self) -> list[ProcessID]:
@@ -95,7 +138,7 @@ class Execution:
 
     @property
     def curr_state(self) -> "ExecutionState":
-        return self._curr_state.copy()
+        return self._curr_state
 
     def from_path(self, path: Path) -> "Execution":
         for x in path:
@@ -115,8 +158,14 @@ class Execution:
             del self.curr_processes[process_id]
             handle_terminate_process = True
 
+        self.last_access = None
+
         try:
             next_state_id = next(self.curr_processes[process_id])
+
+            if isinstance(next_state_id, Access):
+                self.last_access = next_state_id
+                next_state_id = next_state_id.label
         except StopIteration as exc:
             # we intentionally do not handle any exceptions here, exiting is exiting.
             # these should be handled up the call stack
@@ -131,7 +180,7 @@ class Execution:
 
         self.curr_path.append(process_id)
 
-        self._curr_state[process_id] = next_state_id
+        self._curr_state = self._curr_state.replace(process_id, next_state_id)
 
         self.handle_step()
 
@@ -166,31 +215,56 @@ class Execution:
         return rtn
 
 
-@dataclass
 class ExecutionState:
-    states: dict[ProcessID, UniqueState] = field(default_factory=dict)
+    """
+    Immutable state of every process of an execution, stored as a tuple of `(ProcessID, UniqueState)` sorted by
+    the process id. The hash is computed once, when the state is created.
+    """
 
-    def __hash__(self):
+    __slots__ = ("items", "_hash", "_states")
+
+    items: tuple[tuple[ProcessID, UniqueState], ...]
+
+    def __init__(self, states: dict[ProcessID, UniqueState] | None = None):
+        self._init(tuple(sorted((states or {}).items(), key=lambda x: x[0])))
+
+    def _init(self, items: tuple[tuple[ProcessID, UniqueState], ...]) -> None:
         def map_hash(v: UniqueState) -> int:
             if isinstance(v, BaseException):
-                return hash(v.__class__)
+                # by the name of the type rather than its id, so that the hash is the same in another interpreter
+                return hash((v.__class__.__module__, v.__class__.__qualname__))
             else:
                 return hash(v)
 
-        return functools.reduce(
-            lambda a, b: hash(a) ^ hash(b), sorted((k, map_hash(v)) for k, v in self.states.items()), hash(0)
-        )
+        self.items = items
+        self._hash = hash(tuple((k, map_hash(v)) for k, v in items))
+        self._states = None
+
+    @classmethod
+    def _from_items(cls, items: tuple[tuple[ProcessID, UniqueState], ...]) -> "ExecutionState":
+        rtn = cls.__new__(cls)
+        rtn._init(items)
+        return rtn
+
+    @property
+    def states(self) -> Mapping[ProcessID, UniqueState]:
+        if self._states is None:
+            self._states = MappingProxyType(dict(self.items))
+        return self._states
+
+    def __hash__(self):
+        return self._hash
 
     def __eq__(self, other: "ExecutionState | Any") -> bool:
-        if not isinstance(other, ExecutionState):
+        if self is other:
+            return True
+        elif not isinstance(other, ExecutionState):
+            return False
+        elif self._hash != other._hash or len(self.items) != len(other.items):
             return False
         else:
-            missing = object()
-            for k in set(self.states.keys()) | set(other.states.keys()):
-                val_a = self.states.get(k, missing)
-                val_b = other.states.get(k, missing)
-
-                if (val_a is missing) ^ (val_b is missing):
+            for (k_a, val_a), (k_b, val_b) in zip(self.items, other.items):
+                if k_a != k_b:
                     return False
                 elif isinstance(val_a, BaseException):
                     if not isinstance(val_b, BaseException):
@@ -205,19 +279,106 @@ class ExecutionState:
 
             return True
 
+    def __repr__(self):
+        return f"{self.__class__.__name__}(states={dict(self.items)!r})"
+
+    def __reduce__(self):
+        # hashes of strings are not stable between interpreters, so it is never pickled
+        return self.__class__, (dict(self.items),)
+
     @classmethod
     def zero(cls):
         return ExecutionState({})
 
     def copy(self) -> "ExecutionState":
-        return ExecutionState(dict(self.states))
+        return self
 
-    def __setitem__(self, key: ProcessID, value: UniqueState) -> None:
-        self.states[key] = value
+    def replace(self, process_id: ProcessID, value: UniqueState) -> "ExecutionState":
+        items = list(self.items)
+        for i, (k, _) in enumerate(items):
+            if k == process_id:
+                items[i] = (process_id, value)
+                break
+        else:
+            items.append((process_id, value))
+            items.sort(key=lambda x: x[0])
+        return self._from_items(tuple(items))
+
+    def remove(self, process_id: ProcessID) -> "ExecutionState":
+        return self._from_items(tuple(x for x in self.items if x[0] != process_id))
+
+    def permute(self, permutation: dict[ProcessID, ProcessID]) -> "ExecutionState":
+        return ExecutionState({permutation.get(k, k): v for k, v in self.states.items()})
+
+    def symmetric_permutation(
+            self, groups: list[list[ProcessID]], process_id: ProcessID | None = None
+    ) -> dict[ProcessID, ProcessID]:
+        """
+        Permutation of the processes within each of `groups` that brings the state to its canonical form: the
+        processes of a group are sorted by their states. Among processes with equal states, `process_id` is put
+        first, so that the steps of any of them map to the same canonical edge.
+        """
+
+        def sort_key(x: ProcessID) -> tuple[str, str, bool, ProcessID]:
+            value = self.states[x]
+            # must be consistent with `__eq__`
+            if isinstance(value, BaseException):
+                return type(value).__qualname__, "", x != process_id, x
+            else:
+                return type(value).__qualname__, repr(value), x != process_id, x
+
+        rtn: dict[ProcessID, ProcessID] = {}
+        for group in groups:
+            members = sorted(x for x in group if x in self.states)
+            for src, dst in zip(sorted(members, key=sort_key), members):
+                if src != dst:
+                    rtn[src] = dst
+        return rtn
 
 
 ExecutionFactory = NewType("ExecutionFactory", Callable[[], Execution])
 
+# a predicate over a reached state and the `Execution.global_state` snapshot taken in it
+Invariant = Callable[[ExecutionState, Any], bool]
+
+
+@dataclass
+class Discovery:
+    """
+    A newly visited edge, or a newly reached root state if `pre_state` is `None`, see `Visitor.discover`
+    """
+
+    pre_state: ExecutionState | None
+    process_id: ProcessID | None
+    post_state: ExecutionState
+    # whether `post_state` has not been reached before
+    is_new_state: bool
+
+    @property
+    def exceptions(self) -> dict[ProcessID, BaseException]:
+        return {k: v for k, v in self.post_state.items if isinstance(v, BaseException)}
+
+    @property
+    def is_terminal(self) -> bool:
+        """
+        Every process of `post_state` has terminated or raised
+        """
+        return all(v == SpecialState.Terminated or isinstance(v, BaseException) for _, v in self.post_state.items)
+
+
+@dataclass
+class Violation:
+    name: str
+    state: ExecutionState
+    global_state: Any
+    # the shortest known path from a root state to `state`
+    path: Path
+
+
+# fields of `Visitor` that are not stored by `Visitor.checkpoint`. The intern table is rebuilt from `states`, unless
+# it is shared with an `EdgeStore`.
+_CHECKPOINT_EXCLUDED = {"factory", "snapshot_pool", "invariants", "checkpoint_path", "state_ids", "_discoveries"}
+
 
 @dataclass
 class Visitor:
@@ -226,63 +387,490 @@ class Visitor:
     """
 
     factory: ExecutionFactory
-    is_depth_first: bool = False
+    # deprecated, pass `frontier=DepthFirst()` instead
+    is_depth_first: InitVar[bool] = False
+    # the order in which the queued paths are explored, `BreadthFirst` by default
+    frontier: Frontier | None = None
 
     visited_edges: dict[
         tuple[ExecutionState, ProcessID],
         dict[ExecutionState, int],
-    ] = field(default_factory=dict)
+    ] | EdgeStore = field(default_factory=dict)
     # we define visits as whole paths, but their uniqueness is checked as only the last edge of the path
     # a single edge is defined as: (process_id_from, state_from), (process_id_to)
 
-    # paths to cover
-    queue: Deque[Path] = field(default_factory=deque)
+    # paths of the `frontier` entries, and `PathTable.key` of every entry in the `frontier`, so that a path is not
+    # queued twice
+    paths: PathTable = field(default_factory=PathTable)
+    queued_keys: set[int] = field(default_factory=set)
 
     # todo maybe change this to a single state, it doesn't seem to make sense to have more than 1 really
     root_states: set[ExecutionState] = field(default_factory=set)
 
+    # every distinct state stored by the visitor is interned, so that `visited_edges` shares the same objects.
+    # `state_ids` gives a dense integer id of a state, which is its index in `states`
+    state_ids: dict[ExecutionState, int] = field(default_factory=dict)
+    states: list[ExecutionState] = field(default_factory=list)
+
+    # opt-in: park executions in forked processes at branching vertices and resume siblings from them
+    snapshot_pool: "SnapshotPool | None" = None
+
+    # `Execution.symmetric_groups` of the instantiated executions, if set, `visited_edges` is keyed by the
+    # canonical states only
+    symmetric_groups: list[list[ProcessID]] = field(default_factory=list)
+    # canonical edge -> post state in the frame of the canonical pre state, required to walk `visited_edges`
+    # along an actual path in `split_path_visited`
+    symmetric_successors: dict[tuple[ExecutionState, ProcessID], ExecutionState] = field(default_factory=dict)
+
+    # checked in the post state of every newly visited edge, the exploration stops at the first one that does not
+    # hold and records it in `violation`
+    invariants: dict[str, Invariant] = field(default_factory=dict)
+    violation: Violation | None = None
+
     paths_found_ctr: int = 0
     instantiation_ctr: int = 0
     edge_visit_ctr: int = 0
+    # edges of the seed prefixes that did not need to be replayed thanks to `snapshot_pool`
+    replay_saved_ctr: int = 0
+
+    # if set, `next` stores a checkpoint of the exploration there every `checkpoint_every` paths and when it returns
+    checkpoint_path: str | None = None
+    checkpoint_every: int = 1000
+    # `paths_found_ctr` at the last checkpoint
+    checkpoint_paths_ctr: int = 0
+
+    stats: Stats = field(default_factory=Stats)
+    # `vertex_flags[i]` is set if `states[i]` is a root state or an end of a visited edge
+    vertex_flags: bytearray = field(default_factory=bytearray, repr=False)
+
+    # if set, the durations of `Execution.next` are kept in `edge_latencies`, keyed as `visited_edges` is. They
+    # include the steps that only replay a known edge
+    is_timed: bool = False
+    edge_latencies: dict[tuple[ExecutionState, ProcessID], LatencyHistogram] = field(
+        default_factory=dict, repr=False
+    )
 
-    def __post_init__(self):
-        pass
+    # newly visited edges and root states, collected while `discover` is running
+    _discoveries: list[Discovery] | None = field(default=None, repr=False)
+
+    def __post_init__(self, is_depth_first: bool = False):
+        if is_depth_first:
+            warnings.warn("is_depth_first is deprecated, use frontier=DepthFirst() instead", DeprecationWarning, 3)
+
+            if self.frontier is None:
+                self.frontier = DepthFirst()
+            elif not isinstance(self.frontier, DepthFirst):
+                raise AssertionError("is_depth_first can not be used with a frontier", self.frontier)
+
+        if self.frontier is None:
+            self.frontier = BreadthFirst()
+
+        if isinstance(self.visited_edges, EdgeStore):
+            self.visited_edges.attach(self)
+
+        self.frontier.attach(self)
 
     @property
     def visited_vertices(self) -> list[ExecutionState]:
-        return list(
-            set(x for x, _ in self.visited_edges.keys())
-            | set(x for x in self.visited_edges.values())
-        )
+        return [self.states[i] for i, x in enumerate(self.vertex_flags) if x]
+
+    def _visit_vertex(self, state_id: int) -> None:
+        if state_id >= len(self.vertex_flags):
+            self.vertex_flags.extend(bytes(max(state_id + 1, 2 * len(self.vertex_flags)) - len(self.vertex_flags)))
+
+        if not self.vertex_flags[state_id]:
+            self.vertex_flags[state_id] = 1
+            self.stats.vertices += 1
+
+    def state_id(self, state: ExecutionState) -> int:
+        rtn = self.state_ids.get(state)
+        if rtn is None:
+            rtn = self.state_ids[state] = len(self.states)
+            self.states.append(state)
+        return rtn
+
+    def intern(self, state: ExecutionState) -> ExecutionState:
+        return self.states[self.state_id(state)]
+
+    def _visit_edge(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> bool:
+        """
+        :return: whether the edge has not been visited before
+        """
+        edge = pre_state, process_id, post_state
+
+        if self.symmetric_groups:
+            # the whole edge is moved to the frame of the canonical pre state, then the post state is made
+            # canonical on its own
+            permutation = pre_state.symmetric_permutation(self.symmetric_groups, process_id)
+            pre_state = pre_state.permute(permutation)
+            process_id = permutation.get(process_id, process_id)
+            post_state = post_state.permute(permutation)
+
+            self.symmetric_successors.setdefault((self.intern(pre_state), process_id), self.intern(post_state))
+
+            post_state = post_state.permute(post_state.symmetric_permutation(self.symmetric_groups))
+
+        is_new_state = self._discoveries is not None and post_state not in self.state_ids
+
+        if isinstance(self.visited_edges, EdgeStore):
+            is_new = self.visited_edges.add(pre_state, process_id, post_state)
+
+            if is_new:
+                pre_state_id = self.state_id(pre_state)
+                post_state_id = self.state_id(post_state)
+        else:
+            pre_state_id = self.state_id(pre_state)
+            post_state_id = self.state_id(post_state)
+            pre_state = self.states[pre_state_id]
+            post_state = self.states[post_state_id]
+
+            # there may be multiple visits of the same state twice, and the post_state may be
+            # also multiple
+            pre_state_key = (pre_state, process_id)
+
+            if pre_state_key not in self.visited_edges:
+                self.visited_edges[pre_state_key] = dict()
+
+            is_new = post_state not in self.visited_edges[pre_state_key]
+
+            if is_new:
+                self.visited_edges[pre_state_key][post_state] = 0
+
+            self.visited_edges[pre_state_key][post_state] += 1
+
+        if is_new:
+            self.stats.edges += 1
+            self._visit_vertex(pre_state_id)
+            self._visit_vertex(post_state_id)
+            self.frontier.on_edge(*edge)
+
+            if self._discoveries is not None:
+                self._discoveries.append(Discovery(*edge, is_new_state))
+
+        return is_new
+
+    def _visit_root(self, execution: "Execution") -> None:
+        if execution.curr_state in self.root_states:
+            return
+
+        if self._discoveries is not None:
+            self._discoveries.append(
+                Discovery(None, None, execution.curr_state, execution.curr_state not in self.state_ids)
+            )
+
+        state_id = self.state_id(execution.curr_state)
+        self.root_states.add(self.states[state_id])
+        self._visit_vertex(state_id)
+        self._check_invariants(execution)
+
+    def _edge_key(self, pre_state: ExecutionState, process_id: ProcessID) -> tuple[ExecutionState, ProcessID]:
+        if self.symmetric_groups:
+            permutation = pre_state.symmetric_permutation(self.symmetric_groups, process_id)
+            pre_state = pre_state.permute(permutation)
+            process_id = permutation.get(process_id, process_id)
+
+        return self.intern(pre_state), process_id
+
+    def _add_latency(self, key: tuple[ExecutionState, ProcessID], latency: LatencyHistogram) -> None:
+        if key not in self.edge_latencies:
+            self.edge_latencies[key] = LatencyHistogram()
+
+        self.edge_latencies[key].merge(latency)
+
+    def _time_step(self, pre_state: ExecutionState, process_id: ProcessID, duration: float) -> None:
+        self.stats.next_time += duration
+
+        if self.is_timed:
+            key = self._edge_key(pre_state, process_id)
+
+            if key not in self.edge_latencies:
+                self.edge_latencies[key] = LatencyHistogram()
+
+            self.edge_latencies[key].add(duration)
+
+    def _new_execution(self) -> "Execution":
+        started_at = time.perf_counter()
+        rtn = self.factory()
+        self.stats.factory_time += time.perf_counter() - started_at
+        return rtn
+
+    def _replay_step(self, execution: "Execution", process_id: ProcessID) -> None:
+        """
+        Steps `execution` along an edge that is known to have been visited, without visiting it again
+        """
+        pre_state = execution.curr_state
+
+        started_at = time.perf_counter()
+        execution.next(process_id)
+        self._time_step(pre_state, process_id, time.perf_counter() - started_at)
+        self.stats.replay_steps += 1
+
+    def _step(self, execution: "Execution", process_id: ProcessID) -> bool:
+        """
+        Steps `execution` and visits the edge taken
+        :return: whether the edge has not been visited before
+        """
+        pre_state = execution.curr_state
+
+        started_at = time.perf_counter()
+        execution.next(process_id)
+        self._time_step(pre_state, process_id, time.perf_counter() - started_at)
+        self.edge_visit_ctr += 1
+
+        if self._visit_edge(pre_state, process_id, execution.curr_state):
+            self.stats.new_steps += 1
+            self._check_invariants(execution)
+            return True
+
+        self.stats.replay_steps += 1
+        return False
+
+    def _stop(self, execution: "Execution") -> None:
+        if execution.available_processes:
+            started_at = time.perf_counter()
+            execution.stop()
+            self.stats.stop_time += time.perf_counter() - started_at
+
+    def _next_visited_state(self, state: ExecutionState, process_id: ProcessID) -> ExecutionState | None:
+        if not self.symmetric_groups:
+            # checked against `dict` first, as checking against an abstract class is comparatively slow
+            if not isinstance(self.visited_edges, dict):
+                return self.visited_edges.successor(state, process_id)
+
+            post_states = self.visited_edges.get((state, process_id))
+
+            if post_states is not None:
+                # this is a bit of a workaround, but fine otherwise
+                # this will always return the edge as unvisited once we have visited something rare.
+                return next(iter(post_states))
+            return None
+
+        permutation = state.symmetric_permutation(self.symmetric_groups, process_id)
+        key = state.permute(permutation), permutation.get(process_id, process_id)
+
+        if key in self.symmetric_successors:
+            return self.symmetric_successors[key].permute({v: k for k, v in permutation.items()})
+        return None
+
+    def shortest_path(self, state: ExecutionState) -> Path | None:
+        """
+        The shortest path from a root state to `state` along the visited edges
+        """
+        def key(x: ExecutionState) -> ExecutionState:
+            if self.symmetric_groups:
+                return x.permute(x.symmetric_permutation(self.symmetric_groups))
+            return x
+
+        state = key(state)
+
+        queue: Deque[tuple[ExecutionState, Path]] = deque((x, Path([])) for x in self.root_states)
+        visited_states: set[ExecutionState] = set(self.root_states)
+
+        while len(queue):
+            curr_state, path = queue.popleft()
+
+            if key(curr_state) == state:
+                return path
+
+            for process_id in curr_state.states.keys():
+                next_state = self._next_visited_state(curr_state, process_id)
+
+                if next_state is None or next_state in visited_states:
+                    continue
+
+                visited_states.add(next_state)
+                queue.append((next_state, Path(path + [process_id])))
+
+        return None
+
+    def _check_invariants(self, execution: Execution) -> bool:
+        """
+        :return: whether all of the `invariants` hold in the current state of `execution`
+        """
+        if not self.invariants:
+            return True
+
+        state = execution.curr_state
+        global_state = execution.global_state()
+
+        for name, invariant in self.invariants.items():
+            if invariant(state, global_state):
+                continue
+
+            path = Path(list(execution.curr_path))
+            shortest_path = self.shortest_path(state)
+
+            if shortest_path is not None and len(shortest_path) < len(path):
+                path = shortest_path
+
+            self.violation = Violation(name, state, global_state, path)
+            return False
+
+        return True
+
+    def checkpoint(self, path: str | None = None, pending: list[int] = ()) -> None:
+        """
+        Pickles the exploration to `path` (`checkpoint_path` by default), it is continued with `resume`. The file is
+        replaced atomically, so a crash while writing it keeps the previous checkpoint.
+
+        Callables held by the visitor are not stored, except for the ones of `frontier` and `visited_edges`,
+        which need to be picklable (i.e. module-level functions).
+        :param pending: entries of `paths` that have been popped from the `frontier` but are not done yet
+        """
+        if path is None:
+            path = self.checkpoint_path
+
+        self.checkpoint_paths_ctr = self.paths_found_ctr
+
+        state = {x.name: getattr(self, x.name) for x in fields(self) if x.name not in _CHECKPOINT_EXCLUDED}
+
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((type(self), state, list(pending)), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(path + ".tmp", path)
+
+    def _checkpoint_due(self, pending: list[int] = ()) -> None:
+        if self.checkpoint_path is not None and self.paths_found_ctr - self.checkpoint_paths_ctr >= self.checkpoint_every:
+            self.checkpoint(pending=pending)
+
+    @classmethod
+    def resume(cls, path: str, factory: ExecutionFactory, **kwargs) -> "Visitor":
+        """
+        Loads a visitor stored by `checkpoint`, `next` continues the exploration from where it has been stored
+        :param kwargs: fields that are not stored (`invariants`, `snapshot_pool`, ...) or are overridden
+        """
+        with open(path, "rb") as f:
+            visitor_cls, state, pending = pickle.load(f)
+
+        if not issubclass(visitor_cls, cls):
+            raise AssertionError("checkpoint is of a different visitor", visitor_cls, cls)
+
+        state.update(kwargs)
+        state.setdefault("checkpoint_path", path)
+
+        rtn = visitor_cls(factory, **state)
+
+        if not isinstance(rtn.visited_edges, EdgeStore):
+            rtn.state_ids = {x: i for i, x in enumerate(rtn.states)}
+
+        for x in pending:
+            rtn._push_entry(x)
+
+        return rtn
 
     def _can_push_path(self, path: Path) -> bool:
         is_potentially_reachable, _, path_unvisited = self.split_path_visited(path)
         return is_potentially_reachable and len(path_unvisited)
 
-    def _push_path(self, path: Path) -> None:
-        if self.is_depth_first:
-            self.queue.appendleft(path)
-        else:
-            self.queue.append(path)
+    def _push_entry(self, entry: int, state: ExecutionState | None = None) -> None:
+        """
+        :param state: the state the last process of the path is stepped from, if known
+        """
+        if entry != ROOT:
+            self.queued_keys.add(self.paths.entry_key(entry))
+
+        self.frontier.push(entry, state)
+
+    def _pop_entry(self) -> int:
+        rtn = self.frontier.pop()
+
+        if rtn != ROOT:
+            self.queued_keys.discard(self.paths.entry_key(rtn))
+
+        return rtn
+
+    def _sibling_entries(
+            self, seed_entry: int, seed: Path, path: Path, siblings: list[tuple[int, ProcessID]]
+    ) -> list[int | None]:
+        """
+        Adds the entries of `path[:i] + [x]` for every `(i, x)` in `siblings`, where `path` has been taken when
+        visiting `seed`. Paths that are queued already are not added again and are returned as `None`.
+        """
+        entries = self.paths.prefixes(seed_entry)
+
+        # `path` may have left `seed` before its end
+        common_length = 0
+        while common_length < min(len(seed), len(path)) and seed[common_length] == path[common_length]:
+            common_length += 1
+        del entries[common_length + 1:]
+
+        rtn: list[int | None] = []
+
+        for i, x in siblings:
+            # the entries of the prefixes of `path` after `seed` are only added if they are needed
+            while len(entries) <= i:
+                entries.append(self.paths.add(entries[-1], path[len(entries) - 1]))
+
+            if self.paths.key(entries[i], x) in self.queued_keys:
+                rtn.append(None)
+            else:
+                rtn.append(self.paths.add(entries[i], x))
+
+        return rtn
+
+    def _push_siblings(
+            self, seed_entry: int, seed: Path, path: Path,
+            siblings: list[tuple[int, ProcessID, ExecutionState | None]]
+    ) -> None:
+        """
+        Queues `path[:i] + [x]` for every `(i, x, state)` in `siblings`, see `_sibling_entries`
+        """
+        entries = self._sibling_entries(seed_entry, seed, path, [(i, x) for i, x, _ in siblings])
+
+        for entry, (_, _, state) in zip(entries, siblings):
+            if entry is not None:
+                self._push_entry(entry, state)
+
+    def _unvisited_siblings(
+            self, path: Path, siblings: list[tuple[int, ProcessID]]
+    ) -> list[tuple[int, ProcessID, ExecutionState | None]]:
+        """
+        The same as `_can_push_path` of `path[:i] + [x]` for every `(i, x)` in `siblings`, but with a single walk
+        :return: `(i, x, state)`, where `state` is the visited state reached at `path[:i]`, if any
+        """
+        walks: list[list[ExecutionState]] = []
+
+        for curr_state in self.root_states:
+            states = [curr_state]
+
+            for x in path:
+                curr_state = self._next_visited_state(curr_state, x)
+                if curr_state is None:
+                    break
+                states.append(curr_state)
+
+            walks.append(states)
+
+        return [
+            (i, x, next((states[i] for states in walks if i < len(states)), None))
+            for i, x in siblings
+            if any(i >= len(states) or self._next_visited_state(states[i], x) is None for states in walks)
+        ]
+
+    def _walk(self, state: ExecutionState, path: Path, index: int) -> tuple[ExecutionState, int]:
+        """
+        Continues walking `path` along the visited edges from `state`, reached at `path[:index]`
+        :return: the state reached and the index of the first edge of `path` that has not been visited
+        """
+        while index < len(path):
+            next_state = self._next_visited_state(state, path[index])
+
+            if next_state is None:
+                break
+
+            state = next_state
+            index += 1
+
+        return state, index
 
     def split_path_visited(self, path: Path) -> tuple[bool, Path, Path]:
         # have we already visited this path at least once?
         # note a single path can lead to different results, but this needs to be handled differently!
         for curr_state in self.root_states:
-            for i, next_process_id in enumerate(path):
-                # if curr_state != ExecutionState.zero() and all(
-                #     v == SpecialState.Exit for v in curr_state.states.values()
-                # ):
-                #     return False, path[:i], path[i:]
+            _, i = self._walk(curr_state, path, 0)
 
-                key = curr_state, next_process_id
-
-                if key in self.visited_edges:
-                    # this is a bit of a workaround, but fine otherwise
-                    # this will always return the edge as unvisited once we have visited something rare.
-                    curr_state = next(iter(self.visited_edges[key].keys()))
-                else:
-                    return True, path[:i], path[i:]
+            if i < len(path):
+                return True, path[:i], path[i:]
 
         return True, path, Path([])
 
@@ -321,84 +909,180 @@ class Visitor:
         :param should_push_path_fun:
         :return:
         """
-        self.instantiation_ctr += 1
-        current_execution: Execution = self.factory()
+        path, siblings = self._next_sub(seed, should_push_path_fun)
+        return [Path(path[:i] + [x]) for i, x in siblings]
+
+    def _next_sub(
+            self, seed: Path, should_push_path_fun: Callable[[Path], bool]
+    ) -> tuple[Path, list[tuple[int, ProcessID]]]:
+        """
+        :return: the path taken, and the paths that could have been taken instead as `(i, x)` for `path[:i] + [x]`
+        """
+        current_execution: Execution
+        if self.snapshot_pool is None:
+            current_execution = self._new_execution()
+            is_instantiated = True
+        else:
+            started_at = time.perf_counter()
+            current_execution, is_instantiated = self.snapshot_pool.resume(self.factory, seed)
+            self.stats.factory_time += time.perf_counter() - started_at
+            self.replay_saved_ctr += len(current_execution.curr_path)
+
+        if is_instantiated:
+            self.instantiation_ctr += 1
+            self.symmetric_groups = current_execution.symmetric_groups
 
-        self.root_states.add(current_execution.curr_state)
+            self._visit_root(current_execution)
 
         # how do we flag non-determinism?
 
-        rtn: list[Path] = []
-
-        while True:
-            # seed always increases by 1 path length (this is the way we visit all nodes)
-            # that means that if we did in fact NOT visit what we wanted before
-            available_processes = sorted(
-                [
-                    # using this to make preferred path at the top while the other paths at the bottom
-                    (preferred_path is None, x)
-                    for x in current_execution.available_processes
-                    for path in [Path(current_execution.curr_path + [x])]
-                    # todo we can also change the preferred path function
-                    for preferred_path in [self.decide_next_path(seed, path)]
-                    if should_push_path_fun(preferred_path or path)
-                ]
-            )
+        siblings: list[tuple[int, ProcessID]] = []
 
-            if not len(available_processes):
-                break
+        # with the default `should_push_path_fun` the position of `curr_path` and `seed` along the visited edges
+        # is tracked for every root state (see `_walk`), instead of walking every candidate path from the start
+        is_incremental = should_push_path_fun == self._can_push_path
+        curr_walks = [(x, 0) for x in self.root_states]
+        seed_walks = [(x, 0) for x in self.root_states]
 
-            (
-                _,
-                next_process_id,
-            ) = available_processes[0]
+        # whether `curr_path` is a prefix of `seed` or the other way around, see `decide_next_path`
+        is_on_seed = current_execution.curr_path == seed[:len(current_execution.curr_path)]
 
-            for _, x in available_processes:
-                rtn.append(Path(current_execution.curr_path + [x]))
+        try:
+            while self.violation is None:
+                curr_path = current_execution.curr_path
+                is_in_seed = len(curr_path) < len(seed)
 
-            pre_state = current_execution.curr_state
-            current_execution.next(next_process_id)
-            self.edge_visit_ctr += 1
-            post_state = current_execution.curr_state
+                if is_incremental:
+                    curr_walks = [self._walk(x, curr_path, i) for x, i in curr_walks]
+                    is_curr_path_visited = all(i == len(curr_path) for _, i in curr_walks)
 
-            # there may be multiple visits of the same state twice, and the post_state may be
-            # also multiple
-            pre_state_key = (pre_state, next_process_id)
+                    if is_on_seed and is_in_seed:
+                        seed_walks = [self._walk(x, seed, i) for x, i in seed_walks]
 
-            if pre_state_key not in self.visited_edges:
-                self.visited_edges[pre_state_key] = dict()
+                candidates: list[tuple[bool, ProcessID]] = []
 
-            if post_state not in self.visited_edges[pre_state_key]:
-                self.visited_edges[pre_state_key][post_state] = 0
+                for x in current_execution.available_processes:
+                    is_preferred = is_on_seed and (not is_in_seed or x == seed[len(curr_path)])
 
-            self.visited_edges[pre_state_key][post_state] += 1
+                    if not is_incremental:
+                        # the preferred path is the longer one of `seed` and the path being taken
+                        is_pushed = should_push_path_fun(
+                            seed if is_preferred and is_in_seed else Path(curr_path + [x])
+                        )
+                    elif is_preferred and is_in_seed:
+                        is_pushed = any(i < len(seed) for _, i in seed_walks)
+                    else:
+                        is_pushed = not is_curr_path_visited or any(
+                            self._next_visited_state(state, x) is None for state, _ in curr_walks
+                        )
 
-        if current_execution.available_processes:
-            current_execution.stop()
-        return rtn
+                    if is_pushed:
+                        # using this to make preferred path at the top while the other paths at the bottom
+                        candidates.append((not is_preferred, x))
+
+                # seed always increases by 1 path length (this is the way we visit all nodes)
+                # that means that if we did in fact NOT visit what we wanted before
+                available_processes = sorted(candidates)
+
+                if not len(available_processes):
+                    break
+
+                (
+                    _,
+                    next_process_id,
+                ) = available_processes[0]
 
-    def _next_once(self, path: Path, should_push_path_fun: Callable[[Path], bool]) -> None:
-        if path != Path([]) and not should_push_path_fun(path):
+                for _, x in available_processes:
+                    siblings.append((len(curr_path), x))
+
+                if self.snapshot_pool is not None and len(available_processes) > 1:
+                    self.snapshot_pool.park(current_execution)
+
+                if is_in_seed and next_process_id != seed[len(curr_path)]:
+                    is_on_seed = False
+
+                self._step(current_execution, next_process_id)
+
+            self._stop(current_execution)
+        finally:
+            if self.snapshot_pool is not None:
+                current_execution.close()
+        return Path(list(current_execution.curr_path)), siblings
+
+    def _next_once(self, entry: int, should_push_path_fun: Callable[[Path], bool]) -> None:
+        seed = self.paths.path(entry)
+
+        if seed != Path([]) and not should_push_path_fun(seed):
             return
 
         self.paths_found_ctr += 1
 
-        rtn = self.next_sub(path, lambda x: should_push_path_fun(x))
-        for new_item in rtn:
-            if self._can_push_path(new_item):
-                self._push_path(new_item)
+        path, siblings = self._next_sub(seed, should_push_path_fun)
+        self._push_siblings(entry, seed, path, self._unvisited_siblings(path, siblings))
 
     def next(self, max_iter_count: int | None = None, should_push_path_fun: Callable[[Path], bool] = None) -> None:
+        for _ in self._run(self._explore(max_iter_count, should_push_path_fun)):
+            pass
+
+    def _run(self, exploration: Generator[None, None, None]) -> Generator[None, None, None]:
+        """
+        Steps `exploration`, accounting the time spent in it to `stats`
+        """
+        try:
+            while True:
+                started_at = time.perf_counter()
+                try:
+                    next(exploration)
+                except StopIteration:
+                    return
+                finally:
+                    self.stats.elapsed += time.perf_counter() - started_at
+                    self.stats.tick(self.paths_found_ctr, len(self.frontier))
+                yield
+        finally:
+            exploration.close()
+
+    def discover(self, max_iter_count: int | None = None, **kwargs) -> Generator[Discovery, None, None]:
+        """
+        Explores the same way as `next`, but yields every newly visited edge and root state as soon as the path it
+        has been found on is done. The exploration is suspended while the consumer runs, and is stopped (leaving
+        the visitor as `next` would have) when the generator is closed.
+        """
+        if self._discoveries is not None:
+            raise AssertionError("discover is already running")
+
+        self._discoveries = []
+
+        try:
+            for _ in self._run(self._explore(max_iter_count, **kwargs)):
+                discoveries, self._discoveries = self._discoveries, []
+                yield from discoveries
+
+            yield from self._discoveries
+        finally:
+            self._discoveries = None
+
+    def _explore(
+            self, max_iter_count: int | None = None, should_push_path_fun: Callable[[Path], bool] = None
+    ) -> Generator[None, None, None]:
+        """
+        The exploration of `next`, suspended after every path
+        """
         if should_push_path_fun is None:
             should_push_path_fun = self._can_push_path
 
-        self._next_once(Path([]), should_push_path_fun)
+        self._next_once(ROOT, should_push_path_fun)
+        yield
 
         iter_ctr = 0
-        while len(self.queue) and (max_iter_count is None or iter_ctr < max_iter_count):
+        while len(self.frontier) and self.violation is None and (max_iter_count is None or iter_ctr < max_iter_count):
             iter_ctr += 1
-            next_item = self.queue.popleft()
-            self._next_once(next_item, should_push_path_fun)
+            self._next_once(self._pop_entry(), should_push_path_fun)
+            self._checkpoint_due()
+            yield
+
+        if self.checkpoint_path is not None:
+            self.checkpoint()
 
     def spanning_tree(
             self, truly_spanning: bool = False
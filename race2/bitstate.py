@@ -0,0 +1,173 @@
+import math
+from typing import Callable, Generator
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Visitor, ExecutionState, ProcessID, Path, Discovery
+from race2.frontier import ROOT, Frontier, DepthFirst
+
+# hashed to tell whether `bits` have been set by an interpreter with the same `PYTHONHASHSEED`
+_HASH_PROBE = "race2.bitstate"
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+@dataclass
+class BitstateVisitor(Visitor):
+    """
+    Approximate exploration for state spaces that do not fit in memory (SPIN's bitstate hashing).
+    Instead of storing `visited_edges`, every visited edge `(pre_state, process_id)` is only recorded as
+    `hash_count` bits of a Bloom filter of `bit_count` bits, so memory does not grow with the number of states.
+    The rows of `paths` are released once a path has been explored, so that only the queued paths are held, which
+    for the depth-first search are at most the siblings along the current path.
+
+    Two distinct edges may be mapped to the same bits, in which case the later one is wrongly considered to be
+    visited and is not explored (along with anything only reachable through it). The exploration is therefore a
+    best-effort one, `omission_probability` estimates the chance of having missed at least one edge.
+
+    The exploration is a depth-first search by default, every queued path is replayed through `factory`.
+    `visited_edges` stays empty.
+    """
+
+    frontier: Frontier = field(default_factory=DepthFirst)
+
+    bit_count: int = 2 ** 23
+    hash_count: int = 3
+
+    bits: bytearray = field(default=None, repr=False)
+
+    # number of bits set in `bits`
+    bits_set_ctr: int = 0
+    # number of edges recorded as visited
+    stored_ctr: int = 0
+    # expected number of edges that have been wrongly considered to be visited
+    expected_omissions: float = 0.0
+    # log of the probability that no edge has been wrongly considered to be visited
+    _log_no_omission: float = 0.0
+
+    hash_probe: int = field(default_factory=lambda: hash(_HASH_PROBE))
+
+    def __post_init__(self, is_depth_first: bool = False):
+        super().__post_init__(is_depth_first)
+
+        if self.bits is None:
+            self.bits = bytearray((self.bit_count + 7) // 8)
+
+        if self.hash_probe != hash(_HASH_PROBE):
+            raise AssertionError("bits have been set with a different PYTHONHASHSEED")
+
+    @property
+    def omission_probability(self) -> float:
+        return -math.expm1(self._log_no_omission)
+
+    def _bit_indices(self, state: ExecutionState, process_id: ProcessID) -> list[int]:
+        if self.symmetric_groups:
+            permutation = state.symmetric_permutation(self.symmetric_groups, process_id)
+            state = state.permute(permutation)
+            process_id = permutation.get(process_id, process_id)
+
+        # double hashing of a single 64-bit hash
+        h = hash((state, process_id)) & _MASK
+        h1 = (h * 0x9E3779B97F4A7C15) & _MASK
+        h2 = (((h ^ (h >> 29)) * 0xBF58476D1CE4E5B9) & _MASK) | 1
+
+        return [((h1 + i * h2) & _MASK) % self.bit_count for i in range(self.hash_count)]
+
+    def _is_visited(self, state: ExecutionState, process_id: ProcessID) -> bool:
+        return all(self.bits[x >> 3] & (1 << (x & 7)) for x in self._bit_indices(state, process_id))
+
+    def _visit_edge(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> bool:
+        indices = self._bit_indices(pre_state, process_id)
+
+        if all(self.bits[x >> 3] & (1 << (x & 7)) for x in indices):
+            return False
+
+        # chance of a new edge to have been found in the filter at the current fill ratio
+        false_positive = (self.bits_set_ctr / self.bit_count) ** self.hash_count
+        self.expected_omissions += false_positive
+        self._log_no_omission += math.log1p(-false_positive)
+
+        for x in indices:
+            if not self.bits[x >> 3] & (1 << (x & 7)):
+                self.bits[x >> 3] |= 1 << (x & 7)
+                self.bits_set_ctr += 1
+
+        self.stored_ctr += 1
+        self.stats.edges += 1
+        self.frontier.on_edge(pre_state, process_id, post_state)
+
+        # states are not stored, so whether one is new is not known
+        if self._discoveries is not None:
+            self._discoveries.append(Discovery(pre_state, process_id, post_state, False))
+
+        return True
+
+    def _next_once(self, entry: int, should_push_path_fun: Callable[[Path], bool]) -> None:
+        path = self.paths.path(entry)
+
+        execution = self._new_execution()
+        self.instantiation_ctr += 1
+        self.symmetric_groups = execution.symmetric_groups
+
+        if execution.curr_state not in self.root_states:
+            self.root_states.add(execution.curr_state)
+
+            if self._discoveries is not None:
+                self._discoveries.append(Discovery(None, None, execution.curr_state, True))
+
+            self._check_invariants(execution)
+
+        for x in path[:-1]:
+            self._replay_step(execution, x)
+
+        if path and self._is_visited(execution.curr_state, path[-1]):
+            # visited since the path has been queued
+            self._stop(execution)
+            return
+
+        self.paths_found_ctr += 1
+
+        for x in path[-1:]:
+            self._step(execution, x)
+
+        siblings: list[tuple[int, ProcessID, ExecutionState]] = []
+
+        while self.violation is None:
+            available_processes = [
+                x for x in execution.available_processes if not self._is_visited(execution.curr_state, x)
+            ]
+
+            if not available_processes:
+                break
+
+            next_process_id, *other_process_ids = available_processes
+
+            for x in other_process_ids:
+                siblings.append((len(execution.curr_path), x, execution.curr_state))
+
+            self._step(execution, next_process_id)
+
+        self._stop(execution)
+
+        self._push_siblings(entry, path, execution.curr_path, siblings)
+
+    def _explore(
+            self, max_iter_count: int | None = None, should_push_path_fun: Callable[[Path], bool] = None
+    ) -> Generator[None, None, None]:
+        if should_push_path_fun is not None:
+            raise AssertionError("should_push_path_fun is not supported by BitstateVisitor")
+
+        self._next_once(ROOT, should_push_path_fun)
+        yield
+
+        iter_ctr = 0
+        while len(self.frontier) and self.violation is None and (max_iter_count is None or iter_ctr < max_iter_count):
+            iter_ctr += 1
+            entry = self._pop_entry()
+            self._next_once(entry, should_push_path_fun)
+            self.paths.release(entry)
+            self._checkpoint_due()
+            yield
+
+        if self.checkpoint_path is not None:
+            self.checkpoint()
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TextIO
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Execution, ExecutionFactory, Path, ProcessID, UniqueState
+
+_LOCAL = threading.local()
+
+# track of the events that do not belong to a single process
+EXECUTION_TID = 0
+
+
+def _label(value: UniqueState) -> str:
+    if isinstance(value, BaseException):
+        return f"${value.__class__.__name__}"
+    return str(value)
+
+
+@dataclass
+class ChromeTrace:
+    """
+    Writes trace events (https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU) as a JSON
+    array to `file`, one event per line as soon as it has ended, so the trace is never held in memory. The file
+    can be opened by `chrome://tracing` or https://ui.perfetto.dev.
+
+    Every process of the execution gets its own track, plus the `EXECUTION_TID` track for the factory and the
+    execution hooks.
+    """
+
+    file: TextIO
+
+    pid: int = field(default_factory=os.getpid)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    tids: dict[ProcessID, int] = field(default_factory=dict)
+    # track of the events of `span`, set while a process is being stepped
+    tid: int = EXECUTION_TID
+
+    event_ctr: int = 0
+
+    def __post_init__(self):
+        self.file.write("[\n")
+        self._thread_name(EXECUTION_TID, "execution")
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1e6
+
+    def event(self, **kwargs: Any) -> None:
+        if self.event_ctr:
+            self.file.write(",\n")
+        self.file.write(json.dumps({"pid": self.pid, **kwargs}, default=repr))
+        self.event_ctr += 1
+
+    def _thread_name(self, tid: int, name: str) -> None:
+        self.event(name="thread_name", ph="M", tid=tid, args={"name": name})
+        self.event(name="thread_sort_index", ph="M", tid=tid, args={"sort_index": tid})
+
+    def process_tid(self, process_id: ProcessID) -> int:
+        if process_id not in self.tids:
+            self.tids[process_id] = len(self.tids) + 1
+            self._thread_name(self.tids[process_id], f"process {process_id}")
+        return self.tids[process_id]
+
+    def complete(
+            self,
+            name: str,
+            cat: str,
+            started_at: float,
+            tid: int | None = None,
+            args: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        :param started_at: `_now` at the start of the slice, the slice ends now
+        """
+        self.event(
+            name=name,
+            cat=cat,
+            ph="X",
+            ts=started_at,
+            dur=self._now() - started_at,
+            tid=self.tid if tid is None else tid,
+            args=args or {},
+        )
+
+    @contextmanager
+    def span(self, name: str, cat: str, args: dict[str, Any] | None = None) -> Iterator[None]:
+        started_at = self._now()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, started_at, args=args)
+
+    def close(self) -> None:
+        self.file.write("\n]\n")
+        self.file.flush()
+
+
+@contextmanager
+def trace_span(name: str, cat: str, args: dict[str, Any] | None = None) -> Iterator[None]:
+    """
+    Records a slice in the trace being written by `trace_execution` in this thread, if any. Used by the
+    generators that run processes elsewhere to show their round trips.
+    """
+    trace: ChromeTrace | None = getattr(_LOCAL, "trace", None)
+
+    if trace is None:
+        yield
+        return
+
+    with trace.span(name, cat, args):
+        yield
+
+
+def _wrap_hook(trace: ChromeTrace, name: str, fun: Callable) -> Callable:
+    def wrapper(*args: Any) -> Any:
+        started_at = trace._now()
+        try:
+            return fun(*args)
+        finally:
+            trace.complete(name, "hook", started_at, tid=EXECUTION_TID, args={"args": [repr(x) for x in args]})
+
+    return wrapper
+
+
+def _trace_hooks(trace: ChromeTrace, execution: Execution) -> None:
+    execution.handle_step = _wrap_hook(trace, "handle_step", execution.handle_step)
+    execution.handle_terminate = _wrap_hook(trace, "handle_terminate", execution.handle_terminate)
+    execution.handle_terminate_process = {
+        k: _wrap_hook(trace, "handle_terminate_process", v) for k, v in execution.handle_terminate_process.items()
+    }
+
+
+def trace_execution(factory: ExecutionFactory, path: Path, file: TextIO | str) -> Execution:
+    """
+    Instantiates `factory`, steps it along `path` (i.e. `Violation.path`, or a path from `Visitor.paths`) and
+    writes the trace of it to `file`. Every step is a slice on the track of the process, named after the
+    `StateID` it has yielded. The execution is stopped at the end of the path, if it has not terminated.
+
+    :return: the execution, after it has been stopped
+    """
+    if isinstance(file, str):
+        with open(file, "w") as fobj:
+            return trace_execution(factory, path, fobj)
+
+    if getattr(_LOCAL, "trace", None) is not None:
+        raise AssertionError("already tracing")
+
+    trace = ChromeTrace(file)
+    _LOCAL.trace = trace
+
+    try:
+        with trace.span("factory", "factory"):
+            execution = factory()
+
+        _trace_hooks(trace, execution)
+
+        for i, process_id in enumerate(path):
+            trace.tid = trace.process_tid(process_id)
+            started_at = trace._now()
+
+            try:
+                state_id = execution.next(process_id)
+            finally:
+                trace.tid = EXECUTION_TID
+
+            args = {"step": i}
+            if execution.last_access is not None:
+                args["reads"] = sorted(execution.last_access.reads)
+                args["writes"] = sorted(execution.last_access.writes)
+
+            trace.complete(_label(state_id), "step", started_at, tid=trace.process_tid(process_id), args=args)
+
+        # the hooks wrapped by `_trace_hooks` still record to the trace
+        if execution.available_processes:
+            with trace.span("stop", "stop"):
+                execution.stop()
+    finally:
+        _LOCAL.trace = None
+        trace.close()
+
+    return execution
@@ -0,0 +1,296 @@
+from collections import deque
+from typing import Deque, Callable, Generator
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Visitor, Execution, ExecutionState, ProcessID, Access, Path
+
+# vector clock of an event: number of events of every process that happened before it (including itself)
+Clock = dict[ProcessID, int]
+
+
+def is_dependent(a: Access | None, b: Access | None) -> bool:
+    # steps that have not declared their accesses (including the terminating ones) are dependent with everything
+    if a is None or b is None:
+        return True
+    return a.is_dependent(b)
+
+
+@dataclass
+class Event:
+    process_id: ProcessID
+    access: Access | None
+    clock: Clock
+
+
+def happens_before(a: Event, b: Event) -> bool:
+    return b.clock.get(a.process_id, 0) >= a.clock[a.process_id]
+
+
+@dataclass
+class Frame:
+    state: ExecutionState
+    enabled: list[ProcessID]
+    sleep: dict[ProcessID, Access | None]
+    backtrack: set[ProcessID] = field(default_factory=set)
+    done: dict[ProcessID, Access | None] = field(default_factory=dict)
+    # the transition taken out of this frame into the next one on the stack
+    event: Event | None = None
+
+    def add_backtrack(self, initials: set[ProcessID]) -> None:
+        # a process of `initials` that has already been explored from here, or is asleep, is enough
+        if initials & (self.backtrack | self.done.keys() | self.sleep.keys()):
+            return
+        self.backtrack.add(min(initials))
+
+
+@dataclass
+class DPORVisitor(Visitor):
+    """
+    Dynamic partial-order reduction (Flanagan & Godefroid) with sleep sets. Processes declare the resources
+    accessed by their steps by yielding `Access`, and instead of branching on every available process at every
+    state, the visitor only branches on the processes whose steps race with the ones already taken.
+    Races are detected between the steps actually taken, so backtrack points are chosen as in source-DPOR
+    (Abdulla et al.): a process that can start the reversed race, rather than the racing process itself.
+    The set of reachable terminal states is preserved, while the number of explored edges is reduced.
+
+    Steps that did not yield an `Access` are dependent with every other step. The exception is the step
+    terminating a process that has been declaring its accesses, which is assumed to access nothing unless it
+    changes the other available processes (i.e. through `handle_terminate`).
+
+    The exploration is a depth-first search, every backtrack replays the current path through `factory`.
+
+    Unlike the stateless original, states are cached: a state that has already been explored (or is on the
+    current stack) is not explored again. Instead, the accesses of every transition already explored from it are
+    checked for races against the current stack, without knowing which of them happen before it. A state is explored
+    again if it is reached with a sleep set that is not a superset of the one it has been explored with.
+    """
+
+    # accesses of the explored edges
+    edge_accesses: dict[tuple[ExecutionState, ProcessID], Access | None] = field(default_factory=dict)
+
+    # sleep sets the states have been explored with
+    explored_sleep: dict[ExecutionState, frozenset[ProcessID]] = field(default_factory=dict)
+
+    # processes that have yielded an `Access` at least once
+    declaring_processes: set[ProcessID] = field(default_factory=set)
+
+    def __post_init__(self, is_depth_first: bool = False):
+        super().__post_init__(is_depth_first)
+
+        if self.snapshot_pool is not None:
+            raise AssertionError("snapshot_pool can not be used with DPORVisitor")
+
+        # the exploration stack only lives in `next`
+        if self.checkpoint_path is not None:
+            raise AssertionError("checkpoint_path can not be used with DPORVisitor")
+
+    def _instantiate(self, path: Path) -> Execution:
+        self.instantiation_ctr += 1
+        rtn = self._new_execution()
+        if rtn.symmetric_groups:
+            raise AssertionError("symmetric_groups are not supported by DPORVisitor")
+        self._visit_root(rtn)
+        for x in path:
+            self._replay_step(rtn, x)
+        return rtn
+
+    def _step_access(self, execution: Execution, process_id: ProcessID, pre_available: set[ProcessID]) -> Access | None:
+        if execution.last_access is not None:
+            self.declaring_processes.add(process_id)
+            return execution.last_access
+
+        # the step terminating a process can not yield an `Access`. If the process has been declaring its accesses
+        # and the termination did not add or remove other processes, it is assumed to access nothing.
+        if (
+                process_id in self.declaring_processes
+                and process_id not in execution.available_processes
+                and set(execution.available_processes) == pre_available - {process_id}
+        ):
+            return Access(execution.curr_state.states[process_id])
+
+        return None
+
+    @classmethod
+    def _event_clock(cls, stack: list[Frame], process_id: ProcessID, access: Access | None) -> Clock:
+        rtn: Clock = {}
+        ctr = 1
+        for frame in stack[:-1]:
+            event = frame.event
+            if event.process_id == process_id:
+                ctr += 1
+            if event.process_id == process_id or is_dependent(event.access, access):
+                for k, v in event.clock.items():
+                    rtn[k] = max(rtn.get(k, 0), v)
+        rtn[process_id] = ctr
+        return rtn
+
+    @classmethod
+    def _initials(cls, events: list[Event]) -> set[ProcessID]:
+        # processes that can start the sequence `events` in some equivalent ordering of it
+        return set(
+            x.process_id
+            for idx, x in enumerate(events)
+            if not any(happens_before(y, x) for y in events[:idx])
+        )
+
+    @classmethod
+    def _race_check(cls, stack: list[Frame], event: Event) -> None:
+        """
+        For every transition of the stack in a race with `event`, makes sure that some process starting the
+        sequence that reverses the race is explored right before it. `stack` excludes the frame `event` is
+        taken from.
+        """
+        events = [x.event for x in stack]
+
+        for idx, other in enumerate(events):
+            if other.process_id == event.process_id or not is_dependent(other.access, event.access):
+                continue
+
+            tail = events[idx + 1:]
+
+            if any(happens_before(other, x) and happens_before(x, event) for x in tail):
+                # the order is already forced by the transitions in between
+                continue
+
+            notdep = [x for x in tail if not happens_before(other, x)] + [event]
+            stack[idx].add_backtrack(cls._initials(notdep))
+
+    @classmethod
+    def _summary_race_check(cls, stack: list[Frame], process_id: ProcessID, access: Access | None) -> None:
+        """
+        Same as `_race_check`, but for a transition that is reachable from the current state without knowing
+        what happens before it, so every process that might start the reversing sequence is explored.
+        """
+        events = [x.event for x in stack]
+
+        for idx, other in enumerate(events):
+            if other.process_id == process_id or not is_dependent(other.access, access):
+                continue
+
+            notdep = [x for x in events[idx + 1:] if not happens_before(other, x)]
+            initials = cls._initials(notdep)
+            if all(x.process_id != process_id for x in notdep):
+                initials.add(process_id)
+
+            stack[idx].backtrack |= initials & set(stack[idx].enabled)
+
+    def _summary(self, state: ExecutionState, enabled: list[ProcessID]) -> set[tuple[ProcessID, Access | None]]:
+        """
+        Every transition reachable from `state` in the explored graph. Processes that have not yet been explored
+        from `state` are assumed to be dependent with everything.
+        """
+        rtn: set[tuple[ProcessID, Access | None]] = set()
+        visited: set[ExecutionState] = {state}
+        queue: Deque[ExecutionState] = deque([state])
+
+        while queue:
+            curr_state = queue.popleft()
+
+            for process_id in curr_state.states.keys():
+                key = (curr_state, process_id)
+                if key not in self.visited_edges:
+                    continue
+
+                rtn.add((process_id, self.edge_accesses.get(key)))
+
+                for next_state in self.visited_edges[key].keys():
+                    if next_state not in visited:
+                        visited.add(next_state)
+                        queue.append(next_state)
+
+        for process_id in enabled:
+            if (state, process_id) not in self.edge_accesses:
+                rtn.add((process_id, None))
+
+        return rtn
+
+    def _push_frame(self, stack: list[Frame], execution: Execution, sleep: dict[ProcessID, Access | None]) -> None:
+        frame = Frame(
+            state=execution.curr_state,
+            enabled=sorted(execution.available_processes),
+            sleep=sleep,
+        )
+        for process_id in frame.enabled:
+            if process_id not in sleep:
+                frame.backtrack.add(process_id)
+                break
+
+        self.explored_sleep[frame.state] = frozenset(sleep.keys()) & self.explored_sleep.get(
+            frame.state, frozenset(sleep.keys())
+        )
+        stack.append(frame)
+
+    def _explore(
+            self, max_iter_count: int | None = None, should_push_path_fun: Callable[[Path], bool] = None
+    ) -> Generator[None, None, None]:
+        if should_push_path_fun is not None:
+            raise AssertionError("should_push_path_fun is not supported by DPORVisitor")
+
+        execution: Execution | None = self._instantiate(Path([]))
+        path: Path = Path([])
+        stack: list[Frame] = []
+
+        self.paths_found_ctr += 1
+        self._push_frame(stack, execution, {})
+
+        iter_ctr = 0
+        try:
+            while stack and self.violation is None and (max_iter_count is None or iter_ctr < max_iter_count):
+                frame = stack[-1]
+
+                candidates = sorted(
+                    x for x in frame.backtrack if x not in frame.done and x not in frame.sleep
+                )
+
+                if not candidates:
+                    stack.pop()
+                    if path:
+                        path.pop()
+                    execution = None
+                    continue
+
+                process_id = candidates[0]
+
+                if execution is None:
+                    iter_ctr += 1
+                    self.paths_found_ctr += 1
+                    execution = self._instantiate(path)
+
+                pre_state = execution.curr_state
+                pre_available = set(execution.available_processes)
+                self._step(execution, process_id)
+                post_state = execution.curr_state
+                access = self._step_access(execution, process_id, pre_available)
+
+                self.edge_accesses[(pre_state, process_id)] = access
+
+                sleep = {
+                    k: v
+                    for k, v in {**frame.sleep, **frame.done}.items()
+                    if k != process_id and not is_dependent(v, access)
+                }
+                frame.done[process_id] = access
+
+                frame.event = Event(process_id, access, self._event_clock(stack, process_id, access))
+                self._race_check(stack[:-1], frame.event)
+
+                is_on_stack = any(x.state == post_state for x in stack)
+                is_explored = post_state in self.explored_sleep and self.explored_sleep[post_state] <= sleep.keys()
+
+                if not execution.available_processes:
+                    execution = None
+                elif is_on_stack or is_explored:
+                    summary = self._summary(post_state, execution.available_processes)
+                    for summary_process_id, summary_access in summary:
+                        self._summary_race_check(stack, summary_process_id, summary_access)
+                    self._stop(execution)
+                    execution = None
+                else:
+                    path.append(process_id)
+                    self._push_frame(stack, execution, sleep)
+
+                yield
+        finally:
+            if execution is not None:
+                self._stop(execution)
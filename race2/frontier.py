@@ -0,0 +1,233 @@
+import heapq
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Iterator
+
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    from race2.abstract import ProcessID, Path, ExecutionState, UniqueState, Visitor
+
+# entry of the empty path
+ROOT = -1
+
+
+@dataclass(eq=False, repr=False)
+class PathTable:
+    """
+    Paths stored as rows `(parent, process)`, where `parent` is the entry of the path without its last process
+    (`ROOT` for the empty path). Paths sharing a prefix share its rows, a path is only materialized with `path`.
+    Rows are kept until they are given back with `release`, and are then reused by `add`.
+    """
+
+    # process ids are stored by their index in `process_ids`
+    process_idx: dict["ProcessID", int] = field(default_factory=dict)
+    process_ids: list["ProcessID"] = field(default_factory=list)
+
+    parent: array = field(default_factory=lambda: array("q"))
+    process: array = field(default_factory=lambda: array("i"))
+    # number of rows that have each row as their parent
+    children: array = field(default_factory=lambda: array("i"))
+    # rows given back with `release`
+    free: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.parent) - len(self.free)
+
+    def _process_idx(self, process_id: "ProcessID") -> int:
+        rtn = self.process_idx.get(process_id)
+        if rtn is None:
+            rtn = self.process_idx[process_id] = len(self.process_ids)
+            self.process_ids.append(process_id)
+        return rtn
+
+    def key(self, parent: int, process_id: "ProcessID") -> int:
+        """
+        Identifies the path of an entry that would be added with `add`
+        """
+        return (parent + 1) * (1 << 20) + self._process_idx(process_id)
+
+    def entry_key(self, entry: int) -> int:
+        return (self.parent[entry] + 1) * (1 << 20) + self.process[entry]
+
+    def add(self, parent: int, process_id: "ProcessID") -> int:
+        if parent != ROOT:
+            self.children[parent] += 1
+
+        if self.free:
+            rtn = self.free.pop()
+            self.parent[rtn] = parent
+            self.process[rtn] = self._process_idx(process_id)
+            self.children[rtn] = 0
+            return rtn
+
+        self.parent.append(parent)
+        self.process.append(self._process_idx(process_id))
+        self.children.append(0)
+        return len(self.parent) - 1
+
+    def release(self, entry: int) -> None:
+        """
+        Gives back the row of `entry` once its path is not needed anymore, along with the rows of its prefixes that
+        are not the parent of another row. The row is kept for as long as paths added after it extend it.
+        """
+        while entry != ROOT and not self.children[entry]:
+            self.free.append(entry)
+            entry = self.parent[entry]
+
+            if entry != ROOT:
+                self.children[entry] -= 1
+
+    def add_path(self, path: "Path", parent: int = ROOT) -> int:
+        for x in path:
+            parent = self.add(parent, x)
+        return parent
+
+    def prefixes(self, entry: int) -> list[int]:
+        """
+        :return: entries of every prefix of the path of `entry` by their length, starting with `ROOT`
+        """
+        rtn = [entry]
+        while entry != ROOT:
+            entry = self.parent[entry]
+            rtn.append(entry)
+        rtn.reverse()
+        return rtn
+
+    def path(self, entry: int) -> "Path":
+        rtn = []
+        while entry != ROOT:
+            rtn.append(self.process_ids[self.process[entry]])
+            entry = self.parent[entry]
+        rtn.reverse()
+        return rtn
+
+
+class Frontier(ABC):
+    """
+    The order in which the paths queued by `Visitor` are explored. Paths are held as entries of `Visitor.paths`,
+    and are pushed with the state their last process is stepped from, if it is known.
+    """
+
+    def attach(self, visitor: "Visitor") -> None:
+        """
+        Called once by the `visitor` the frontier is used by
+        """
+
+    def on_edge(self, pre_state: "ExecutionState", process_id: "ProcessID", post_state: "ExecutionState") -> None:
+        """
+        Called for every newly visited edge
+        """
+
+    @abstractmethod
+    def push(self, entry: int, state: "ExecutionState | None") -> None:
+        pass
+
+    @abstractmethod
+    def pop(self) -> int:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[int]:
+        pass
+
+
+@dataclass
+class BreadthFirst(Frontier):
+    queue: Deque[int] = field(default_factory=deque)
+
+    def push(self, entry: int, state: "ExecutionState | None") -> None:
+        self.queue.append(entry)
+
+    def pop(self) -> int:
+        return self.queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.queue)
+
+
+@dataclass
+class DepthFirst(Frontier):
+    queue: Deque[int] = field(default_factory=deque)
+
+    def push(self, entry: int, state: "ExecutionState | None") -> None:
+        self.queue.appendleft(entry)
+
+    def pop(self) -> int:
+        return self.queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.queue)
+
+
+@dataclass
+class _Heap(Frontier):
+    # `(score, push order, entry)`, paths with the same score are explored in the order they have been pushed
+    heap: list[tuple[float, int, int]] = field(default_factory=list, init=False, repr=False)
+    push_ctr: int = field(default=0, init=False)
+
+    def _push(self, entry: int, score: float) -> None:
+        heapq.heappush(self.heap, (score, self.push_ctr, entry))
+        self.push_ctr += 1
+
+    def pop(self) -> int:
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self) -> Iterator[int]:
+        return (x for _, _, x in sorted(self.heap))
+
+
+@dataclass
+class Prioritized(_Heap):
+    """
+    Explores the paths with the lowest `score` first
+    """
+
+    score: Callable[["Path", "ExecutionState | None"], float] = lambda path, state: 0.0
+    paths: PathTable | None = field(default=None, repr=False)
+
+    def attach(self, visitor: "Visitor") -> None:
+        self.paths = visitor.paths
+
+    def push(self, entry: int, state: "ExecutionState | None") -> None:
+        self._push(entry, self.score(self.paths.path(entry), state))
+
+
+@dataclass
+class CoverageGuided(_Heap):
+    """
+    Explores first the paths stepping a process from the `(process_id, StateID)` label that has been reached the
+    least number of times by the visited edges. The score is taken when a path is pushed.
+    """
+
+    label_counts: dict[tuple["ProcessID", "UniqueState"], int] = field(default_factory=dict)
+    paths: PathTable | None = field(default=None, repr=False)
+
+    def attach(self, visitor: "Visitor") -> None:
+        self.paths = visitor.paths
+
+    def on_edge(self, pre_state: "ExecutionState", process_id: "ProcessID", post_state: "ExecutionState") -> None:
+        key = process_id, post_state.states[process_id]
+        self.label_counts[key] = self.label_counts.get(key, 0) + 1
+
+    def push(self, entry: int, state: "ExecutionState | None") -> None:
+        if state is None or entry == ROOT:
+            self._push(entry, 0)
+            return
+
+        process_id = self.paths.process_ids[self.paths.process[entry]]
+        self._push(entry, self.label_counts.get((process_id, state.states.get(process_id)), 0))
@@ -1,31 +1,148 @@
 import dataclasses
 import itertools
 import os
-from typing import Generic, TypeVar, Callable
+from typing import Generic, TypeVar, Callable, Iterable
 
 ET = TypeVar("ET")
 VT = TypeVar("VT")
 
 
+class _TrackedList(list):
+    """
+    `Graph.v` and `Graph.e`, which drop the indices of their graph whenever they are changed in place
+    """
+
+    __slots__ = ("graph",)
+
+    def __init__(self, items: Iterable, graph: "Graph"):
+        super().__init__(items)
+        self.graph = graph
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _tracked(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def rtn(self: _TrackedList, *args, **kwargs):
+        value = method(self, *args, **kwargs)
+        self.graph.invalidate()
+        return value
+
+    rtn.__name__ = name
+    return rtn
+
+
+for _name in [
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+    "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+]:
+    setattr(_TrackedList, _name, _tracked(_name))
+
+
 @dataclasses.dataclass(slots=True)
 class Graph(Generic[VT, ET]):
+    """
+    The vertex and edge id sets and the forward and reverse adjacency dicts are built on first use and kept until
+    `v` or `e` are changed, either by assigning them or by changing them in place. Lists assigned to `v` and `e` are
+    copied, so that their changes are tracked.
+    """
+
     v: list[int] = dataclasses.field(default_factory=list)
-    e: list[tuple[int, int, int]] = dataclasses.field(default_factory=dict)
+    e: list[tuple[int, int, int]] = dataclasses.field(default_factory=list)
     v_labels: dict[int, VT] = dataclasses.field(default_factory=dict)
     e_labels: dict[int, ET] = dataclasses.field(default_factory=dict)
 
+    # whether the indices below have been built for the current `v` and `e`
+    _is_indexed: bool = dataclasses.field(default=False, init=False, repr=False, compare=False)
+    _v_ids: set[int] | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _e_ids: set[int] | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _adjacency: dict[int, list[tuple[int, int]]] | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _reverse_adjacency: dict[int, list[tuple[int, int]]] | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
-        vertex_ids = set(self.v)
+        vertex_ids = self.vertex_ids
         for _, v1, v2 in self.e:
             assert v1 in vertex_ids and v2 in vertex_ids, (v1, v2, vertex_ids)
 
         for k in self.v_labels.keys():
-            assert k in self.v, k
+            assert k in vertex_ids, k
 
-        edge_ids = set(x for x, _, _ in self.e)
+        edge_ids = self.edge_ids
         for k in self.e_labels.keys():
             assert k in edge_ids, (k, edge_ids)
 
+    def __setattr__(self, key: str, value) -> None:
+        if key == "v" or key == "e":
+            if not isinstance(value, _TrackedList) or value.graph is not self:
+                value = _TrackedList(value, self)
+            object.__setattr__(self, "_is_indexed", False)
+        object.__setattr__(self, key, value)
+
+    def __getstate__(self) -> list:
+        return [getattr(self, x.name) for x in dataclasses.fields(self) if x.init]
+
+    def __setstate__(self, state: list) -> None:
+        for x, value in zip([x for x in dataclasses.fields(self) if x.init], state):
+            setattr(self, x.name, value)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._is_indexed = False
+
+    def _index(self) -> None:
+        if self._is_indexed:
+            return
+
+        self._v_ids = set(self.v)
+        self._e_ids = set(x for x, _, _ in self.e)
+        self._adjacency = None
+        self._reverse_adjacency = None
+        self._is_indexed = True
+
+    @property
+    def vertex_ids(self) -> set[int]:
+        """
+        Must not be modified
+        """
+        self._index()
+        return self._v_ids
+
+    @property
+    def edge_ids(self) -> set[int]:
+        """
+        Must not be modified
+        """
+        self._index()
+        return self._e_ids
+
+    def add_vertex(self, vertex: int, label: VT | None = None) -> None:
+        assert vertex not in self.vertex_ids, vertex
+
+        # the id set is updated in place instead of being rebuilt
+        list.append(self.v, vertex)
+        self._v_ids.add(vertex)
+
+        if label is not None:
+            self.v_labels[vertex] = label
+
+    def add_edge(self, edge: int, v1: int, v2: int, label: ET | None = None) -> None:
+        assert edge not in self.edge_ids, edge
+        assert v1 in self.vertex_ids and v2 in self.vertex_ids, (v1, v2)
+
+        list.append(self.e, (edge, v1, v2))
+        self._e_ids.add(edge)
+        self._adjacency = None
+        self._reverse_adjacency = None
+
+        if label is not None:
+            self.e_labels[edge] = label
+
     @classmethod
     def from_adjacency_list(
             cls,
@@ -54,8 +171,6 @@ class Graph(Generic[VT, ET]):
                 list(set(x for _, a, b in edges_list for x in [a, b])) + vertices
         )
 
-        assert all(k in vertices_list for k in v_labels.keys())
-
         return Graph(
             v=vertices_list,
             e=edges_list,
@@ -71,13 +186,32 @@ class Graph(Generic[VT, ET]):
             e_labels=dict(self.e_labels),
         )
 
+    @classmethod
+    def _adjacency_dict(cls, edges: Iterable[tuple[int, int, int]]) -> dict[int, list[tuple[int, int]]]:
+        rtn: dict[int, list[tuple[int, int]]] = {}
+        for e, v1, v2 in edges:
+            if v1 not in rtn:
+                rtn[v1] = []
+            rtn[v1].append((e, v2))
+        return dict(sorted(rtn.items(), key=lambda x: x[0]))
+
     def adjacency_dict(self) -> dict[int, list[tuple[int, int]]]:
-        return {
-            v1: [(e, v2) for e, _, v2 in v2s]
-            for v1, v2s in itertools.groupby(
-                sorted(self.e, key=lambda x: x[1]), lambda x: x[1]
-            )
-        }
+        """
+        `v1 -> [(e, v2), ...]` of the vertices with outgoing edges, in the order of `e`. Must not be modified
+        """
+        self._index()
+        if self._adjacency is None:
+            self._adjacency = self._adjacency_dict(self.e)
+        return self._adjacency
+
+    def reverse_adjacency_dict(self) -> dict[int, list[tuple[int, int]]]:
+        """
+        The same as `reverse().adjacency_dict()`
+        """
+        self._index()
+        if self._reverse_adjacency is None:
+            self._reverse_adjacency = self._adjacency_dict((idx, v2, v1) for idx, v1, v2 in self.e)
+        return self._reverse_adjacency
 
     def reverse(self) -> "Graph[VT, ET]":
         return dataclasses.replace(self, e=[(idx, v2, v1) for idx, v1, v2 in self.e])
@@ -90,18 +224,20 @@ class Graph(Generic[VT, ET]):
 
     def subset(self, v: list[int]) -> "Graph[VT, ET]":
         # this is not exactly true, as the outgoing edges may go into vertices not in the lst of gives vertices
-        e = [(e, v1, v2) for e, v1, v2 in self.e if v1 in v and v2 in v]
+        v_ids = set(v)
+        e = [(e, v1, v2) for e, v1, v2 in self.e if v1 in v_ids and v2 in v_ids]
+        e_ids = set(x for x, _, _ in e)
         return dataclasses.replace(
             self,
-            v=[x for x in self.v if x in v],
+            v=[x for x in self.v if x in v_ids],
             e=e,
-            v_labels={k: v for k, v in self.v_labels if k in v},
-            e_labels={k: v for k, v in self.e_labels if k in [x for x, _, _ in e]},
+            v_labels={k: v for k, v in self.v_labels.items() if k in v_ids},
+            e_labels={k: v for k, v in self.e_labels.items() if k in e_ids},
         )
 
     def union(self, other: "Graph[VT, ET]") -> "Graph[VT, ET]":
         # fix later as this requires relabeling the edges
-        assert set() == set(x for x, _, _ in self.e) & set(x for x, _, _ in other.e)
+        assert set() == self.edge_ids & other.edge_ids
         return dataclasses.replace(
             self,
             v=list(set(self.v) | set(other.v)),
@@ -191,11 +327,12 @@ class Graph(Generic[VT, ET]):
         new_v = [
             new_x for x in self.v for new_x in [v(x) if v else x] if new_x is not None
         ]
+        new_v_ids = set(new_v)
 
         if e is None:
             e = (
                 lambda idx, v1, v2: (idx, v1, v2)
-                if v1 in new_v and v2 in new_v
+                if v1 in new_v_ids and v2 in new_v_ids
                 else None
             )
 
@@ -206,7 +343,6 @@ class Graph(Generic[VT, ET]):
             if new_x is not None
         ]
 
-        new_v_ids = set(x for x in new_v)
         new_e_ids = set(x for x, _, _ in new_e)
 
         new_v_labels = {k: v for k, v in self.v_labels.items() if k in new_v_ids}
@@ -88,112 +88,102 @@ class Cycle(Generic[VT, ET]):
 
 
 def collapse_cycles(graph: Graph[VT, ET]) -> Graph[Cycle[VT, ET] | VT, ET]:
-    # rem
-    rtn: Graph[VT | Cycle[VT, ET], ET] = graph.copy()
-
-    while collect_cycles_rtn := list(collect_cycles(rtn)):
-        replacements_dict: dict[int, int] = {}
-        replacements_dict_reverse: dict[int, list[int]] = {}
-
-        adjacency_dict = rtn.adjacency_dict()
-        reverse_adjacency_dict = rtn.reverse().adjacency_dict()
-
-        for original_cycle_idx, original_cycle in enumerate(collect_cycles_rtn):
-            cycle = list(set(replacements_dict.get(x, x) for x in original_cycle))
-
-            vertices_from = list(
-                set(
-                    y
-                    for x in cycle
-                    for _, y in reverse_adjacency_dict.get(x, [])
-                    # adjacency matrix includes the items in the cycle
-                    if y not in cycle
-                )
-            )
-            vertices_into = list(
-                set(
-                    y
-                    for x in cycle
-                    for _, y in adjacency_dict.get(x, [])
-                    # adjacency matrix includes the items in the cycle
-                    if y not in cycle
-                )
-            )
-            # todo if any of the vertices in there are also cycles, un-collapse them?
-            cycle_sub_graph = Cycle(
-                sub_graph=rtn.map(
-                    v=lambda x: x
-                    if (x in cycle or x in vertices_from or x in vertices_into)
-                    else None,
-                    e=lambda e, v1, v2: (e, v1, v2)
-                    if (v1 in cycle or v2 in cycle)
-                    else None,
-                ),
-                cycle=original_cycle,
-            )
-            rtn = rtn.copy()
-            cycle_vertex_id = rtn.vertex_next_id()
-            rtn.v.append(cycle_vertex_id)
-            rtn.v_labels[cycle_vertex_id] = cycle_sub_graph
-
-            def edge_mapper(e: int, v1: int, v2: int) -> tuple[int, int, int] | None:
-                if v1 in vertices_from and v2 in cycle:
-                    return e, v1, cycle_vertex_id
-                elif v1 in cycle and v2 in vertices_into:
-                    return e, cycle_vertex_id, v2
-                elif v1 in cycle and v2 in cycle:
-                    return None
-                else:
-                    return e, v1, v2
-
-            rtn = rtn.map(
-                v=lambda x: x if x not in cycle else None,
-                e=edge_mapper,
-            )
-
-            break
-
-            replacement_vertices = []
-
-            for x in set(original_cycle):
-                replacement_vertices.append(x)
-
-            # cleanup for recursive replacements
-
-            # `cycle` and not `original_cycle` because aliases have already been resolved
-            for recursive_replacement_vertex in set(cycle):
-                # may be working on stale data
-                match cycle_sub_graph.sub_graph.v_labels.get(
-                    recursive_replacement_vertex
-                ):
-                    case Cycle():
-                        pass
-                    case _:
-                        continue
-
-                # that happens is the other loop already did one loop
-                if recursive_replacement_vertex not in replacements_dict_reverse:
-                    continue
-                else:
-                    raise AssertionError(original_cycle_idx,
-                                         "cycles should be resolved in such a way that they are unique and maximal"
-                                         )
-
-                for x in replacements_dict_reverse[recursive_replacement_vertex]:
-                    replacement_vertices.append(x)
-
-                del replacements_dict_reverse[recursive_replacement_vertex]
-
-            for x in replacement_vertices:
-                replacements_dict[x] = cycle_vertex_id
-            replacements_dict_reverse[cycle_vertex_id] = replacement_vertices
-
-            # make ure that replacements of replacements are also updated
-
-            # todo could use the infromation above to fix adjacency dicts
-            adjacency_dict = rtn.adjacency_dict()
-            reverse_adjacency_dict = rtn.reverse().adjacency_dict()
-    return rtn
+    """
+    Condenses every cycle (strongly connected component of more than one vertex) into a new vertex labelled by a
+    `Cycle`. Its `sub_graph` holds the edges into, out of and within the cycle, with the cycles condensed before
+    it already in place.
+
+    Cycles are condensed in the order `collect_cycles` returns them. That is a reverse topological order, so
+    only the cycles condensed before a cycle can be reached from it, and collapsing a cycle does not change the
+    components of the rest of the graph. All of them are therefore taken from a single `tarjan`, and the
+    vertex ids `max(graph.v) + 1, ...` are assigned in that order.
+    """
+    cycles = collect_cycles(graph)
+
+    if not cycles:
+        return graph.copy()
+
+    adjacency_dict = graph.adjacency_dict()
+    reverse_adjacency_dict = graph.reverse_adjacency_dict()
+
+    edge_pos = {idx: i for i, (idx, _, _) in enumerate(graph.e)}
+    v_pos: dict[int, list[int]] = {}
+    for i, x in enumerate(graph.v):
+        if x not in v_pos:
+            v_pos[x] = []
+        v_pos[x].append(i)
+
+    # vertex of a condensed cycle -> vertex of its `Cycle`
+    replacements_dict: dict[int, int] = {}
+    cycle_vertex_ids: list[int] = []
+    cycle_v_labels: dict[int, Cycle[VT, ET]] = {}
+    # edges within the cycles
+    removed_edge_ids: set[int] = set()
+
+    cycle_vertex_next_id = max(graph.v) + 1
+
+    def map_vertex(x: int) -> int:
+        return replacements_dict.get(x, x)
+
+    for original_cycle in cycles:
+        cycle = set(original_cycle)
+
+        edge_ids = set(
+            idx
+            for x in cycle
+            for adjacency in [adjacency_dict.get(x, []), reverse_adjacency_dict.get(x, [])]
+            for idx, _ in adjacency
+        )
+        edges = [
+            (idx, map_vertex(v1), map_vertex(v2))
+            for idx in sorted(edge_ids, key=edge_pos.__getitem__)
+            for _, v1, v2 in [graph.e[edge_pos[idx]]]
+        ]
+        vertex_ids = set(x for _, v1, v2 in edges for x in [v1, v2]) | cycle
+
+        # in the order of `graph.v`, followed by the cycles condensed before
+        sub_graph_v = [
+            graph.v[i] for i in sorted(i for x in vertex_ids if x in v_pos for i in v_pos[x])
+        ] + [x for x in cycle_vertex_ids if x in vertex_ids]
+
+        cycle_sub_graph = Cycle(
+            sub_graph=Graph(
+                v=sub_graph_v,
+                e=edges,
+                v_labels={
+                    k: v
+                    for labels in [graph.v_labels, cycle_v_labels]
+                    for k, v in labels.items()
+                    if k in vertex_ids
+                },
+                e_labels={idx: graph.e_labels[idx] for idx, _, _ in edges if idx in graph.e_labels},
+            ),
+            cycle=original_cycle,
+        )
+
+        cycle_vertex_id = cycle_vertex_next_id
+        cycle_vertex_next_id += 1
+
+        for x in cycle:
+            replacements_dict[x] = cycle_vertex_id
+        cycle_vertex_ids.append(cycle_vertex_id)
+        cycle_v_labels[cycle_vertex_id] = cycle_sub_graph
+
+        removed_edge_ids.update(idx for idx, v1, v2 in edges if v1 in cycle and v2 in cycle)
+
+    return Graph(
+        v=[x for x in graph.v if x not in replacements_dict] + cycle_vertex_ids,
+        e=[
+            (idx, map_vertex(v1), map_vertex(v2))
+            for idx, v1, v2 in graph.e
+            if idx not in removed_edge_ids
+        ],
+        v_labels={
+            **{k: v for k, v in graph.v_labels.items() if k not in replacements_dict},
+            **cycle_v_labels,
+        },
+        e_labels={k: v for k, v in graph.e_labels.items() if k not in removed_edge_ids},
+    )
 
 
 def leaves(graph: Graph[VT, ET]) -> Iterator[int]:
@@ -221,49 +211,64 @@ def clean_graph(graph: Graph[VT, ET]) -> Graph[VT, ET]:
 
 
 def tarjan(graph: Graph[VT, ET]) -> list[list[int]]:
+    """
+    Strongly connected components, in the order they are completed. The recursion of `strong_connect` is
+    unrolled into `call_stack`, every frame of which holds a vertex and the iterator over its remaining edges, so
+    the depth of the graph is not bound by the recursion limit
+    """
     adjacency_dict = graph.adjacency_dict()
 
     index_ctr: Iterator[int] = itertools.count()
     stack: list[int] = []
     index_dict: dict[int, int] = {}
     lowlink_dict: dict[int, int] = {}
-    on_stack_dict: dict[int, bool] = {}
+    on_stack_set: set[int] = set()
 
     rtn: list[list[int]] = []
 
-    # todo rewrite as a continuation
-
-    def strong_connect(v: int) -> None:
-        index_dict[v] = next(index_ctr)
-        lowlink_dict[v] = index_dict[v]
-
+    def enter(v: int) -> tuple[int, Iterator[tuple[int, int]]]:
+        index_dict[v] = lowlink_dict[v] = next(index_ctr)
         stack.append(v)
-        on_stack_dict[v] = True
-
-        for _, w in adjacency_dict.get(v, []):
-            if index_dict.get(w) is None:
-                # successor w has not yet been visited; recurse on it
-                strong_connect(w)
-                lowlink_dict[v] = min(lowlink_dict[v], lowlink_dict[w])
-            elif on_stack_dict[w]:
-                # Successor w is in stack S and hence in the current SCC
-                # If w is not on stack, then (v, w) is an edge pointing to an SCC already found and must be ignored
-                lowlink_dict[v] = min(lowlink_dict[v], index_dict[w])
-
-        if lowlink_dict[v] == index_dict[v]:
-            sub_rtn: list[int] = []
-            while True:
-                w = stack.pop()
-                on_stack_dict[w] = False
-
-                sub_rtn.append(w)
-                if w == v:
-                    break
-            rtn.append(sub_rtn)
+        on_stack_set.add(v)
+        return v, iter(adjacency_dict.get(v, []))
 
     for x in graph.v:
-        if index_dict.get(x) is None:
-            strong_connect(x)
+        if x in index_dict:
+            continue
+
+        call_stack = [enter(x)]
+
+        while call_stack:
+            v, edges_iter = call_stack[-1]
+
+            for _, w in edges_iter:
+                if w not in index_dict:
+                    # successor w has not yet been visited; recurse on it
+                    call_stack.append(enter(w))
+                    break
+                elif w in on_stack_set:
+                    # Successor w is in stack S and hence in the current SCC
+                    # If w is not on stack, then (v, w) is an edge pointing to an SCC already found and must be
+                    # ignored
+                    lowlink_dict[v] = min(lowlink_dict[v], index_dict[w])
+            else:
+                call_stack.pop()
+
+                if lowlink_dict[v] == index_dict[v]:
+                    sub_rtn: list[int] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack_set.remove(w)
+
+                        sub_rtn.append(w)
+                        if w == v:
+                            break
+                    rtn.append(sub_rtn)
+
+                if call_stack:
+                    # return from the recursion into the caller
+                    u, _ = call_stack[-1]
+                    lowlink_dict[u] = min(lowlink_dict[u], lowlink_dict[v])
 
     return rtn
 
@@ -322,7 +327,7 @@ def paint(graph: Graph[VT, ET], start: int) -> set[int]:
     :param start:
     :return:
     """
-    rev_adjacency_dict = graph.reverse().adjacency_dict()
+    rev_adjacency_dict = graph.reverse_adjacency_dict()
 
     visited: set[int] = set()
 
@@ -339,4 +344,84 @@ def paint(graph: Graph[VT, ET], start: int) -> set[int]:
         for _, v in rev_adjacency_dict.get(next_v, []):
             queue.append(v)
 
-    return visited
\ No newline at end of file
+    return visited
+
+
+@dataclasses.dataclass(slots=True)
+class ShortestPaths:
+    """
+    Breadth first search tree of a graph from `start`, the shortest path to any of the reached vertices is
+    read back from `predecessors` in O(path length)
+    """
+
+    start: int
+    # reached vertex -> `(edge, vertex)` it has been reached through, `start` is not in there
+    predecessors: dict[int, tuple[int, int]] = dataclasses.field(default_factory=dict)
+
+    def is_reached(self, v: int) -> bool:
+        return v == self.start or v in self.predecessors
+
+    def path_to(self, v: int) -> list[int] | None:
+        """
+        :return: edge ids of the shortest path from `start` to `v`, `None` if `v` has not been reached
+        """
+        if not self.is_reached(v):
+            return None
+
+        rtn: list[int] = []
+
+        while v != self.start:
+            e, v = self.predecessors[v]
+            rtn.append(e)
+
+        rtn.reverse()
+        return rtn
+
+    def paths_to(self, vs: Iterator[int] | list[int]) -> dict[int, list[int]]:
+        """
+        Shortest paths to every vertex of `vs` that has been reached
+        """
+        return {v: path for v in vs for path in [self.path_to(v)] if path is not None}
+
+
+def shortest_paths(graph: Graph[VT, ET], start: int, targets: set[int] | None = None) -> ShortestPaths:
+    """
+    :param targets: if set, the search stops as soon as all of them have been reached
+    """
+    adjacency_dict = graph.adjacency_dict()
+
+    rtn = ShortestPaths(start)
+    remaining = None if targets is None else set(targets) - {start}
+
+    queue: Deque[int] = deque([start])
+
+    while queue and (remaining is None or remaining):
+        v1 = queue.popleft()
+
+        for e, v2 in adjacency_dict.get(v1, []):
+            if rtn.is_reached(v2):
+                continue
+
+            rtn.predecessors[v2] = (e, v1)
+            queue.append(v2)
+
+            if remaining is not None:
+                remaining.discard(v2)
+
+    return rtn
+
+
+def path_from_to(graph: Graph[VT, ET], from_v: int, to_v: int) -> list[int] | None:
+    """
+    :return: edge ids of the shortest path from `from_v` to `to_v`, `None` if there is none. To query the paths to
+        many vertices (i.e. every one of `leaves`), use a single `shortest_paths` instead
+    """
+    return shortest_paths(graph, from_v, {to_v}).path_to(to_v)
+
+
+def paths_from_to(graph: Graph[VT, ET], from_v: int, to_vs: Iterator[int] | list[int]) -> dict[int, list[int]]:
+    """
+    Shortest paths from `from_v` to every one of `to_vs` that is reachable, found by a single search
+    """
+    to_vs = list(to_vs)
+    return shortest_paths(graph, from_v, set(to_vs)).paths_to(to_vs)
@@ -0,0 +1,226 @@
+from array import array
+from collections import deque
+from typing import Iterator, Deque
+
+from dataclasses import dataclass, field
+
+from race2.graph.abstract import Graph, VT, ET
+
+
+@dataclass(eq=False)
+class CSRGraph:
+    """
+    Compressed sparse row view of the edges of a `Graph`. Vertices are addressed by their position in `vertices`
+    (the order of `Graph.v`), the successors of the vertex at `i` are `targets[offsets[i]:offsets[i + 1]]`, reached
+    through the edges `edges[offsets[i]:offsets[i + 1]]`, in the order of `Graph.e`.
+
+    Every array holds 8 bytes per vertex or edge, instead of the lists of tuples of `Graph.adjacency_dict`, and the
+    algorithms below walk them by index. Vertex sets are returned as the ids of `Graph.v`.
+    """
+
+    vertices: array = field(default_factory=lambda: array("q"))
+    # vertex id -> position in `vertices`
+    index: dict[int, int] = field(default_factory=dict)
+
+    offsets: array = field(default_factory=lambda: array("q", [0]))
+    targets: array = field(default_factory=lambda: array("q"))
+    edges: array = field(default_factory=lambda: array("q"))
+
+    _reverse: "CSRGraph | None" = field(default=None, repr=False)
+
+    @classmethod
+    def _build(
+            cls,
+            vertices: array,
+            index: dict[int, int],
+            sources: array,
+            targets: array,
+            edges: array,
+    ) -> "CSRGraph":
+        # counting sort of the edges by their source, stable so that the edges of a vertex keep their order
+        offsets = array("q", [0]) * (len(vertices) + 1)
+        for x in sources:
+            offsets[x + 1] += 1
+        for i in range(len(vertices)):
+            offsets[i + 1] += offsets[i]
+
+        fill = offsets[:-1]
+        sorted_targets = array("q", [0]) * len(targets)
+        sorted_edges = array("q", [0]) * len(edges)
+
+        for x, y, e in zip(sources, targets, edges):
+            pos = fill[x]
+            sorted_targets[pos] = y
+            sorted_edges[pos] = e
+            fill[x] = pos + 1
+
+        return CSRGraph(vertices=vertices, index=index, offsets=offsets, targets=sorted_targets, edges=sorted_edges)
+
+    @classmethod
+    def from_graph(cls, graph: Graph[VT, ET]) -> "CSRGraph":
+        index: dict[int, int] = {}
+        vertices = array("q")
+
+        for x in graph.v:
+            if x not in index:
+                index[x] = len(vertices)
+                vertices.append(x)
+
+        return cls._build(
+            vertices,
+            index,
+            array("q", [index[v1] for _, v1, _ in graph.e]),
+            array("q", [index[v2] for _, _, v2 in graph.e]),
+            array("q", [e for e, _, _ in graph.e]),
+        )
+
+    def reverse(self) -> "CSRGraph":
+        if self._reverse is None:
+            sources = array("q", [0]) * len(self.targets)
+            for i in range(len(self.vertices)):
+                for pos in range(self.offsets[i], self.offsets[i + 1]):
+                    sources[pos] = i
+
+            self._reverse = self._build(self.vertices, self.index, self.targets, sources, self.edges)
+            self._reverse._reverse = self
+
+        return self._reverse
+
+
+def _as_csr(graph: Graph[VT, ET] | CSRGraph) -> CSRGraph:
+    return graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+
+
+def leaves(graph: Graph[VT, ET] | CSRGraph) -> Iterator[int]:
+    csr = _as_csr(graph)
+    offsets = csr.offsets
+
+    for i, x in enumerate(csr.vertices):
+        if offsets[i] == offsets[i + 1]:
+            yield x
+
+
+def reachable(graph: Graph[VT, ET] | CSRGraph, start: int) -> set[int]:
+    """
+    Vertices reachable from `start`, including itself
+    """
+    csr = _as_csr(graph)
+    offsets, targets = csr.offsets, csr.targets
+
+    visited = bytearray(len(csr.vertices))
+    queue: Deque[int] = deque([csr.index[start]])
+    visited[queue[0]] = 1
+
+    while queue:
+        x = queue.popleft()
+
+        for pos in range(offsets[x], offsets[x + 1]):
+            y = targets[pos]
+            if not visited[y]:
+                visited[y] = 1
+                queue.append(y)
+
+    return {x for x, is_visited in zip(csr.vertices, visited) if is_visited}
+
+
+def paint(graph: Graph[VT, ET] | CSRGraph, start: int) -> set[int]:
+    """
+    The same as `race2.graph.algorithm.paint`, vertices that transitively lead to `start`
+    """
+    return reachable(_as_csr(graph).reverse(), start)
+
+
+def tarjan(graph: Graph[VT, ET] | CSRGraph) -> list[list[int]]:
+    """
+    The same strongly connected components in the same order as `race2.graph.algorithm.tarjan`, with the recursion
+    unrolled into an explicit call stack
+    """
+    csr = _as_csr(graph)
+    offsets, targets, vertices = csr.offsets, csr.targets, csr.vertices
+
+    index = array("q", [-1]) * len(vertices)
+    lowlink = array("q", [0]) * len(vertices)
+    on_stack = bytearray(len(vertices))
+    stack: list[int] = []
+    index_ctr = 0
+
+    rtn: list[list[int]] = []
+
+    for root in range(len(vertices)):
+        if index[root] != -1:
+            continue
+
+        index[root] = lowlink[root] = index_ctr
+        index_ctr += 1
+        stack.append(root)
+        on_stack[root] = 1
+
+        # the vertex of every frame, and the position of the next of its edges to follow
+        call_v = [root]
+        call_pos = [offsets[root]]
+
+        while call_v:
+            v = call_v[-1]
+            pos = call_pos[-1]
+            end = offsets[v + 1]
+
+            while pos < end:
+                w = targets[pos]
+                pos += 1
+
+                if index[w] == -1:
+                    call_pos[-1] = pos
+
+                    index[w] = lowlink[w] = index_ctr
+                    index_ctr += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+
+                    call_v.append(w)
+                    call_pos.append(offsets[w])
+                    break
+                elif on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+            else:
+                call_v.pop()
+                call_pos.pop()
+
+                if lowlink[v] == index[v]:
+                    sub_rtn: list[int] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        sub_rtn.append(vertices[w])
+                        if w == v:
+                            break
+                    rtn.append(sub_rtn)
+
+                if call_v and lowlink[v] < lowlink[call_v[-1]]:
+                    lowlink[call_v[-1]] = lowlink[v]
+
+    return rtn
+
+
+def clean_graph(graph: Graph[VT, ET]) -> Graph[VT, ET]:
+    """
+    The same as `race2.graph.algorithm.clean_graph`, removes self cycles and keeps the first of the edges between
+    the same pair of vertices. Duplicates are found by stamping the targets of every row of the CSR with the
+    source, so that no sort is needed
+    """
+    csr = CSRGraph.from_graph(graph)
+    offsets, targets, edges = csr.offsets, csr.targets, csr.edges
+
+    last_source = array("q", [-1]) * len(csr.vertices)
+    edge_ids_keep: set[int] = set()
+
+    for i in range(len(csr.vertices)):
+        for pos in range(offsets[i], offsets[i + 1]):
+            w = targets[pos]
+
+            if w == i or last_source[w] == i:
+                continue
+
+            last_source[w] = i
+            edge_ids_keep.add(edges[pos])
+
+    return graph.map(e=lambda idx, v1, v2: (idx, v1, v2) if idx in edge_ids_keep else None)
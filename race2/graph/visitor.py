@@ -1,10 +1,15 @@
-from race2.abstract import Visitor, ExecutionState, ProcessID, SpecialState, UniqueState
+from race2.abstract import Visitor, ExecutionState, ProcessID, SpecialState, UniqueState, Path
 from race2.graph.abstract import Graph
-from race2.graph.algorithm import Cycle
+from race2.graph.algorithm import Cycle, path_from_to
+from race2.stats import LatencyHistogram
 from race2.util.graphviz import ReprStr
 
 
-def graph_from_visitor(vis: Visitor) -> Graph[ExecutionState, ProcessID]:
+def graph_from_visitor(vis: Visitor, with_latencies: bool = False) -> Graph[ExecutionState, ProcessID]:
+    """
+    :param with_latencies: if set, the edge labels are extended with the `LatencyHistogram` of the edge (or `None`),
+        see `Visitor.is_timed`. Every post state of the edge shares the same one
+    """
     vertices = {
         state: index
         for index, state in enumerate(
@@ -18,8 +23,9 @@ def graph_from_visitor(vis: Visitor) -> Graph[ExecutionState, ProcessID]:
         [(vertices[v1], vertices[v2]) for (v1, _), v2_dict in vis.visited_edges.items() for v2 in v2_dict.keys()],
         v_labels={index: state for state, index in vertices.items()},
         e_labels=[
-            (process_id, cnt, total_cnt)
-            for (_, process_id), v2_dict in vis.visited_edges.items()
+            (process_id, cnt, total_cnt) + ((vis.edge_latencies.get(key),) if with_latencies else ())
+            for key, v2_dict in vis.visited_edges.items()
+            for _, process_id in [key]
             for _, cnt in v2_dict.items()
             for total_cnt in [sum(v2_dict.values())]
         ],
@@ -28,6 +34,24 @@ def graph_from_visitor(vis: Visitor) -> Graph[ExecutionState, ProcessID]:
     return graph
 
 
+def graph_schedule(graph: Graph[ExecutionState | Cycle[ExecutionState, ProcessID], tuple], path: list[int]) -> Path:
+    """
+    Process ids of the edges of `path` (i.e. of `path_from_to` or `ShortestPaths.path_to`) in a graph built by
+    `graph_from_visitor`, to be replayed by `Execution.run`. The edges into and out of a collapsed `Cycle` may
+    belong to different states of the cycle, so a path through one is not replayable as is
+    """
+    return Path([graph.e_labels[x][0] for x in path])
+
+
+def graph_schedule_from_to(
+        graph: Graph[ExecutionState | Cycle[ExecutionState, ProcessID], tuple],
+        from_v: int,
+        to_v: int,
+) -> Path | None:
+    path = path_from_to(graph, from_v, to_v)
+    return None if path is None else graph_schedule(graph, path)
+
+
 def graph_render_labels(
         graph: Graph[ExecutionState | Cycle[ExecutionState, ProcessID], ProcessID],
         process_id_map: dict[ProcessID, str] = None,
@@ -73,8 +97,14 @@ def graph_render_labels(
             case _:
                 raise AssertionError(label)
 
+    def map_latency(latency: LatencyHistogram | None) -> str:
+        if latency is None or not latency.count:
+            return ""
+        return f" ~{latency.mean * 1e3:.1f}ms"
+
     graph.v_labels = {k: map_vertex_label(v) for k, v in graph.v_labels.items()}
-    graph.e_labels = {k: str(mapped_process_id) + (f' [{total_cnt}]' if total_cnt == cnt else f' [{cnt}/{total_cnt}]') for
-                      k, (v, cnt, total_cnt) in graph.e_labels.items() for mapped_process_id in
+    graph.e_labels = {k: str(mapped_process_id) + (f' [{total_cnt}]' if total_cnt == cnt else f' [{cnt}/{total_cnt}]') +
+                      "".join(map_latency(x) for x in latency) for
+                      k, (v, cnt, total_cnt, *latency) in graph.e_labels.items() for mapped_process_id in
                       [process_id_map.get(int(v), v)]}
     return graph
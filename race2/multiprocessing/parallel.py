@@ -0,0 +1,343 @@
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Generator
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Visitor, ExecutionState, ProcessID, Path, ExecutionFactory, Invariant, Violation, Discovery
+from race2.frontier import ROOT
+from race2.stats import Stats, LatencyHistogram
+
+_LOG = logging.getLogger(__name__)
+
+Edge = tuple[ExecutionState, ProcessID, ExecutionState]
+
+
+class ChildEvent:
+    pass
+
+
+@dataclass
+class Explore(ChildEvent):
+    seed: Path
+    # edges discovered by the coordinator since the last `Explore` sent to this worker
+    edges: list[Edge]
+    symmetric_groups: list[list[ProcessID]]
+
+
+class Terminate(ChildEvent):
+    pass
+
+
+class ParentEvent:
+    pass
+
+
+@dataclass
+class Explored(ParentEvent):
+    edges: list[Edge]
+    # see `Visitor._next_sub`
+    path: Path
+    siblings: list[tuple[int, ProcessID]]
+    root_states: set[ExecutionState]
+    instantiation_ctr: int
+    edge_visit_ctr: int
+    symmetric_groups: list[list[ProcessID]]
+    violation: Violation | None
+    # time spent and steps taken by the worker
+    stats: Stats
+    edge_latencies: dict[tuple[ExecutionState, ProcessID], LatencyHistogram]
+
+
+@dataclass
+class Except(ParentEvent):
+    exception: BaseException
+
+
+@dataclass
+class _WorkerVisitor(Visitor):
+    """
+    Local view of the coordinator's `visited_edges`, used by a worker to make the same greedy decisions in
+    `next_sub` as a sequential `Visitor` would. Edges visited locally are logged to be sent back.
+    """
+
+    edge_log: list[Edge] = field(default_factory=list)
+
+    def _visit_edge(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> bool:
+        self.edge_log.append((pre_state, process_id, post_state))
+        return super()._visit_edge(pre_state, process_id, post_state)
+
+    def _sync_edge(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> None:
+        super()._visit_edge(pre_state, process_id, post_state)
+
+
+def _main_worker(
+        factory: ExecutionFactory,
+        invariants: dict[str, Invariant],
+        is_timed: bool,
+        should_push_path_fun: Callable[[Path], bool] | None,
+        should_push_view_path_fun: Callable[[Visitor, Path], bool] | None,
+        conn: Connection,
+) -> None:
+    vis = _WorkerVisitor(factory, invariants=invariants, is_timed=is_timed)
+
+    if should_push_view_path_fun is not None:
+        def fun(path: Path) -> bool:
+            return should_push_view_path_fun(vis, path)
+    elif should_push_path_fun is not None:
+        fun = should_push_path_fun
+    else:
+        fun = vis._can_push_path
+
+    try:
+        while True:
+            msg = conn.recv()
+
+            if isinstance(msg, Terminate):
+                return
+            elif not isinstance(msg, Explore):
+                raise AssertionError(repr(msg))
+
+            # edges are logged as visited, so they must be made canonical the same way as by the coordinator
+            if msg.symmetric_groups:
+                vis.symmetric_groups = msg.symmetric_groups
+
+            for edge in msg.edges:
+                vis._sync_edge(*edge)
+
+            vis.edge_log = []
+            vis.violation = None
+            vis.instantiation_ctr = 0
+            vis.edge_visit_ctr = 0
+            vis.stats = Stats()
+            vis.edge_latencies = {}
+
+            try:
+                path, siblings = vis._next_sub(msg.seed, fun)
+            except Exception as exc:
+                conn.send(Except(exc))
+                continue
+
+            conn.send(
+                Explored(
+                    edges=vis.edge_log,
+                    path=path,
+                    siblings=siblings,
+                    root_states=vis.root_states,
+                    instantiation_ctr=vis.instantiation_ctr,
+                    edge_visit_ctr=vis.edge_visit_ctr,
+                    symmetric_groups=vis.symmetric_groups,
+                    violation=vis.violation,
+                    stats=vis.stats,
+                    edge_latencies=vis.edge_latencies,
+                )
+            )
+    except EOFError:
+        pass
+    except BaseException:
+        _LOG.exception("_main_worker")
+
+
+@dataclass
+class _Worker:
+    process: multiprocessing.Process
+    conn: Connection
+    # how far into the coordinator's `edge_log` this worker has been synced
+    edge_log_offset: int = 0
+    seed: Path | None = None
+    seed_entry: int = ROOT
+
+
+@dataclass
+class ParallelVisitor(Visitor):
+    """
+    Shards the `frontier` across `workers` forked processes. Every worker instantiates its own executions
+    through `factory` and runs `next_sub` against a local copy of `visited_edges`, which is kept in sync
+    incrementally. Workers send back the edges they have visited, while the coordinator owns `visited_edges`
+    and decides which of the returned paths are pushed with `_can_push_path`.
+
+    As workers make their decisions on a slightly stale view of `visited_edges`, some edges may be visited more
+    than once compared to a sequential run (`edge_visit_ctr` and the visit counts), but the set of discovered
+    edges stays the same.
+
+    `should_push_path_fun` is called as is by both the workers and the coordinator, so any visitor it refers to
+    is only up-to-date in the coordinator, workers see a copy made when they were forked. A predicate that
+    needs the current view should be passed as `should_push_view_path_fun` instead, which is called with the
+    visitor owning the view as the first argument.
+    """
+
+    workers: int = multiprocessing.cpu_count()
+
+    # every newly discovered edge, in order of discovery
+    edge_log: list[Edge] = field(default_factory=list)
+
+    def __post_init__(self, is_depth_first: bool = False):
+        super().__post_init__(is_depth_first)
+
+        if self.snapshot_pool is not None:
+            raise AssertionError("snapshot_pool can not be used with ParallelVisitor")
+
+    def _visit_edge(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> bool:
+        is_new = super()._visit_edge(pre_state, process_id, post_state)
+        if is_new:
+            self.edge_log.append((pre_state, process_id, post_state))
+        return is_new
+
+    def _workers_start(
+            self,
+            should_push_path_fun: Callable[[Path], bool] | None,
+            should_push_view_path_fun: Callable[[Visitor, Path], bool] | None,
+    ) -> list[_Worker]:
+        # executions are usually built from closures, so workers must be forked instead of spawned
+        ctx = multiprocessing.get_context("fork")
+
+        rtn: list[_Worker] = []
+        for i in range(max(self.workers, 1)):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_main_worker,
+                args=(
+                    self.factory,
+                    self.invariants,
+                    self.is_timed,
+                    should_push_path_fun,
+                    should_push_view_path_fun,
+                    child_conn,
+                ),
+                name=f"race.parallel.{i}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            rtn.append(_Worker(process, parent_conn))
+        return rtn
+
+    @classmethod
+    def _workers_stop(cls, workers: list[_Worker]) -> None:
+        for worker in workers:
+            try:
+                worker.conn.send(Terminate())
+            except OSError:
+                pass
+            worker.conn.close()
+
+        for worker in workers:
+            worker.process.join()
+
+    def _worker_send(self, worker: _Worker, seed_entry: int, seed: Path) -> None:
+        worker.seed = seed
+        worker.seed_entry = seed_entry
+        worker.conn.send(Explore(seed, self.edge_log[worker.edge_log_offset:], self.symmetric_groups))
+        worker.edge_log_offset = len(self.edge_log)
+
+    def _worker_recv(self, worker: _Worker) -> None:
+        msg = worker.conn.recv()
+        seed, worker.seed = worker.seed, None
+
+        if isinstance(msg, Except):
+            raise msg.exception
+        elif not isinstance(msg, Explored):
+            raise AssertionError(repr(msg))
+
+        if self._discoveries is not None:
+            for x in msg.root_states - self.root_states:
+                self._discoveries.append(Discovery(None, None, x, x not in self.state_ids))
+
+        self.root_states |= msg.root_states
+        if msg.symmetric_groups:
+            self.symmetric_groups = msg.symmetric_groups
+        self.instantiation_ctr += msg.instantiation_ctr
+        self.edge_visit_ctr += msg.edge_visit_ctr
+        self.stats.add(msg.stats)
+
+        for edge in msg.edges:
+            self._visit_edge(*edge)
+
+        for (state, process_id), latency in msg.edge_latencies.items():
+            self._add_latency((self.intern(state), process_id), latency)
+
+        if msg.violation is not None and self.violation is None:
+            # the coordinator may know of a shorter path than the worker
+            shortest_path = self.shortest_path(msg.violation.state)
+
+            if shortest_path is not None and len(shortest_path) < len(msg.violation.path):
+                msg.violation.path = shortest_path
+
+            self.violation = msg.violation
+
+        self._push_siblings(worker.seed_entry, seed, msg.path, self._unvisited_siblings(msg.path, msg.siblings))
+
+    def next(
+            self,
+            max_iter_count: int | None = None,
+            should_push_path_fun: Callable[[Path], bool] = None,
+            should_push_view_path_fun: Callable[[Visitor, Path], bool] = None,
+    ) -> None:
+        for _ in self._run(self._explore(max_iter_count, should_push_path_fun, should_push_view_path_fun)):
+            pass
+
+    def _explore(
+            self,
+            max_iter_count: int | None = None,
+            should_push_path_fun: Callable[[Path], bool] = None,
+            should_push_view_path_fun: Callable[[Visitor, Path], bool] = None,
+    ) -> Generator[None, None, None]:
+        if should_push_path_fun is not None and should_push_view_path_fun is not None:
+            raise AssertionError("only one of should_push_path_fun and should_push_view_path_fun can be set")
+
+        if should_push_view_path_fun is not None:
+            def coordinator_fun(path: Path) -> bool:
+                return should_push_view_path_fun(self, path)
+        elif should_push_path_fun is not None:
+            coordinator_fun = should_push_path_fun
+        else:
+            coordinator_fun = self._can_push_path
+
+        workers = self._workers_start(should_push_path_fun, should_push_view_path_fun)
+
+        try:
+            idle = list(workers)
+            busy: dict[Connection, _Worker] = {}
+
+            self.paths_found_ctr += 1
+            worker = idle.pop()
+            self._worker_send(worker, ROOT, Path([]))
+            busy[worker.conn] = worker
+
+            iter_ctr = 0
+            while True:
+                for conn in wait(list(busy.keys())):
+                    worker = busy.pop(conn)
+                    self._worker_recv(worker)
+                    idle.append(worker)
+
+                self._checkpoint_due(pending=[x.seed_entry for x in busy.values()])
+                yield
+
+                while (
+                        idle
+                        and len(self.frontier)
+                        and self.violation is None
+                        and (max_iter_count is None or iter_ctr < max_iter_count)
+                ):
+                    iter_ctr += 1
+                    next_entry = self._pop_entry()
+                    next_item = self.paths.path(next_entry)
+
+                    # the same check as in `_next_once`, but against the coordinator's view
+                    if not coordinator_fun(next_item):
+                        continue
+
+                    self.paths_found_ctr += 1
+                    worker = idle.pop()
+                    self._worker_send(worker, next_entry, next_item)
+                    busy[worker.conn] = worker
+
+                if not busy:
+                    break
+        finally:
+            self._workers_stop(workers)
+
+        if self.checkpoint_path is not None:
+            self.checkpoint()
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from tblib import Traceback
 
 from race2.abstract import ProcessGenerator, StateID
+from race2.chrome_trace import trace_span
 
 _LOG = logging.getLogger(__name__)
 
@@ -247,7 +248,8 @@ class RemoteGeneratorClient:
         self.instance.in_queue.put(Reset(args=args, kwargs=kwargs))
 
         try:
-            next_item = self.instance.out_queue.get(timeout=self.instance.read_timeout)
+            with trace_span("remote.reset", "round_trip"):
+                next_item = self.instance.out_queue.get(timeout=self.instance.read_timeout)
         except Empty:
             self.instance._process_ensure_stopped()
             raise RemoteTimeoutError
@@ -262,9 +264,10 @@ class RemoteGeneratorClient:
         try:
             while True:
                 try:
-                    next_item = self.instance.out_queue.get(
-                        timeout=self.instance.read_timeout
-                    )
+                    with trace_span("remote.next", "round_trip"):
+                        next_item = self.instance.out_queue.get(
+                            timeout=self.instance.read_timeout
+                        )
                 except Empty:
                     self.instance._process_ensure_stopped()
                     raise RemoteTimeoutError
@@ -0,0 +1,382 @@
+import logging
+import os
+import signal
+import sys
+from collections import OrderedDict
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import send_handle, recv_handle
+from typing import Any
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Execution, ExecutionFactory, ExecutionState, Path, ProcessID, UniqueState
+
+_LOG = logging.getLogger(__name__)
+
+
+class ChildEvent:
+    pass
+
+
+@dataclass
+class Next(ChildEvent):
+    process_id: ProcessID
+
+
+class Fork(ChildEvent):
+    pass
+
+
+class Stop(ChildEvent):
+    pass
+
+
+class Exit(ChildEvent):
+    pass
+
+
+class ParentEvent:
+    pass
+
+
+@dataclass
+class Stepped(ParentEvent):
+    state_id: UniqueState | None
+    state: ExecutionState
+    available_processes: list[ProcessID]
+    symmetric_groups: list[list[ProcessID]]
+    global_state: Any
+
+
+@dataclass
+class Forked(ParentEvent):
+    pid: int
+
+
+class Stopped(ParentEvent):
+    pass
+
+
+@dataclass
+class Failed(ParentEvent):
+    exception: BaseException
+
+
+def _flush() -> None:
+    # buffered output would otherwise be written by every forked copy of the process
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+
+
+def _send_stepped(conn: Connection, execution: Execution, state_id: UniqueState | None) -> None:
+    conn.send(
+        Stepped(
+            state_id,
+            execution.curr_state,
+            execution.available_processes,
+            execution.symmetric_groups,
+            execution.global_state(),
+        )
+    )
+
+
+def _fork_server(execution: Execution, fd: int, close: list[Connection]) -> int:
+    _flush()
+    pid = os.fork()
+
+    if pid == 0:
+        try:
+            for x in close:
+                x.close()
+            _serve(execution, Connection(fd))
+        except BaseException:
+            _LOG.exception("_fork_server")
+        finally:
+            os._exit(0)
+
+    os.close(fd)
+    return pid
+
+
+def _serve(execution: Execution, conn: Connection) -> None:
+    """
+    Runs in a forked process and owns a single `Execution`. The process is either being stepped by the parent
+    or is parked, waiting for `Fork` requests that spawn live copies of it.
+    """
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+
+        if isinstance(msg, Next):
+            try:
+                state_id = execution.next(msg.process_id)
+            except BaseException as exc:
+                conn.send(Failed(exc))
+                return
+            _send_stepped(conn, execution, state_id)
+        elif isinstance(msg, Fork):
+            fd = recv_handle(conn)
+            conn.send(Forked(_fork_server(execution, fd, close=[conn])))
+        elif isinstance(msg, Stop):
+            try:
+                if execution.available_processes:
+                    execution.stop()
+            except BaseException as exc:
+                conn.send(Failed(exc))
+            else:
+                conn.send(Stopped())
+            return
+        elif isinstance(msg, Exit):
+            return
+        else:
+            raise AssertionError(repr(msg))
+
+
+def _recv(conn: Connection, cls: type) -> Any:
+    try:
+        msg = conn.recv()
+    except EOFError:
+        raise AssertionError("snapshot process exited unexpectedly")
+
+    if isinstance(msg, Failed):
+        raise msg.exception
+    elif not isinstance(msg, cls):
+        raise AssertionError(repr(msg))
+
+    return msg
+
+
+@dataclass
+class Snapshot:
+    """
+    A parked copy of an `Execution` living in a forked process, positioned after `path`
+    """
+
+    conn: Connection
+    pid: int
+    path: Path
+    state: ExecutionState
+    available_processes: list[ProcessID]
+    symmetric_groups: list[list[ProcessID]]
+    global_state: Any
+
+
+@dataclass
+class SnapshotExecution:
+    """
+    Parent-side proxy of an `Execution` that is running in a forked process. Implements the part of
+    the `Execution` interface used by `Visitor.next_sub`.
+    """
+
+    conn: Connection
+    pid: int
+    curr_path: Path
+    _curr_state: ExecutionState
+    available_processes: list[ProcessID]
+    symmetric_groups: list[list[ProcessID]]
+    _global_state: Any
+
+    is_closed: bool = False
+
+    @property
+    def curr_state(self) -> ExecutionState:
+        return self._curr_state
+
+    def global_state(self) -> Any:
+        # taken by the forked process after every step
+        return self._global_state
+
+    def next(self, process_id: ProcessID) -> UniqueState:
+        if process_id not in self.available_processes:
+            raise AssertionError("process id not in available processes", process_id, self.available_processes)
+
+        self.conn.send(Next(process_id))
+        msg: Stepped = _recv(self.conn, Stepped)
+
+        self.curr_path.append(process_id)
+        self._curr_state = msg.state
+        self.available_processes = msg.available_processes
+        self._global_state = msg.global_state
+        return msg.state_id
+
+    def stop(self) -> None:
+        self.conn.send(Stop())
+        self.available_processes = []
+        try:
+            _recv(self.conn, Stopped)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.is_closed:
+            return
+        self.is_closed = True
+        try:
+            self.conn.send(Exit())
+        except OSError:
+            pass
+        self.conn.close()
+
+
+@dataclass
+class SnapshotPool:
+    """
+    Executions are run in forked processes. At branching vertices `Visitor` parks a copy of the current
+    execution (`park`), and any later path sharing the prefix resumes from the parked copy instead of
+    instantiating the factory and replaying the prefix (`resume`).
+
+    Parked copies are kept in a bounded pool and evicted in LRU order. The root snapshot (the freshly
+    instantiated factory) is only evicted when the pool is closed.
+
+    Forking only snapshots the memory of the process. Any state that lives outside of it (databases, files,
+    `multiprocessing.Manager` objects, threads of `ThreadGenerator`) is shared between snapshots and would
+    make the exploration incorrect, so this should only be used with executions whose state is held in
+    memory by the generators themselves.
+    """
+
+    max_size: int = 64
+
+    snapshots: "OrderedDict[tuple[ProcessID, ...], Snapshot]" = field(default_factory=OrderedDict)
+    root_pids: set[int] = field(default_factory=set)
+
+    park_ctr: int = 0
+    evict_ctr: int = 0
+
+    def __enter__(self) -> "SnapshotPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        while self.snapshots:
+            self._evict()
+
+        for pid in self.root_pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.root_pids = set()
+
+    def _store(self, snapshot: Snapshot) -> None:
+        self.snapshots[tuple(snapshot.path)] = snapshot
+
+        while len(self.snapshots) > max(self.max_size, 1):
+            self._evict(is_root_pinned=True)
+
+    def _evict(self, is_root_pinned: bool = False) -> None:
+        key = next(k for k in self.snapshots.keys() if not is_root_pinned or k != ())
+        snapshot = self.snapshots.pop(key)
+        self.evict_ctr += 1
+        try:
+            snapshot.conn.send(Exit())
+        except OSError:
+            pass
+        snapshot.conn.close()
+
+        if snapshot.pid in self.root_pids:
+            os.waitpid(snapshot.pid, 0)
+            self.root_pids.remove(snapshot.pid)
+
+    def _instantiate(self, factory: ExecutionFactory) -> Snapshot:
+        parent_conn, child_conn = Pipe()
+        _flush()
+        pid = os.fork()
+
+        if pid == 0:
+            try:
+                parent_conn.close()
+                for x in self.snapshots.values():
+                    x.conn.close()
+                execution = factory()
+                _send_stepped(child_conn, execution, None)
+                _serve(execution, child_conn)
+            except BaseException as exc:
+                try:
+                    child_conn.send(Failed(exc))
+                except BaseException:
+                    _LOG.exception("_instantiate")
+            finally:
+                os._exit(0)
+
+        child_conn.close()
+        self.root_pids.add(pid)
+
+        try:
+            msg: Stepped = _recv(parent_conn, Stepped)
+        except BaseException:
+            parent_conn.close()
+            os.waitpid(pid, 0)
+            self.root_pids.remove(pid)
+            raise
+
+        rtn = Snapshot(
+            parent_conn, pid, Path([]), msg.state, msg.available_processes, msg.symmetric_groups, msg.global_state
+        )
+        self._store(rtn)
+        return rtn
+
+    @classmethod
+    def _fork(cls, conn: Connection, pid: int) -> tuple[Connection, int]:
+        parent_conn, child_conn = Pipe()
+        conn.send(Fork())
+        send_handle(conn, child_conn.fileno(), pid)
+        child_conn.close()
+        msg: Forked = _recv(conn, Forked)
+        return parent_conn, msg.pid
+
+    def resume(self, factory: ExecutionFactory, path: Path) -> tuple[SnapshotExecution, bool]:
+        """
+        Returns a live execution positioned at the longest parked prefix of `path`, and whether `factory` had
+        to be instantiated to get it
+        """
+        is_instantiated = False
+
+        for i in range(len(path), -1, -1):
+            key = tuple(path[:i])
+            if key in self.snapshots:
+                self.snapshots.move_to_end(key)
+                snapshot = self.snapshots[key]
+                break
+        else:
+            snapshot = self._instantiate(factory)
+            is_instantiated = True
+
+        conn, pid = self._fork(snapshot.conn, snapshot.pid)
+
+        return SnapshotExecution(
+            conn=conn,
+            pid=pid,
+            curr_path=Path(list(snapshot.path)),
+            _curr_state=snapshot.state,
+            available_processes=list(snapshot.available_processes),
+            symmetric_groups=snapshot.symmetric_groups,
+            _global_state=snapshot.global_state,
+        ), is_instantiated
+
+    def park(self, execution: SnapshotExecution) -> None:
+        key = tuple(execution.curr_path)
+
+        if key in self.snapshots:
+            self.snapshots.move_to_end(key)
+            return
+
+        if self.max_size < 2:
+            # the root snapshot is pinned, so a parked one would be evicted right away
+            return
+
+        conn, pid = self._fork(execution.conn, execution.pid)
+        self.park_ctr += 1
+        self._store(
+            Snapshot(conn, pid, Path(list(execution.curr_path)), execution.curr_state,
+                     list(execution.available_processes), execution.symmetric_groups, execution.global_state())
+        )
@@ -7,6 +7,7 @@ from typing import Optional, Any, Dict, Tuple, Callable
 
 from dataclasses import dataclass, replace
 
+from race2.chrome_trace import trace_span
 from race2.multiprocessing.remote import ReentryError, RemoteTimeoutError
 from race2.multiprocessing.yield_fun import yield_fun_set, yield_fun_clean
 
@@ -210,7 +211,8 @@ class ThreadGenerator:
         try:
             while True:
                 try:
-                    packet = self.queue_in.get(timeout=self.read_timeout)
+                    with trace_span("thread", "round_trip"):
+                        packet = self.queue_in.get(timeout=self.read_timeout)
                 except Empty:
                     self.queue_out.put(Exit())
                     self.thread_restart()
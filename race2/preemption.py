@@ -0,0 +1,141 @@
+from typing import Callable, Generator
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Visitor, ExecutionState, ProcessID, Path
+from race2.frontier import ROOT, Frontier, DepthFirst
+
+
+def is_preemption(available_processes: list[ProcessID], last_process_id: ProcessID | None,
+                  process_id: ProcessID) -> bool:
+    """
+    Switching away from the process that has taken the last step while it could still continue
+    """
+    return last_process_id is not None and process_id != last_process_id and last_process_id in available_processes
+
+
+@dataclass
+class PreemptionBoundedVisitor(Visitor):
+    """
+    Iterative context bounding (Musuvathi & Qadeer, CHESS). Only the paths with at most `max_preemptions`
+    preemptions are explored, first the ones without preemptions, then the ones with one and so on. Most
+    concurrency bugs need very few preemptions, so they are found early, while the number of paths to explore
+    grows polynomially instead of exponentially with their length.
+
+    Every bound continues from the paths the previous one has stopped at because of the bound (`deferred`),
+    so no path is explored twice. A state is not explored again if it has been reached by the same process
+    with at most as many preemptions.
+
+    The exploration is a depth-first search by default, every queued path is replayed through `factory`.
+    """
+
+    frontier: Frontier = field(default_factory=DepthFirst)
+
+    max_preemptions: int = 2
+
+    # the bound currently being explored
+    bound: int = 0
+    # the least number of preemptions a state reached through a process has been explored with
+    explored_preemptions: dict[tuple[ExecutionState, ProcessID | None], int] = field(default_factory=dict)
+    # entries of the paths ending with a preemption over the current bound, with the state they branch from
+    deferred: list[tuple[int, ExecutionState]] = field(default_factory=list)
+    # the bound a terminal state has been first reached in
+    terminal_bounds: dict[ExecutionState, int] = field(default_factory=dict)
+
+    # paths over `max_preemptions` that have not been explored
+    pruned_ctr: int = 0
+
+    def _next_once(self, entry: int, should_push_path_fun: Callable[[Path], bool]) -> None:
+        path = self.paths.path(entry)
+
+        execution = self._new_execution()
+        self.instantiation_ctr += 1
+        self.symmetric_groups = execution.symmetric_groups
+
+        self._visit_root(execution)
+
+        preemptions = 0
+        last_process_id: ProcessID | None = None
+
+        for x in path[:-1]:
+            preemptions += is_preemption(execution.available_processes, last_process_id, x)
+            self._replay_step(execution, x)
+            last_process_id = x
+
+        self.paths_found_ctr += 1
+
+        for x in path[-1:]:
+            preemptions += is_preemption(execution.available_processes, last_process_id, x)
+            self._step(execution, x)
+            last_process_id = x
+
+        siblings: list[tuple[int, ProcessID, ExecutionState]] = []
+        deferred_siblings: list[tuple[int, ProcessID, ExecutionState]] = []
+
+        while self.violation is None:
+            if not execution.available_processes:
+                self.terminal_bounds.setdefault(self.intern(execution.curr_state), self.bound)
+                break
+
+            key = execution.curr_state, last_process_id
+
+            if self.explored_preemptions.get(key, preemptions + 1) <= preemptions:
+                break
+
+            self.explored_preemptions[key] = preemptions
+
+            next_process_id: ProcessID | None = None
+
+            # continuing with the same process is preferred, as it does not cost a preemption
+            for x in sorted(execution.available_processes, key=lambda x: x != last_process_id):
+                if preemptions + is_preemption(execution.available_processes, last_process_id, x) > self.bound:
+                    if self.bound < self.max_preemptions:
+                        deferred_siblings.append((len(execution.curr_path), x, execution.curr_state))
+                    else:
+                        self.pruned_ctr += 1
+                elif next_process_id is None:
+                    next_process_id = x
+                else:
+                    siblings.append((len(execution.curr_path), x, execution.curr_state))
+
+            if next_process_id is None:
+                break
+
+            preemptions += is_preemption(execution.available_processes, last_process_id, next_process_id)
+            self._step(execution, next_process_id)
+            last_process_id = next_process_id
+
+        self._stop(execution)
+
+        self._push_siblings(entry, path, execution.curr_path, siblings)
+
+        entries = self._sibling_entries(entry, path, execution.curr_path, [(i, x) for i, x, _ in deferred_siblings])
+        self.deferred.extend((x, state) for x, (_, _, state) in zip(entries, deferred_siblings) if x is not None)
+
+    def _explore(
+            self, max_iter_count: int | None = None, should_push_path_fun: Callable[[Path], bool] = None
+    ) -> Generator[None, None, None]:
+        if should_push_path_fun is not None:
+            raise AssertionError("should_push_path_fun is not supported by PreemptionBoundedVisitor")
+
+        if not self.root_states:
+            self._push_entry(ROOT)
+
+        iter_ctr = 0
+        while True:
+            while len(self.frontier) and self.violation is None and (max_iter_count is None or iter_ctr < max_iter_count):
+                iter_ctr += 1
+                self._next_once(self._pop_entry(), should_push_path_fun)
+                self._checkpoint_due()
+                yield
+
+            if len(self.frontier) or self.violation is not None or self.bound >= self.max_preemptions:
+                break
+
+            self.bound += 1
+            for x, state in self.deferred:
+                self._push_entry(x, state)
+            self.deferred = []
+
+        if self.checkpoint_path is not None:
+            self.checkpoint()
@@ -0,0 +1,162 @@
+import enum
+import random
+import time
+from typing import Callable, Generator
+
+from dataclasses import dataclass, field
+
+from race2.abstract import Visitor, ProcessID, Path
+
+
+class Scheduler(enum.Enum):
+    # every step is taken by a process chosen uniformly at random
+    RandomWalk = "random_walk"
+    # probabilistic concurrency testing (Burckhardt et al.), see `RandomVisitor.bug_depth`
+    PCT = "pct"
+
+
+@dataclass
+class CoverageSample:
+    # seconds spent in `RandomVisitor.next`
+    elapsed: float
+    schedules: int
+    edges: int
+    states: int
+
+
+@dataclass
+class RandomVisitor(Visitor):
+    """
+    Samples schedules for state spaces that are too large to be explored exhaustively. Every schedule
+    instantiates `factory` and runs until all of the processes terminate (or `max_schedule_length` steps),
+    choosing the next process with `scheduler`. The visited edges are recorded in `visited_edges` as by `Visitor`.
+
+    With PCT, every process gets a random priority when it is first seen and the highest priority one is always
+    stepped. At `bug_depth - 1` random steps of the schedule, the priority of the process that has just been
+    stepped is lowered below all of the others. A bug that needs `bug_depth` steps to happen in a specific order
+    is found by a schedule with a probability of at least `1 / (n * k ** (bug_depth - 1))` for `n` processes and
+    `k` steps, where `k` is taken as the length of the longest schedule so far.
+
+    Sampling is reproducible for the same `seed`, as long as `factory` is deterministic.
+    """
+
+    scheduler: Scheduler = Scheduler.RandomWalk
+    seed: int | None = None
+
+    # schedules longer than this (i.e. spinning on a lock held by a process that is never stepped) are stopped
+    max_schedule_length: int = 1000
+    bug_depth: int = 3
+
+    # `next` stops after this many seconds
+    max_duration: float | None = None
+
+    rng: random.Random = field(default=None, repr=False)
+
+    # taken after every schedule
+    coverage: list[CoverageSample] = field(default_factory=list)
+
+    distinct_edge_ctr: int = 0
+    truncated_ctr: int = 0
+    longest_schedule: int = 0
+    elapsed: float = 0.0
+
+    def __post_init__(self, is_depth_first: bool = False):
+        super().__post_init__(is_depth_first)
+
+        if self.snapshot_pool is not None:
+            raise AssertionError("snapshot_pool can not be used with RandomVisitor")
+
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+
+    @property
+    def estimated_coverage(self) -> float:
+        """
+        Good-Turing estimate of the probability that the next visited edge has already been seen
+        """
+        visit_ctr = 0
+        singleton_ctr = 0
+
+        for post_states in self.visited_edges.values():
+            for count in post_states.values():
+                visit_ctr += count
+                singleton_ctr += count == 1
+
+        if not visit_ctr:
+            return 0.0
+
+        return 1.0 - singleton_ctr / visit_ctr
+
+    def _schedule(self) -> None:
+        execution = self._new_execution()
+        self.instantiation_ctr += 1
+        self.paths_found_ctr += 1
+        self.symmetric_groups = execution.symmetric_groups
+
+        self._visit_root(execution)
+
+        priorities: dict[ProcessID, float] = {}
+        change_points: dict[int, int] = {}
+
+        if self.scheduler == Scheduler.PCT:
+            length = max(self.longest_schedule, 1)
+            change_points = {
+                x: i + 1
+                for i, x in enumerate(self.rng.sample(range(1, length + 1), min(self.bug_depth - 1, length)))
+            }
+
+        step_ctr = 0
+        while self.violation is None and execution.available_processes:
+            if step_ctr >= self.max_schedule_length:
+                self.truncated_ctr += 1
+                break
+
+            if self.scheduler == Scheduler.PCT:
+                for x in execution.available_processes:
+                    if x not in priorities:
+                        priorities[x] = self.bug_depth + self.rng.random()
+
+                next_process_id = max(execution.available_processes, key=priorities.__getitem__)
+            else:
+                next_process_id = self.rng.choice(execution.available_processes)
+
+            if self._step(execution, next_process_id):
+                self.distinct_edge_ctr += 1
+
+            step_ctr += 1
+
+            if step_ctr in change_points:
+                priorities[next_process_id] = change_points[step_ctr]
+
+        self.longest_schedule = max(self.longest_schedule, step_ctr)
+
+        self._stop(execution)
+
+    def _explore(
+            self, max_iter_count: int | None = None, should_push_path_fun: Callable[[Path], bool] = None
+    ) -> Generator[None, None, None]:
+        if should_push_path_fun is not None:
+            raise AssertionError("should_push_path_fun is not supported by RandomVisitor")
+
+        if max_iter_count is None and self.max_duration is None:
+            raise AssertionError("either max_iter_count or max_duration must be set")
+
+        started_at = time.monotonic() - self.elapsed
+
+        iter_ctr = 0
+        while self.violation is None and (max_iter_count is None or iter_ctr < max_iter_count):
+            if self.max_duration is not None and self.elapsed >= self.max_duration:
+                break
+
+            iter_ctr += 1
+            self._schedule()
+            self.elapsed = time.monotonic() - started_at
+
+            self.coverage.append(
+                CoverageSample(self.elapsed, self.paths_found_ctr, self.distinct_edge_ctr, len(self.states))
+            )
+            self._checkpoint_due()
+            yield
+
+        if self.checkpoint_path is not None:
+            self.checkpoint()
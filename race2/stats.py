@@ -0,0 +1,141 @@
+import math
+from typing import Callable
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class StatsSample:
+    elapsed: float
+    paths: int
+    edges: int
+    vertices: int
+    # number of queued paths
+    frontier: int
+
+
+@dataclass
+class Stats:
+    """
+    Progress of an exploration, updated incrementally by `Visitor`. It can be polled between the steps of the
+    exploration (i.e. while `Visitor.discover` is suspended), or `callback` is called with it every time a sample
+    is taken.
+
+    For `ParallelVisitor`, the time spent and the steps taken by the workers are summed over all of them, so the
+    time splits may be larger than `elapsed`.
+    """
+
+    # seconds spent exploring, without the time the exploration has been suspended by `Visitor.discover`
+    elapsed: float = 0.0
+    # seconds spent in the execution factory (or resuming a snapshot), `Execution.next` and `Execution.stop`
+    factory_time: float = 0.0
+    next_time: float = 0.0
+    stop_time: float = 0.0
+
+    # distinct visited edges and states
+    edges: int = 0
+    vertices: int = 0
+
+    # steps that have visited a new edge, and the ones that have only taken a known edge again (i.e. replaying the
+    # seed of a path)
+    new_steps: int = 0
+    replay_steps: int = 0
+
+    frontier: int = 0
+    max_frontier: int = 0
+
+    # taken every `sample_interval` seconds of `elapsed`
+    samples: list[StatsSample] = field(default_factory=list)
+    sample_interval: float = 1.0
+    callback: Callable[["Stats"], None] | None = field(default=None, repr=False)
+
+    def __getstate__(self) -> dict:
+        # the callback is usually a closure
+        return {**self.__dict__, "callback": None}
+
+    @property
+    def bookkeeping_time(self) -> float:
+        """
+        Seconds spent by the visitor itself
+        """
+        return self.elapsed - self.factory_time - self.next_time - self.stop_time
+
+    @property
+    def edges_per_second(self) -> float:
+        return self.edges / self.elapsed if self.elapsed else 0.0
+
+    def add(self, other: "Stats") -> None:
+        """
+        Adds the time spent and the steps taken of `other`
+        """
+        self.factory_time += other.factory_time
+        self.next_time += other.next_time
+        self.stop_time += other.stop_time
+        self.new_steps += other.new_steps
+        self.replay_steps += other.replay_steps
+
+    def tick(self, paths: int, frontier: int) -> None:
+        self.frontier = frontier
+        self.max_frontier = max(self.max_frontier, frontier)
+
+        if self.samples and self.elapsed - self.samples[-1].elapsed < self.sample_interval:
+            return
+
+        self.samples.append(StatsSample(self.elapsed, paths, self.edges, self.vertices, frontier))
+
+        if self.callback is not None:
+            self.callback(self)
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Durations in seconds, counted in buckets of powers of two microseconds: `buckets[0]` counts the durations
+    under 1us, `buckets[i]` the ones in `[2 ** (i - 1), 2 ** i)` us
+    """
+
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+    buckets: list[int] = field(default_factory=list)
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+        bucket = int(duration * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        if len(other.buckets) > len(self.buckets):
+            self.buckets.extend([0] * (len(other.buckets) - len(self.buckets)))
+        for i, x in enumerate(other.buckets):
+            self.buckets[i] += x
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the `q` quantile, in seconds
+        """
+        rank = q * self.count
+        seen = 0
+
+        for i, x in enumerate(self.buckets):
+            seen += x
+            if x and seen >= rank:
+                return min((1 << i) * 1e-6, self.max)
+
+        return self.max
@@ -0,0 +1,37 @@
+from abc import abstractmethod
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from race2.abstract import ExecutionState, ProcessID, Visitor
+
+
+class EdgeStore(Mapping):
+    """
+    Alternative storage of `Visitor.visited_edges`. It is read as the same mapping of
+    `(pre_state, process_id) -> {post_state: visit count}`, while the layout is up to the implementation.
+    Mapping values are built on access, so hot paths should use `add` and `successor` instead.
+    """
+
+    def attach(self, visitor: "Visitor") -> None:
+        """
+        Called once by the `visitor` the store is used by, i.e. to share its intern table
+        """
+
+    @abstractmethod
+    def add(self, pre_state: "ExecutionState", process_id: "ProcessID", post_state: "ExecutionState") -> bool:
+        """
+        Counts a visit of the edge
+        :return: whether the edge has not been visited before
+        """
+
+    def successor(self, state: "ExecutionState", process_id: "ProcessID") -> "ExecutionState | None":
+        """
+        The first post state visited from `state` through `process_id`
+        """
+        post_states = self.get((state, process_id))
+
+        if post_states is None:
+            return None
+
+        return next(iter(post_states))
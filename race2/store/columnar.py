@@ -0,0 +1,171 @@
+from array import array
+from typing import Iterator, TYPE_CHECKING
+
+from dataclasses import dataclass, field
+
+from race2.abstract import ExecutionState, ProcessID
+from race2.store.abstract import EdgeStore
+
+if TYPE_CHECKING:
+    from race2.abstract import Visitor
+
+_EMPTY = -1
+
+
+@dataclass(eq=False, repr=False)
+class ColumnarEdgeStore(EdgeStore):
+    """
+    Stores the edges as rows of integer columns `(src, process, dst, count)`, where `src` and `dst` are the
+    dense ids of the interned states. Rows with the same `(src, process)` are chained through `next_row`, the
+    head of every chain is found through an open-addressing hash index held in arrays as well.
+
+    An edge row costs ~40 bytes instead of the nested dicts of `Visitor.visited_edges`. The states themselves
+    are still held once each, in the vertex table that is shared with the `Visitor` as its intern table.
+    """
+
+    # vertex table, `states[state_ids[x]] == x`, shared with `Visitor.state_ids` and `Visitor.states`
+    state_ids: dict[ExecutionState, int] = field(default_factory=dict)
+    states: list[ExecutionState] = field(default_factory=list)
+
+    # process ids are stored by their index in `process_ids`
+    process_idx: dict[ProcessID, int] = field(default_factory=dict)
+    process_ids: list[ProcessID] = field(default_factory=list)
+
+    # edge table
+    src: array = field(default_factory=lambda: array("q"))
+    process: array = field(default_factory=lambda: array("i"))
+    dst: array = field(default_factory=lambda: array("q"))
+    count: array = field(default_factory=lambda: array("q"))
+    next_row: array = field(default_factory=lambda: array("q"))
+
+    # hash index of `(src, process)` -> head row of the chain
+    index_keys: array = field(default_factory=lambda: array("q", [_EMPTY] * 1024))
+    index_rows: array = field(default_factory=lambda: array("q", [_EMPTY] * 1024))
+    index_size: int = 0
+
+    def attach(self, visitor: "Visitor") -> None:
+        visitor.state_ids = self.state_ids
+        visitor.states = self.states
+
+    def state_id(self, state: ExecutionState) -> int:
+        rtn = self.state_ids.get(state)
+        if rtn is None:
+            rtn = self.state_ids[state] = len(self.states)
+            self.states.append(state)
+        return rtn
+
+    def _process_idx(self, process_id: ProcessID) -> int:
+        rtn = self.process_idx.get(process_id)
+        if rtn is None:
+            rtn = self.process_idx[process_id] = len(self.process_ids)
+            self.process_ids.append(process_id)
+        return rtn
+
+    def _key(self, src: int, process: int) -> int:
+        return src * (1 << 20) + process
+
+    def _slot(self, key: int) -> int:
+        mask = len(self.index_keys) - 1
+        # fibonacci hashing, the low bits of the key are the process and are mostly the same
+        slot = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - mask.bit_length())
+
+        while True:
+            curr_key = self.index_keys[slot]
+            if curr_key == key or curr_key == _EMPTY:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _grow(self) -> None:
+        index_keys, index_rows = self.index_keys, self.index_rows
+        self.index_keys = array("q", [_EMPTY]) * (len(index_keys) * 2)
+        self.index_rows = array("q", [_EMPTY]) * (len(index_keys) * 2)
+
+        for key, row in zip(index_keys, index_rows):
+            if key != _EMPTY:
+                slot = self._slot(key)
+                self.index_keys[slot] = key
+                self.index_rows[slot] = row
+
+    def _head(self, state: ExecutionState, process_id: ProcessID) -> int:
+        src = self.state_ids.get(state)
+        process = self.process_idx.get(process_id)
+
+        if src is None or process is None:
+            return _EMPTY
+
+        return self.index_rows[self._slot(self._key(src, process))]
+
+    def add(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> bool:
+        src = self.state_id(pre_state)
+        dst = self.state_id(post_state)
+        process = self._process_idx(process_id)
+
+        if process >= 1 << 20:
+            raise AssertionError("too many processes", process)
+
+        key = self._key(src, process)
+        slot = self._slot(key)
+        head = self.index_rows[slot]
+
+        row = head
+        while row != _EMPTY:
+            if self.dst[row] == dst:
+                self.count[row] += 1
+                return False
+            row = self.next_row[row]
+
+        row = len(self.src)
+        self.src.append(src)
+        self.process.append(process)
+        self.dst.append(dst)
+        self.count.append(1)
+        self.next_row.append(head)
+
+        self.index_rows[slot] = row
+
+        if head == _EMPTY:
+            self.index_keys[slot] = key
+            self.index_size += 1
+
+            if self.index_size * 2 > len(self.index_keys):
+                self._grow()
+
+        return True
+
+    def _chain(self, head: int) -> list[int]:
+        rtn = []
+        row = head
+        while row != _EMPTY:
+            rtn.append(row)
+            row = self.next_row[row]
+        # rows are prepended to the chain
+        rtn.reverse()
+        return rtn
+
+    def successor(self, state: ExecutionState, process_id: ProcessID) -> ExecutionState | None:
+        head = self._head(state, process_id)
+
+        if head == _EMPTY:
+            return None
+
+        return self.states[self.dst[self._chain(head)[0]]]
+
+    def __getitem__(self, key: tuple[ExecutionState, ProcessID]) -> dict[ExecutionState, int]:
+        head = self._head(*key)
+
+        if head == _EMPTY:
+            raise KeyError(key)
+
+        return {self.states[self.dst[row]]: self.count[row] for row in self._chain(head)}
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, tuple) and len(key) == 2 and self._head(*key) != _EMPTY
+
+    def __iter__(self) -> Iterator[tuple[ExecutionState, ProcessID]]:
+        for row in range(len(self.src)):
+            # the first row of a chain is at its end
+            if self.next_row[row] == _EMPTY:
+                yield self.states[self.src[row]], self.process_ids[self.process[row]]
+
+    def __len__(self) -> int:
+        return self.index_size
@@ -0,0 +1,305 @@
+import hashlib
+import pickle
+import sqlite3
+from collections import OrderedDict
+from typing import Iterator, TYPE_CHECKING, Any, Hashable
+
+from dataclasses import dataclass, field
+
+from race2.abstract import ExecutionState, ProcessID
+from race2.store.abstract import EdgeStore
+
+if TYPE_CHECKING:
+    from race2.abstract import Visitor
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS states (id INTEGER PRIMARY KEY, digest INTEGER NOT NULL, data BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS states_digest ON states (digest);
+CREATE TABLE IF NOT EXISTS edges (
+    src INTEGER NOT NULL, process INTEGER NOT NULL, dst INTEGER NOT NULL, count INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS edges_key ON edges (src, process, dst);
+"""
+
+
+class _LRU:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.items: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        rtn = self.items.get(key)
+        if rtn is not None:
+            self.items.move_to_end(key)
+        return rtn
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+
+
+def _digest(state: ExecutionState) -> int:
+    # stable between interpreters, unlike `hash`. Exceptions are equal by their type only, see `ExecutionState.__eq__`
+    items = tuple(
+        (k, (type(v).__module__, type(v).__qualname__) if isinstance(v, BaseException) else v)
+        for k, v in state.items
+    )
+    return int.from_bytes(hashlib.blake2b(pickle.dumps(items, protocol=4), digest_size=8).digest(), "big", signed=True)
+
+
+class _StateIds:
+    """
+    `Visitor.state_ids` backed by the store, `state_ids[x] = i` stores the state
+    """
+
+    def __init__(self, store: "SqliteEdgeStore"):
+        self.store = store
+
+    def get(self, state: ExecutionState, default: int | None = None) -> int | None:
+        rtn = self.store._state_id(state)
+        return default if rtn is None else rtn
+
+    def __contains__(self, state: ExecutionState) -> bool:
+        return self.store._state_id(state) is not None
+
+    def __getitem__(self, state: ExecutionState) -> int:
+        rtn = self.store._state_id(state)
+        if rtn is None:
+            raise KeyError(state)
+        return rtn
+
+    def __setitem__(self, state: ExecutionState, state_id: int) -> None:
+        self.store._add_state(state, state_id)
+
+    def __len__(self) -> int:
+        return self.store.state_ctr
+
+
+class _States:
+    """
+    `Visitor.states` backed by the store, states are added through `_StateIds`, so `append` only checks that
+    """
+
+    def __init__(self, store: "SqliteEdgeStore"):
+        self.store = store
+
+    def __getitem__(self, state_id: int) -> ExecutionState:
+        if state_id < 0:
+            state_id += self.store.state_ctr
+        if not 0 <= state_id < self.store.state_ctr:
+            raise IndexError(state_id)
+        return self.store._state(state_id)
+
+    def append(self, state: ExecutionState) -> None:
+        if self.store._state_id(state) != self.store.state_ctr - 1:
+            raise AssertionError("states are added through state_ids")
+
+    def __len__(self) -> int:
+        return self.store.state_ctr
+
+    def __iter__(self) -> Iterator[ExecutionState]:
+        for i in range(self.store.state_ctr):
+            yield self.store._state(i)
+
+
+@dataclass(eq=False, repr=False)
+class SqliteEdgeStore(EdgeStore):
+    """
+    Keeps the interned states and the edges in an sqlite3 database at `path`, for state graphs that do not fit in
+    memory. Recently used states, ids and successors are held by in-memory LRU caches of `cache_size` entries
+    each, the rest is paged in by sqlite. The store is shared with the `Visitor` as its intern table, so
+    `visited_edges`, `states` and `state_ids` all go through the database.
+
+    States are identified by a digest of their pickle, so their values must pickle the same when they are equal.
+    Writes are committed every `commit_every` new edges and states, or with `commit`.
+
+    Pickling the store (i.e. by `Visitor.checkpoint`) commits it and records its size. When it is loaded again, the
+    edges and states added after that are removed, so that it matches the rest of the checkpoint. A new store
+    empties an existing database at `path` the same way.
+    """
+
+    path: str
+    cache_size: int = 1 << 16
+    commit_every: int = 1 << 12
+
+    state_ctr: int = 0
+    edge_ctr: int = 0
+    key_ctr: int = 0
+
+    conn: sqlite3.Connection = field(default=None, repr=False)
+
+    state_ids: _StateIds = field(default=None, repr=False)
+    states: _States = field(default=None, repr=False)
+
+    _id_cache: _LRU = field(default=None, repr=False)
+    _state_cache: _LRU = field(default=None, repr=False)
+    # `(src, process)` -> the id of the first post state
+    _successor_cache: _LRU = field(default=None, repr=False)
+    _uncommitted_ctr: int = field(default=0, repr=False)
+
+    def __post_init__(self):
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+
+        self.state_ids = _StateIds(self)
+        self.states = _States(self)
+
+        self._id_cache = _LRU(self.cache_size)
+        self._state_cache = _LRU(self.cache_size)
+        self._successor_cache = _LRU(self.cache_size)
+
+        # rows added after the store has been pickled
+        self.conn.execute("DELETE FROM states WHERE id >= ?", (self.state_ctr,))
+        self.conn.execute("DELETE FROM edges WHERE rowid > ?", (self.edge_ctr,))
+        self.conn.commit()
+
+    def __getstate__(self) -> dict:
+        self.commit()
+        return {
+            "path": self.path,
+            "cache_size": self.cache_size,
+            "commit_every": self.commit_every,
+            "state_ctr": self.state_ctr,
+            "edge_ctr": self.edge_ctr,
+            "key_ctr": self.key_ctr,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def attach(self, visitor: "Visitor") -> None:
+        visitor.state_ids = self.state_ids
+        visitor.states = self.states
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self._uncommitted_ctr = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
+
+    def _written(self) -> None:
+        self._uncommitted_ctr += 1
+        if self._uncommitted_ctr >= self.commit_every:
+            self.commit()
+
+    def _state_id(self, state: ExecutionState) -> int | None:
+        rtn = self._id_cache.get(state)
+        if rtn is not None:
+            return rtn
+
+        for state_id, data in self.conn.execute("SELECT id, data FROM states WHERE digest = ?", (_digest(state),)):
+            if pickle.loads(data) == state:
+                self._id_cache.set(state, state_id)
+                return state_id
+
+        return None
+
+    def _add_state(self, state: ExecutionState, state_id: int) -> None:
+        if state_id != self.state_ctr:
+            raise AssertionError("state ids must be dense", state_id, self.state_ctr)
+
+        self.conn.execute(
+            "INSERT INTO states (id, digest, data) VALUES (?, ?, ?)",
+            (state_id, _digest(state), pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self.state_ctr += 1
+        self._id_cache.set(state, state_id)
+        self._state_cache.set(state_id, state)
+        self._written()
+
+    def _state(self, state_id: int) -> ExecutionState:
+        rtn = self._state_cache.get(state_id)
+        if rtn is None:
+            (data,), = self.conn.execute("SELECT data FROM states WHERE id = ?", (state_id,))
+            rtn = pickle.loads(data)
+            self._state_cache.set(state_id, rtn)
+        return rtn
+
+    def state_id(self, state: ExecutionState) -> int:
+        rtn = self._state_id(state)
+        if rtn is None:
+            rtn = self.state_ctr
+            self._add_state(state, rtn)
+        return rtn
+
+    def add(self, pre_state: ExecutionState, process_id: ProcessID, post_state: ExecutionState) -> bool:
+        src = self.state_id(pre_state)
+        dst = self.state_id(post_state)
+
+        cursor = self.conn.execute(
+            "UPDATE edges SET count = count + 1 WHERE src = ? AND process = ? AND dst = ?", (src, process_id, dst)
+        )
+        if cursor.rowcount:
+            return False
+
+        if self._successor(src, process_id) is None:
+            self._successor_cache.set((src, process_id), dst)
+            self.key_ctr += 1
+
+        self.conn.execute("INSERT INTO edges (src, process, dst, count) VALUES (?, ?, ?, 1)", (src, process_id, dst))
+        self.edge_ctr += 1
+        self._written()
+        return True
+
+    def _successor(self, src: int, process_id: ProcessID) -> int | None:
+        rtn = self._successor_cache.get((src, process_id))
+        if rtn is not None:
+            return rtn
+
+        for (rtn,) in self.conn.execute(
+                "SELECT dst FROM edges WHERE src = ? AND process = ? ORDER BY rowid LIMIT 1", (src, process_id)
+        ):
+            self._successor_cache.set((src, process_id), rtn)
+            return rtn
+
+        return None
+
+    def successor(self, state: ExecutionState, process_id: ProcessID) -> ExecutionState | None:
+        src = self._state_id(state)
+
+        if src is None:
+            return None
+
+        dst = self._successor(src, process_id)
+
+        if dst is None:
+            return None
+
+        return self._state(dst)
+
+    def __getitem__(self, key: tuple[ExecutionState, ProcessID]) -> dict[ExecutionState, int]:
+        state, process_id = key
+        src = self._state_id(state)
+
+        rows = [] if src is None else self.conn.execute(
+            "SELECT dst, count FROM edges WHERE src = ? AND process = ? ORDER BY rowid", (src, process_id)
+        ).fetchall()
+
+        if not rows:
+            raise KeyError(key)
+
+        return {self._state(dst): count for dst, count in rows}
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 2:
+            return False
+
+        src = self._state_id(key[0])
+        return src is not None and self._successor(src, key[1]) is not None
+
+    def __iter__(self) -> Iterator[tuple[ExecutionState, ProcessID]]:
+        rows = self.conn.execute(
+            "SELECT src, process FROM edges GROUP BY src, process ORDER BY MIN(rowid)"
+        ).fetchall()
+
+        for src, process_id in rows:
+            yield self._state(src), ProcessID(process_id)
+
+    def __len__(self) -> int:
+        return self.key_ctr
@@ -0,0 +1,3 @@
+from race2_benchmarks.run import main
+
+main()
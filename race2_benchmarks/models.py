@@ -0,0 +1,89 @@
+"""
+Parameterized models for the benchmarks, each returns an `ExecutionFactory`
+"""
+
+from race2.abstract import Execution, ExecutionFactory, ProcessID, ProcessGenerator
+
+
+def steps_factory(steps: int, processes: int = 2) -> ExecutionFactory:
+    """
+    Independent processes of `steps` steps each, the state graph is a grid of `(steps + 2) ** processes` vertices
+    """
+
+    def thread_fun() -> ProcessGenerator:
+        yield from range(steps)
+
+    def factory() -> Execution:
+        rtn = Execution()
+        for i in range(processes):
+            rtn.add_process(ProcessID(i), thread_fun())
+        return rtn
+
+    return factory
+
+
+def branching_factory(width: int, steps: int = 6, processes: int = 2) -> ExecutionFactory:
+    """
+    Processes that mix their id into a shared value at every step and yield it modulo `width`, so that every
+    vertex of `steps_factory` is split into up to `width` vertices depending on the interleaving
+    """
+
+    def factory() -> Execution:
+        shared = [0]
+
+        def thread_fun(process_id: int) -> ProcessGenerator:
+            for i in range(steps):
+                shared[0] = (shared[0] * 31 + process_id + 1) % width
+                yield i, shared[0]
+
+        rtn = Execution()
+        for i in range(processes):
+            rtn.add_process(ProcessID(i), thread_fun(i))
+        return rtn
+
+    return factory
+
+
+def infinite_factory(period: int, processes: int = 2) -> ExecutionFactory:
+    """
+    Processes that never terminate and cycle through `period` states, the exploration ends once every state of the
+    cycle product has been seen
+    """
+
+    def thread_fun() -> ProcessGenerator:
+        i = 0
+        while True:
+            yield i % period
+            i += 1
+
+    def factory() -> Execution:
+        rtn = Execution()
+        for i in range(processes):
+            rtn.add_process(ProcessID(i), thread_fun())
+        return rtn
+
+    return factory
+
+
+def exception_factory(steps: int, every: int = 3, processes: int = 2) -> ExecutionFactory:
+    """
+    Processes of `steps` steps that raise whenever they reach a multiple of `every` steps at the same time as
+    another process, so that the paths end in exception states all over the grid of `steps_factory`
+    """
+
+    def factory() -> Execution:
+        progress = [0] * processes
+
+        def thread_fun(process_id: int) -> ProcessGenerator:
+            for i in range(1, steps + 1):
+                progress[process_id] = i
+                if i % every == 0 and any(x == i for j, x in enumerate(progress) if j != process_id):
+                    raise ValueError(process_id, i)
+                yield i
+
+        rtn = Execution()
+        for i in range(processes):
+            rtn.add_process(ProcessID(i), thread_fun(i))
+        return rtn
+
+    return factory
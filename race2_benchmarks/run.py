@@ -0,0 +1,287 @@
+"""
+Measures the throughput and the peak memory of `Visitor` over parameter sweeps of `race2_benchmarks.models`:
+
+    python -m race2_benchmarks --output new.json --compare old.json
+
+Every point of a sweep runs in a forked process, so that its peak RSS is not shared with the other points. The
+elapsed time of a point is the best of `--repeat` runs.
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Any
+
+from dataclasses import dataclass
+
+from race2.abstract import Visitor, ExecutionFactory
+from race2_benchmarks.models import steps_factory, branching_factory, infinite_factory, exception_factory
+
+
+@dataclass
+class Suite:
+    model: Callable[[int], ExecutionFactory]
+    # name of the swept parameter
+    param: str
+    values: list[int]
+
+
+SUITES: dict[str, Suite] = {
+    "steps": Suite(steps_factory, "steps", [10, 20, 40, 80]),
+    "processes": Suite(lambda x: steps_factory(3, processes=x), "processes", [2, 3, 4, 5]),
+    "branching": Suite(branching_factory, "width", [1, 2, 4, 8, 16]),
+    "infinite": Suite(infinite_factory, "period", [5, 10, 20, 40]),
+    "exceptions": Suite(exception_factory, "steps", [10, 20, 40, 80]),
+}
+
+
+@dataclass
+class Result:
+    suite: str
+    param: str
+    value: int
+
+    # counters of the exploration, these must be the same between runs for the timings to be comparable
+    edges: int
+    vertices: int
+    instantiations: int
+    paths: int
+    edge_visits: int
+
+    elapsed: float
+    edges_per_second: float
+    instantiations_per_second: float
+    # of the whole forked process, in KiB
+    peak_rss: int
+    # peak of the memory allocated by the exploration, in KiB, only measured with `--tracemalloc`
+    peak_traced: int | None = None
+
+    @property
+    def key(self) -> tuple[str, int]:
+        return self.suite, self.value
+
+
+def _measure(suite_name: str, value: int, repeat: int, is_traced: bool) -> Result:
+    suite = SUITES[suite_name]
+    elapsed = math.inf
+    peak_traced = None
+
+    for _ in range(max(repeat, 1)):
+        vis = Visitor(suite.model(value))
+
+        started_at = time.perf_counter()
+        vis.next()
+        elapsed = min(elapsed, time.perf_counter() - started_at)
+
+    if is_traced:
+        # a separate run, as tracing slows the exploration down considerably
+        vis = Visitor(suite.model(value))
+        tracemalloc.start()
+        try:
+            vis.next()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_traced = peak // 1024
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+
+    return Result(
+        suite=suite_name,
+        param=suite.param,
+        value=value,
+        edges=vis.stats.edges,
+        vertices=vis.stats.vertices,
+        instantiations=vis.instantiation_ctr,
+        paths=vis.paths_found_ctr,
+        edge_visits=vis.edge_visit_ctr,
+        elapsed=elapsed,
+        edges_per_second=vis.stats.edges / elapsed if elapsed else 0.0,
+        instantiations_per_second=vis.instantiation_ctr / elapsed if elapsed else 0.0,
+        peak_rss=peak_rss,
+        peak_traced=peak_traced,
+    )
+
+
+def _main_measure(conn: Any, suite_name: str, value: int, repeat: int, is_traced: bool) -> None:
+    try:
+        conn.send(_measure(suite_name, value, repeat, is_traced))
+    except BaseException as exc:
+        conn.send(exc)
+    finally:
+        conn.close()
+
+
+def measure(suite_name: str, value: int, repeat: int = 3, is_traced: bool = False) -> Result:
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+
+    process = ctx.Process(
+        target=_main_measure,
+        args=(child_conn, suite_name, value, repeat, is_traced),
+        name=f"race.benchmark.{suite_name}.{value}",
+    )
+    process.start()
+    child_conn.close()
+
+    try:
+        rtn = parent_conn.recv()
+    finally:
+        process.join()
+
+    if isinstance(rtn, BaseException):
+        raise rtn
+
+    return rtn
+
+
+def scaling_exponent(results: list[Result]) -> float | None:
+    """
+    Least squares slope of `log(elapsed)` over `log(edges)`, `1.0` if the time spent per edge does not depend on
+    the size of the state graph
+    """
+    points = [(math.log(x.edges), math.log(x.elapsed)) for x in results if x.edges and x.elapsed]
+
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+
+    if not var_x:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def run(suites: list[str], repeat: int = 3, is_traced: bool = False) -> dict[str, Any]:
+    results: list[Result] = []
+    curves: dict[str, dict[str, Any]] = {}
+
+    for suite_name in suites:
+        suite = SUITES[suite_name]
+        suite_results = [measure(suite_name, x, repeat, is_traced) for x in suite.values]
+        results.extend(suite_results)
+
+        curves[suite_name] = {
+            "param": suite.param,
+            "values": [x.value for x in suite_results],
+            "edges": [x.edges for x in suite_results],
+            "elapsed": [x.elapsed for x in suite_results],
+            "edges_per_second": [x.edges_per_second for x in suite_results],
+            "peak_rss": [x.peak_rss for x in suite_results],
+            "scaling_exponent": scaling_exponent(suite_results),
+        }
+
+    return {
+        "meta": _meta(repeat),
+        "results": [dataclasses.asdict(x) for x in results],
+        "curves": curves,
+    }
+
+
+def _meta(repeat: int) -> dict[str, Any]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+
+    return {
+        "created_at": time.time(),
+        "revision": revision,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+    }
+
+
+def load_results(report: dict[str, Any]) -> list[Result]:
+    return [Result(**x) for x in report["results"]]
+
+
+def compare(old: list[Result], new: list[Result]) -> list[dict[str, Any]]:
+    """
+    Ratios of the new to the old results of the same points, `counters_match` is unset if the explorations
+    themselves differ
+    """
+    old_map = {x.key: x for x in old}
+    rtn = []
+
+    for x in new:
+        y = old_map.get(x.key)
+
+        if y is None:
+            continue
+
+        rtn.append({
+            "suite": x.suite,
+            "value": x.value,
+            "counters_match": (x.edges, x.vertices, x.instantiations, x.paths, x.edge_visits) == (
+                y.edges, y.vertices, y.instantiations, y.paths, y.edge_visits
+            ),
+            "speedup": y.elapsed / x.elapsed if x.elapsed else None,
+            "peak_rss_ratio": x.peak_rss / y.peak_rss if y.peak_rss else None,
+        })
+
+    return rtn
+
+
+def _print_report(report: dict[str, Any], comparison: list[dict[str, Any]] | None) -> None:
+    speedups = {(x["suite"], x["value"]): x for x in comparison or []}
+
+    print(f"{'suite':<12} {'value':>6} {'edges':>9} {'elapsed':>9} {'edges/s':>10} {'inst/s':>9} {'rss KiB':>9}"
+          + ("  speedup" if comparison is not None else ""), file=sys.stderr)
+
+    for x in report["results"]:
+        line = (
+            f"{x['suite']:<12} {x['value']:>6} {x['edges']:>9} {x['elapsed']:>9.4f} {x['edges_per_second']:>10.0f} "
+            f"{x['instantiations_per_second']:>9.0f} {x['peak_rss']:>9}"
+        )
+
+        cmp = speedups.get((x["suite"], x["value"]))
+        if cmp is not None:
+            line += f"  {cmp['speedup']:>6.2f}x" + ("" if cmp["counters_match"] else " (counters differ)")
+
+        print(line, file=sys.stderr)
+
+    for name, curve in report["curves"].items():
+        if curve["scaling_exponent"] is not None:
+            print(f"{name}: elapsed ~ edges ^ {curve['scaling_exponent']:.2f}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m race2_benchmarks", description=__doc__)
+    parser.add_argument("--suite", action="append", choices=list(SUITES), help="all of them if not set")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tracemalloc", action="store_true", help="also measure the peak of allocated memory")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+
+    report = run(args.suite or list(SUITES), repeat=args.repeat, is_traced=args.tracemalloc)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare) as fobj:
+            comparison = compare(load_results(json.load(fobj)), load_results(report))
+        report["comparison"] = comparison
+
+    if args.output:
+        with open(args.output, "w") as fobj:
+            json.dump(report, fobj, indent=2)
+
+    _print_report(report, comparison)
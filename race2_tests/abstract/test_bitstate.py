@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from race2.abstract import Visitor
+from race2.bitstate import BitstateVisitor
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestBitstate(TestCase):
+    def test_same_edges(self):
+        for count in [2, 3]:
+            with self.subTest(count=count):
+                vis = Visitor(lambda: cas_spinlock_factory(count))
+                vis.next()
+
+                vis_bitstate = BitstateVisitor(lambda: cas_spinlock_factory(count))
+                vis_bitstate.next()
+
+                self.assertEqual(len(vis.visited_edges), vis_bitstate.stored_ctr)
+                self.assertEqual({}, vis_bitstate.visited_edges)
+                self.assertEqual(vis.root_states, vis_bitstate.root_states)
+                self.assertLess(vis_bitstate.omission_probability, 1e-6)
+
+    def test_symmetric(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3, True))
+        vis.next()
+
+        vis_bitstate = BitstateVisitor(lambda: cas_spinlock_factory(3, True))
+        vis_bitstate.next()
+
+        self.assertEqual(len(vis.visited_edges), vis_bitstate.stored_ctr)
+
+    def test_omissions(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        vis_bitstate = BitstateVisitor(lambda: cas_spinlock_factory(3), bit_count=256, hash_count=1)
+        vis_bitstate.next()
+
+        self.assertLess(vis_bitstate.stored_ctr, len(vis.visited_edges))
+        self.assertLessEqual(vis_bitstate.bits_set_ctr, 256)
+        self.assertGreater(vis_bitstate.omission_probability, 0.5)
+        self.assertGreater(vis_bitstate.expected_omissions, 1.0)
+
+    def test_paths_released(self):
+        vis_bitstate = BitstateVisitor(lambda: cas_spinlock_factory(3))
+
+        max_paths = 0
+        for _ in vis_bitstate._run(vis_bitstate._explore()):
+            max_paths = max(max_paths, len(vis_bitstate.paths))
+
+        self.assertEqual(0, len(vis_bitstate.paths))
+        # only the queued paths are held, rather than every path explored
+        self.assertLess(max_paths, vis_bitstate.paths_found_ctr)
+
+    def test_portable_hash(self):
+        # states holding exceptions are hashed by the name of their type, rather than its id
+        code = "\n".join([
+            "from race2.abstract import ExecutionState, ProcessID",
+            "from race2.bitstate import BitstateVisitor",
+            "from race2_tests.abstract.util import cas_spinlock_factory",
+            "class Error(Exception): pass",
+            "vis = BitstateVisitor(lambda: cas_spinlock_factory(2))",
+            "print(vis._bit_indices(ExecutionState({ProcessID(0): Error(), ProcessID(1): 1}), ProcessID(1)))",
+        ])
+        env = dict(os.environ, PYTHONHASHSEED="0", PYTHONPATH=os.getcwd())
+
+        outputs = [
+            subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+            for _ in range(2)
+        ]
+        self.assertEqual(outputs[0], outputs[1])
@@ -0,0 +1,119 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution
+from race2.bitstate import BitstateVisitor
+from race2.dpor import DPORVisitor
+from race2.frontier import CoverageGuided
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2.preemption import PreemptionBoundedVisitor
+from race2.store.columnar import ColumnarEdgeStore
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class Crash(Exception):
+    pass
+
+
+def crashing_factory(count: int, after: int):
+    instantiation_ctr = 0
+
+    def factory() -> Execution:
+        nonlocal instantiation_ctr
+        instantiation_ctr += 1
+
+        if instantiation_ctr > after:
+            raise Crash()
+
+        return cas_spinlock_factory(count)
+
+    return factory
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "checkpoint")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_resume(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        kwargs = {
+            "dict": {},
+            "columnar": {"visited_edges": ColumnarEdgeStore()},
+            "coverage_guided": {"frontier": CoverageGuided()},
+        }
+
+        for name, kw in kwargs.items():
+            with self.subTest(name=name):
+                path = f"{self.path}.{name}"
+                vis_crash = Visitor(crashing_factory(3, 50), checkpoint_path=path, checkpoint_every=10, **kw)
+
+                with self.assertRaises(Crash):
+                    vis_crash.next()
+
+                vis_resumed = Visitor.resume(path, lambda: cas_spinlock_factory(3))
+
+                self.assertEqual(type(vis_crash.visited_edges), type(vis_resumed.visited_edges))
+                self.assertEqual(type(vis_crash.frontier), type(vis_resumed.frontier))
+                self.assertGreater(len(vis_resumed.frontier), 0)
+                self.assertLessEqual(vis_resumed.paths_found_ctr, vis_crash.paths_found_ctr)
+                self.assertEqual(vis_resumed.paths_found_ctr, vis_resumed.checkpoint_paths_ctr)
+
+                vis_resumed.next()
+
+                self.assertEqual(set(vis.visited_edges.keys()), set(vis_resumed.visited_edges.keys()))
+                self.assertEqual(vis.root_states, vis_resumed.root_states)
+                self.assertEqual(0, len(vis_resumed.frontier))
+
+                for x in vis_resumed.states:
+                    self.assertIs(x, vis_resumed.intern(x))
+
+    def test_final(self):
+        vis = Visitor(lambda: cas_spinlock_factory(2), checkpoint_path=self.path)
+        vis.next(max_iter_count=5)
+
+        vis_resumed = Visitor.resume(self.path, lambda: cas_spinlock_factory(2))
+
+        self.assertEqual(vis.visited_edges, vis_resumed.visited_edges)
+        self.assertEqual(list(vis.frontier), list(vis_resumed.frontier))
+        self.assertEqual(vis.edge_visit_ctr, vis_resumed.edge_visit_ctr)
+        self.assertEqual(self.path, vis_resumed.checkpoint_path)
+
+        with self.assertRaises(AssertionError):
+            BitstateVisitor.resume(self.path, lambda: cas_spinlock_factory(2))
+
+    def test_subclasses(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        for cls in [BitstateVisitor, PreemptionBoundedVisitor, ParallelVisitor]:
+            kwargs = {
+                BitstateVisitor: {},
+                PreemptionBoundedVisitor: {"max_preemptions": 10},
+                ParallelVisitor: {"workers": 2},
+            }[cls]
+
+            with self.subTest(cls=cls.__name__):
+                path = f"{self.path}.{cls.__name__}"
+                vis_crash = cls(crashing_factory(3, 50), checkpoint_path=path, checkpoint_every=10, **kwargs)
+
+                with self.assertRaises(Exception):
+                    vis_crash.next()
+
+                vis_resumed = cls.resume(path, lambda: cas_spinlock_factory(3))
+                vis_resumed.next()
+
+                if cls is BitstateVisitor:
+                    self.assertEqual(len(vis.visited_edges), vis_resumed.stored_ctr)
+                else:
+                    self.assertEqual(set(vis.visited_edges.keys()), set(vis_resumed.visited_edges.keys()))
+
+    def test_dpor(self):
+        with self.assertRaises(AssertionError):
+            DPORVisitor(lambda: cas_spinlock_factory(2), checkpoint_path=self.path)
@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID, ProcessGenerator, Path
+from race2.chrome_trace import trace_execution, EXECUTION_TID
+from race2.multiprocessing.remote import RemoteGenerator
+from race2.multiprocessing.thread import ThreadGenerator
+from race2.multiprocessing.yield_fun import yield_fun_yield
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+def remote_fun(count: int) -> ProcessGenerator:
+    for i in range(count):
+        yield i
+
+
+def thread_fun(count: int) -> None:
+    for i in range(count):
+        yield_fun_yield(i)
+
+
+class TestChromeTrace(TestCase):
+    def test_trace(self):
+        terminated = []
+
+        def factory() -> Execution:
+            rtn = cas_spinlock_factory(2)
+            rtn.handle_terminate = lambda: terminated.append(True)
+            return rtn
+
+        path = Path([ProcessID(0), ProcessID(0), ProcessID(1), ProcessID(1), ProcessID(0)])
+
+        file = io.StringIO()
+        execution = trace_execution(factory, path, file)
+        events = json.loads(file.getvalue())
+
+        self.assertEqual(path, execution.curr_path)
+        self.assertEqual([True], terminated)
+
+        steps = [x for x in events if x.get("cat") == "step"]
+        self.assertEqual(len(path), len(steps))
+        self.assertEqual(list(range(len(path))), sorted(x["args"]["step"] for x in steps))
+        self.assertEqual(2, len({x["tid"] for x in steps}))
+        self.assertNotIn(EXECUTION_TID, {x["tid"] for x in steps})
+
+        names = {x["name"] for x in events if x["tid"] == EXECUTION_TID and x["ph"] == "X"}
+        self.assertEqual({"factory", "handle_step", "handle_terminate", "stop"}, names)
+
+        track_names = [x["args"]["name"] for x in events if x["name"] == "thread_name"]
+        self.assertEqual(["execution", "process 0", "process 1"], track_names)
+
+    def test_violation(self):
+        vis = Visitor(
+            lambda: cas_spinlock_factory(2),
+            invariants={"never_locked": lambda state, _: state.states[ProcessID(0)] != 3},
+        )
+        vis.next()
+        self.assertIsNotNone(vis.violation)
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "trace.json")
+            execution = trace_execution(lambda: cas_spinlock_factory(2), vis.violation.path, path)
+
+            with open(path) as fobj:
+                events = json.load(fobj)
+
+        self.assertEqual(vis.violation.state, execution.curr_state)
+        self.assertEqual("3", [x for x in events if x.get("cat") == "step"][-1]["name"])
+
+    def test_round_trips(self):
+        with RemoteGenerator(remote_fun) as remote, ThreadGenerator(thread_fun) as thread:
+            def factory() -> Execution:
+                rtn = Execution()
+                rtn.add_process(ProcessID(0), remote(2))
+                rtn.add_process(ProcessID(1), thread(2))
+                return rtn
+
+            file = io.StringIO()
+            trace_execution(factory, Path([ProcessID(0), ProcessID(1), ProcessID(0), ProcessID(1)]), file)
+
+        events = json.loads(file.getvalue())
+        round_trips = [x for x in events if x.get("cat") == "round_trip"]
+
+        self.assertEqual({"remote.reset", "remote.next", "thread"}, {x["name"] for x in round_trips})
+        tids = {x["tid"] for x in events if x.get("cat") == "step"}
+        self.assertTrue(all(x["tid"] in tids for x in round_trips))
@@ -0,0 +1,72 @@
+import itertools
+from unittest import TestCase
+
+from race2.abstract import Visitor
+from race2.bitstate import BitstateVisitor
+from race2.dpor import DPORVisitor
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2_tests.abstract.util import cas_spinlock_factory, lost_update_factory
+
+
+class TestDiscover(TestCase):
+    def test_discover(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        vis_discover = Visitor(lambda: cas_spinlock_factory(3))
+        discoveries = list(vis_discover.discover())
+
+        roots = [x for x in discoveries if x.pre_state is None]
+        edges = [x for x in discoveries if x.pre_state is not None]
+
+        self.assertEqual(vis.root_states, {x.post_state for x in roots})
+        self.assertEqual(sum(len(x) for x in vis.visited_edges.values()), len(edges))
+        self.assertEqual(set(vis.visited_edges.keys()), {(x.pre_state, x.process_id) for x in edges})
+        self.assertEqual(len(vis.states), sum(x.is_new_state for x in discoveries))
+        self.assertTrue(any(x.is_terminal for x in edges))
+        self.assertIsNone(vis_discover._discoveries)
+
+    def test_exceptions(self):
+        vis = Visitor(lambda: lost_update_factory(2))
+
+        exceptions = [x.exceptions for x in vis.discover() if x.exceptions]
+
+        self.assertGreater(len(exceptions), 0)
+        self.assertTrue(all(isinstance(v, ValueError) for x in exceptions for v in x.values()))
+
+    def test_stop_early(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        vis_discover = Visitor(lambda: cas_spinlock_factory(3))
+        discover = vis_discover.discover()
+        first = list(itertools.islice(discover, 5))
+        discover.close()
+
+        self.assertEqual(5, len(first))
+        self.assertLess(vis_discover.paths_found_ctr, vis.paths_found_ctr)
+        self.assertIsNone(vis_discover._discoveries)
+
+        vis_discover.next()
+        self.assertEqual(set(vis.visited_edges.keys()), set(vis_discover.visited_edges.keys()))
+
+    def test_subclasses(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        for vis_discover in [
+            BitstateVisitor(lambda: cas_spinlock_factory(3)),
+            DPORVisitor(lambda: cas_spinlock_factory(3)),
+            ParallelVisitor(lambda: cas_spinlock_factory(3), workers=2),
+        ]:
+            with self.subTest(cls=type(vis_discover).__name__):
+                edges = [x for x in vis_discover.discover() if x.pre_state is not None]
+
+                if isinstance(vis_discover, BitstateVisitor):
+                    self.assertEqual(vis_discover.stored_ctr, len(edges))
+                else:
+                    self.assertEqual(
+                        sum(len(x) for x in vis_discover.visited_edges.values()),
+                        len(edges),
+                    )
+                    self.assertEqual(vis.root_states, vis_discover.root_states)
@@ -0,0 +1,102 @@
+import itertools
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID, ProcessGenerator, ExecutionState, Access, SpecialState
+from race2.dpor import DPORVisitor
+from race2_examples.util import DB
+
+
+def terminal_states(vis: Visitor) -> set[ExecutionState]:
+    return set(
+        v2
+        for v2_dict in vis.visited_edges.values()
+        for v2 in v2_dict.keys()
+        if all(x == SpecialState.Terminated for x in v2.states.values())
+    )
+
+
+def visited_states(vis: Visitor) -> set[ExecutionState]:
+    return set(v2 for v2_dict in vis.visited_edges.values() for v2 in v2_dict.keys())
+
+
+class TestDPOR(TestCase):
+    def factory_dining(self, number: int) -> Execution:
+        locks = DB()
+
+        def thread_fun(process_id: int) -> ProcessGenerator:
+            lock_id_1 = f"lock:{process_id}"
+            lock_id_2 = f"lock:{(process_id + 1) % number}"
+
+            yield Access("think")
+            while not locks.compare_and_swap(lock_id_1, None, process_id):
+                yield Access("acq-1-fail", writes={lock_id_1})
+            yield Access("acq-1", writes={lock_id_1})
+            while not locks.compare_and_swap(lock_id_2, None, process_id):
+                yield Access("acq-2-fail", writes={lock_id_2})
+            yield Access("acq-2", writes={lock_id_2})
+            assert locks.compare_and_swap(lock_id_1, process_id, None)
+            yield Access("rel-1", writes={lock_id_1})
+            assert locks.compare_and_swap(lock_id_2, process_id, None)
+            yield Access("rel-2", writes={lock_id_2})
+
+        rtn = Execution()
+        for i in range(number):
+            rtn.add_process(ProcessID(i), thread_fun(i))
+        return rtn
+
+    def factory_independent(self, number: int, steps: int) -> Execution:
+        def thread_fun(process_id: int) -> ProcessGenerator:
+            for i in range(steps):
+                yield Access(i, writes={f"var:{process_id}"})
+
+        rtn = Execution()
+        for i in range(number):
+            rtn.add_process(ProcessID(i), thread_fun(i))
+        return rtn
+
+    def test_dining_philosophers(self):
+        vis = Visitor(lambda: self.factory_dining(3))
+        vis.next()
+
+        vis_dpor = DPORVisitor(lambda: self.factory_dining(3))
+        vis_dpor.next()
+
+        self.assertLess(len(vis_dpor.visited_edges), len(vis.visited_edges))
+
+        self.assertEqual(
+            {ExecutionState({i: SpecialState.Terminated for i in range(3)})},
+            terminal_states(vis_dpor),
+        )
+        self.assertEqual(terminal_states(vis), terminal_states(vis_dpor))
+
+        deadlock_state = ExecutionState({i: "acq-2-fail" for i in range(3)})
+        self.assertIn(deadlock_state, visited_states(vis))
+        self.assertIn(deadlock_state, visited_states(vis_dpor))
+
+    def test_independent(self):
+        vis = Visitor(lambda: self.factory_independent(3, 3))
+        vis.next()
+
+        vis_dpor = DPORVisitor(lambda: self.factory_independent(3, 3))
+        vis_dpor.next()
+
+        self.assertEqual(terminal_states(vis), terminal_states(vis_dpor))
+        # every process only touches its own variable, so a single interleaving is enough
+        self.assertEqual((300, 12), (len(vis.visited_edges), len(vis_dpor.visited_edges)))
+        self.assertEqual(1, vis_dpor.instantiation_ctr)
+
+    def test_undeclared(self):
+        # without `Access` every step is dependent with every other one, which is the same as a full exploration
+        def factory() -> Execution:
+            rtn = Execution()
+            for i in range(2):
+                rtn.add_process(ProcessID(i), (x for x in itertools.repeat(1, 3)))
+            return rtn
+
+        vis = Visitor(factory)
+        vis.next()
+
+        vis_dpor = DPORVisitor(factory)
+        vis_dpor.next()
+
+        self.assertEqual(set(vis.visited_edges.keys()), set(vis_dpor.visited_edges.keys()))
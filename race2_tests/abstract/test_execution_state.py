@@ -0,0 +1,47 @@
+import pickle
+from unittest import TestCase
+
+from race2.abstract import ExecutionState, ProcessID, SpecialState, Visitor, Execution
+
+
+class TestExecutionState(TestCase):
+    def test_eq(self):
+        a = ExecutionState({ProcessID(1): 2, ProcessID(0): ValueError("a")})
+        b = ExecutionState({ProcessID(0): ValueError("b"), ProcessID(1): 2})
+
+        # exceptions are only compared by their type
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertNotEqual(a, ExecutionState({ProcessID(0): KeyError("a"), ProcessID(1): 2}))
+        self.assertNotEqual(a, ExecutionState({ProcessID(1): 2}))
+
+    def test_replace(self):
+        a = ExecutionState({ProcessID(0): SpecialState.Entry})
+        b = a.replace(ProcessID(1), 3)
+
+        self.assertEqual(ExecutionState({ProcessID(0): SpecialState.Entry}), a)
+        self.assertEqual(ExecutionState({ProcessID(0): SpecialState.Entry, ProcessID(1): 3}), b)
+        self.assertEqual(ExecutionState({ProcessID(1): 3}), b.remove(ProcessID(0)))
+        self.assertEqual([ProcessID(0), ProcessID(1)], list(b.states.keys()))
+
+        with self.assertRaises(TypeError):
+            b.states[ProcessID(0)] = 1
+
+    def test_pickle(self):
+        a = ExecutionState({ProcessID(0): "a", ProcessID(1): SpecialState.Terminated})
+        self.assertEqual(a, pickle.loads(pickle.dumps(a)))
+
+    def test_interned(self):
+        def factory() -> Execution:
+            return Execution({ProcessID(i): (x for x in range(3)) for i in range(2)})
+
+        vis = Visitor(factory)
+        vis.next()
+
+        self.assertEqual(5 * 5, len(vis.states))
+        self.assertEqual(list(range(5 * 5)), [vis.state_id(x) for x in vis.states])
+
+        for (pre_state, _), post_states in vis.visited_edges.items():
+            self.assertIs(vis.intern(pre_state), pre_state)
+            for post_state in post_states:
+                self.assertIs(vis.intern(post_state), post_state)
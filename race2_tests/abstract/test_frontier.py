@@ -0,0 +1,151 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, ProcessID
+from race2.bitstate import BitstateVisitor
+from race2.frontier import PathTable, ROOT, BreadthFirst, DepthFirst, Prioritized, CoverageGuided
+from race2.preemption import PreemptionBoundedVisitor
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestFrontier(TestCase):
+    def test_path_table(self):
+        table = PathTable()
+
+        a = table.add(ROOT, ProcessID(0))
+        b = table.add(a, ProcessID(1))
+        c = table.add(a, ProcessID(2))
+        d = table.add_path([ProcessID(1), ProcessID(0)], parent=b)
+
+        self.assertEqual([ProcessID(0), ProcessID(1)], table.path(b))
+        self.assertEqual([ProcessID(0), ProcessID(2)], table.path(c))
+        self.assertEqual([ProcessID(0), ProcessID(1), ProcessID(1), ProcessID(0)], table.path(d))
+        self.assertEqual([], table.path(ROOT))
+        self.assertEqual([ROOT, a, b], table.prefixes(b))
+        self.assertEqual(table.key(a, ProcessID(2)), table.entry_key(c))
+        self.assertNotEqual(table.entry_key(b), table.entry_key(c))
+        self.assertEqual(5, len(table))
+
+        # `b` is the parent of the rows of `d`
+        table.release(b)
+        self.assertEqual(5, len(table))
+
+        table.release(d)
+        self.assertEqual(2, len(table))
+        self.assertEqual([ProcessID(0), ProcessID(2)], table.path(c))
+
+        # released rows are reused
+        e = table.add(c, ProcessID(3))
+        self.assertEqual([ProcessID(0), ProcessID(2), ProcessID(3)], table.path(e))
+        self.assertEqual(5, len(table.parent))
+
+        # along with `c` and `a`, which are not the parent of another row anymore
+        table.release(e)
+        self.assertEqual(0, len(table))
+
+    def test_queue(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next(max_iter_count=20)
+
+        paths = [tuple(vis.paths.path(x)) for x in vis.frontier]
+
+        self.assertGreater(len(paths), 0)
+        # the same path is queued only once
+        self.assertEqual(len(set(paths)), len(paths))
+        self.assertEqual(len(vis.frontier), len(vis.queued_keys))
+        # paths share the rows of their prefixes
+        self.assertLess(len(vis.paths), sum(len(x) for x in paths))
+
+        vis.next()
+        self.assertEqual(0, len(vis.queued_keys))
+
+    def test_strategies(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        scored = []
+
+        def score(path, state):
+            scored.append((path, state))
+            return -len(path)
+
+        frontiers = {
+            "bfs": BreadthFirst,
+            "dfs": DepthFirst,
+            "priority": lambda: Prioritized(score),
+            "coverage": CoverageGuided,
+        }
+
+        for name, frontier in frontiers.items():
+            with self.subTest(name=name):
+                vis_frontier = Visitor(lambda: cas_spinlock_factory(3), frontier=frontier())
+                vis_frontier.next()
+
+                self.assertEqual(set(vis.visited_edges.keys()), set(vis_frontier.visited_edges.keys()))
+                self.assertEqual(0, len(vis_frontier.frontier))
+
+        self.assertGreater(len(scored), 0)
+        # siblings are pushed with the state they branch from
+        self.assertTrue(all(state is not None and path[-1] in state.states for path, state in scored))
+
+    def test_is_depth_first(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3), frontier=DepthFirst())
+        vis.next()
+
+        with self.assertWarns(DeprecationWarning):
+            vis_deprecated = Visitor(lambda: cas_spinlock_factory(3), is_depth_first=True)
+
+        self.assertIsInstance(vis_deprecated.frontier, DepthFirst)
+        vis_deprecated.next()
+        self.assertEqual(vis.paths_found_ctr, vis_deprecated.paths_found_ctr)
+        self.assertEqual(vis.edge_visit_ctr, vis_deprecated.edge_visit_ctr)
+
+        self.assertIsInstance(Visitor(lambda: cas_spinlock_factory(3)).frontier, BreadthFirst)
+
+        with self.assertRaises(AssertionError), self.assertWarns(DeprecationWarning):
+            Visitor(lambda: cas_spinlock_factory(3), is_depth_first=True, frontier=BreadthFirst())
+
+    def test_priority_order(self):
+        popped = []
+
+        class Recorded(Prioritized):
+            def pop(self) -> int:
+                rtn = super().pop()
+                popped.append(self.paths.path(rtn))
+                return rtn
+
+        vis = Visitor(lambda: cas_spinlock_factory(2), frontier=Recorded(lambda path, state: len(path)))
+        vis.next(max_iter_count=1)
+
+        self.assertGreater(len(vis.frontier), 1)
+        lengths = [len(vis.paths.path(x)) for x in vis.frontier]
+        self.assertEqual(sorted(lengths), lengths)
+
+        vis.next()
+        self.assertGreater(len(popped), 1)
+
+    def test_coverage_guided(self):
+        frontier = CoverageGuided()
+        vis = Visitor(lambda: cas_spinlock_factory(3), frontier=frontier)
+        vis.next()
+
+        # every newly visited edge counts the label its process has reached
+        self.assertEqual(
+            sum(len(x) for x in vis.visited_edges.values()),
+            sum(frontier.label_counts.values()),
+        )
+
+    def test_subclasses(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        for cls in [BitstateVisitor, PreemptionBoundedVisitor]:
+            for frontier in [BreadthFirst, CoverageGuided]:
+                with self.subTest(cls=cls.__name__, frontier=frontier.__name__):
+                    kwargs = {"max_preemptions": 10} if cls is PreemptionBoundedVisitor else {}
+                    vis_frontier = cls(lambda: cas_spinlock_factory(3), frontier=frontier(), **kwargs)
+                    vis_frontier.next()
+
+                    if cls is BitstateVisitor:
+                        self.assertEqual(len(vis.visited_edges), vis_frontier.stored_ctr)
+                    else:
+                        self.assertEqual(set(vis.visited_edges.keys()), set(vis_frontier.visited_edges.keys()))
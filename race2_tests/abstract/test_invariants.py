@@ -0,0 +1,108 @@
+from typing import Any
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID, ProcessGenerator, ExecutionState, Path
+from race2.bitstate import BitstateVisitor
+from race2.dpor import DPORVisitor
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2.multiprocessing.snapshot import SnapshotPool
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+def factory_racy(count: int) -> Execution:
+    # the lock is checked and taken in separate steps
+    items: dict[str, int | None] = {}
+
+    def thread_fun(lock_id: int) -> ProcessGenerator:
+        yield 1
+
+        while items.get("1") is not None:
+            yield 2
+
+        yield 3
+
+        items["1"] = lock_id
+
+        yield 4
+
+        items["1"] = None
+
+        yield 5
+
+    rtn = Execution(global_state=lambda: dict(items))
+    for i in range(count):
+        rtn.add_process(ProcessID(i), thread_fun(i))
+    return rtn
+
+
+def is_mutex(state: ExecutionState, global_state: Any) -> bool:
+    return len([x for x in state.states.values() if x == 4]) <= 1
+
+
+def is_owned(state: ExecutionState, global_state: Any) -> bool:
+    return all(global_state.get("1") == k for k, v in state.states.items() if v == 4)
+
+
+class TestInvariants(TestCase):
+    def replay(self, path: Path) -> Execution:
+        rtn = factory_racy(2)
+        for x in path:
+            rtn.next(x)
+        return rtn
+
+    def test_holds(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        vis_invariants = Visitor(lambda: cas_spinlock_factory(3), invariants={"mutex": is_mutex})
+        vis_invariants.next()
+
+        self.assertIsNone(vis_invariants.violation)
+        self.assertEqual(vis.visited_edges, vis_invariants.visited_edges)
+
+    def test_violated(self):
+        vis_full = Visitor(lambda: factory_racy(2))
+        vis_full.next()
+
+        shortest_path = min(
+            (vis_full.shortest_path(x) for (x, _) in vis_full.visited_edges.keys() if not is_mutex(x, None)),
+            key=len,
+        )
+
+        vis = Visitor(lambda: factory_racy(2), invariants={"mutex": is_mutex})
+        vis.next()
+
+        self.assertEqual("mutex", vis.violation.name)
+        self.assertFalse(is_mutex(vis.violation.state, None))
+        self.assertEqual(len(shortest_path), len(vis.violation.path))
+        self.assertEqual(vis.violation.state, self.replay(vis.violation.path).curr_state)
+        self.assertLess(len(vis.visited_edges), len(vis_full.visited_edges))
+
+    def test_global_state(self):
+        vis = Visitor(lambda: factory_racy(2), invariants={"owned": is_owned})
+        vis.next()
+
+        self.assertEqual("owned", vis.violation.name)
+
+        execution = self.replay(vis.violation.path)
+        self.assertEqual(vis.violation.global_state, execution.global_state())
+        self.assertFalse(is_owned(execution.curr_state, execution.global_state()))
+
+    def test_visitors(self):
+        with SnapshotPool() as pool:
+            visitors = {
+                "dpor": DPORVisitor(lambda: factory_racy(2)),
+                "bitstate": BitstateVisitor(lambda: factory_racy(2)),
+                "parallel": ParallelVisitor(lambda: factory_racy(2), workers=2),
+                "snapshot": Visitor(lambda: factory_racy(2), snapshot_pool=pool),
+            }
+
+            for name, vis in visitors.items():
+                with self.subTest(name=name):
+                    vis.invariants = {"mutex": is_mutex, "owned": is_owned}
+                    vis.next()
+
+                    self.assertIsNotNone(vis.violation)
+
+                    execution = self.replay(vis.violation.path)
+                    self.assertFalse(vis.invariants[vis.violation.name](execution.curr_state, execution.global_state()))
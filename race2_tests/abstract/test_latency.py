@@ -0,0 +1,80 @@
+import time
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID, ProcessGenerator
+from race2.graph.visitor import graph_from_visitor, graph_render_labels
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2.stats import LatencyHistogram
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+def slow_factory() -> Execution:
+    def slow_fun() -> ProcessGenerator:
+        yield 1
+        time.sleep(0.01)
+        yield 2
+
+    def fast_fun() -> ProcessGenerator:
+        yield 1
+        yield 2
+
+    rtn = Execution()
+    rtn.add_process(ProcessID(1), slow_fun())
+    rtn.add_process(ProcessID(2), fast_fun())
+    return rtn
+
+
+class TestLatency(TestCase):
+    def test_histogram(self):
+        hist = LatencyHistogram()
+
+        for x in [0.0000005, 0.000003, 0.000003, 0.01]:
+            hist.add(x)
+
+        self.assertEqual(4, hist.count)
+        self.assertEqual(0.0000005, hist.min)
+        self.assertEqual(0.01, hist.max)
+        self.assertEqual(4, sum(hist.buckets))
+        self.assertEqual(1, hist.buckets[0])
+        self.assertEqual(2, hist.buckets[2])
+        self.assertAlmostEqual(0.000004, hist.quantile(0.5))
+        self.assertEqual(0.01, hist.quantile(1.0))
+
+        other = LatencyHistogram()
+        other.add(0.5)
+        hist.merge(other)
+
+        self.assertEqual(5, hist.count)
+        self.assertEqual(0.5, hist.max)
+        self.assertEqual(5, sum(hist.buckets))
+
+    def test_timed(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+        self.assertEqual({}, vis.edge_latencies)
+
+        vis_timed = Visitor(lambda: cas_spinlock_factory(3), is_timed=True)
+        vis_timed.next()
+
+        self.assertEqual(set(vis_timed.visited_edges.keys()), set(vis_timed.edge_latencies.keys()))
+        self.assertEqual(
+            vis_timed.stats.new_steps + vis_timed.stats.replay_steps,
+            sum(x.count for x in vis_timed.edge_latencies.values()),
+        )
+
+    def test_slow(self):
+        for vis in [
+            Visitor(slow_factory, is_timed=True),
+            ParallelVisitor(slow_factory, is_timed=True, workers=2),
+        ]:
+            with self.subTest(cls=type(vis).__name__):
+                vis.next()
+
+                slow = {k: v for k, v in vis.edge_latencies.items() if v.min >= 0.01}
+                self.assertGreater(len(slow), 0)
+                self.assertTrue(all(process_id == 1 for _, process_id in slow))
+                self.assertEqual(set(vis.visited_edges.keys()), set(vis.edge_latencies.keys()))
+
+                graph = graph_from_visitor(vis, with_latencies=True)
+                self.assertTrue(all(len(x) == 4 for x in graph.e_labels.values()))
+                self.assertTrue(any("ms" in x for x in graph_render_labels(graph).e_labels.values()))
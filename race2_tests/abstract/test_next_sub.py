@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID
+from race2.frontier import BreadthFirst, DepthFirst
+from race2_tests.abstract.util import cas_spinlock_factory, lost_update_factory
+
+
+class TestNextSub(TestCase):
+    def test_incremental(self):
+        def factory_many() -> Execution:
+            def inner() -> int:
+                yield from range(30)
+
+            return Execution({ProcessID(i): inner() for i in range(2)})
+
+        factories = {
+            "cas_spinlock": lambda: cas_spinlock_factory(3),
+            "cas_spinlock_symmetric": lambda: cas_spinlock_factory(3, True),
+            "lost_update": lambda: lost_update_factory(3),
+            "many": factory_many,
+        }
+
+        for name, factory in factories.items():
+            for frontier in [BreadthFirst, DepthFirst]:
+                with self.subTest(name=name, frontier=frontier.__name__):
+                    vis = Visitor(factory, frontier=frontier())
+                    vis.next()
+
+                    # walks every candidate path from the root states
+                    vis_full = Visitor(factory, frontier=frontier())
+                    vis_full.next(should_push_path_fun=lambda path: vis_full._can_push_path(path))
+
+                    self.assertEqual(vis_full.visited_edges, vis.visited_edges)
+                    self.assertEqual(
+                        (vis_full.instantiation_ctr, vis_full.paths_found_ctr, vis_full.edge_visit_ctr),
+                        (vis.instantiation_ctr, vis.paths_found_ctr, vis.edge_visit_ctr),
+                    )
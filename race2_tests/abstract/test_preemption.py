@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, ProcessID, ExecutionState, SpecialState
+from race2.preemption import PreemptionBoundedVisitor
+from race2_tests.abstract.util import cas_spinlock_factory, lost_update_factory
+
+
+class TestPreemption(TestCase):
+    def test_bounds(self):
+        vis = PreemptionBoundedVisitor(lambda: lost_update_factory(2), max_preemptions=2)
+        vis.next()
+
+        terminated = SpecialState.Terminated
+        lost_update = ValueError("lost update")
+
+        self.assertEqual(
+            {
+                ExecutionState({ProcessID(0): terminated, ProcessID(1): terminated}): 0,
+                # the other process has to be preempted between reading and writing the counter
+                ExecutionState({ProcessID(0): terminated, ProcessID(1): lost_update}): 1,
+                ExecutionState({ProcessID(0): lost_update, ProcessID(1): terminated}): 1,
+            },
+            vis.terminal_bounds,
+        )
+        self.assertEqual(2, vis.bound)
+
+    def test_pruned(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        vis_bounded = PreemptionBoundedVisitor(lambda: cas_spinlock_factory(3), max_preemptions=0)
+        vis_bounded.next()
+
+        self.assertLess(len(vis_bounded.visited_edges), len(vis.visited_edges))
+        self.assertGreater(vis_bounded.pruned_ctr, 0)
+        self.assertEqual([], vis_bounded.deferred)
+
+    def test_unbounded(self):
+        for count in [2, 3]:
+            with self.subTest(count=count):
+                vis = Visitor(lambda: cas_spinlock_factory(count))
+                vis.next()
+
+                vis_bounded = PreemptionBoundedVisitor(lambda: cas_spinlock_factory(count), max_preemptions=10)
+                vis_bounded.next()
+
+                self.assertEqual(set(vis.visited_edges.keys()), set(vis_bounded.visited_edges.keys()))
+                self.assertEqual(0, vis_bounded.pruned_ctr)
@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor
+from race2.graph.visitor import graph_from_visitor
+from race2.sampling import RandomVisitor, Scheduler
+from race2_tests.abstract.util import cas_spinlock_factory, lost_update_factory
+
+
+class TestSampling(TestCase):
+    def test_reproducible(self):
+        for scheduler in Scheduler:
+            with self.subTest(scheduler=scheduler):
+                vis_a = RandomVisitor(lambda: cas_spinlock_factory(3), scheduler=scheduler, seed=7)
+                vis_a.next(50)
+
+                vis_b = RandomVisitor(lambda: cas_spinlock_factory(3), scheduler=scheduler, seed=7)
+                vis_b.next(50)
+
+                self.assertEqual(vis_a.visited_edges, vis_b.visited_edges)
+                self.assertEqual(
+                    [(x.schedules, x.edges, x.states) for x in vis_a.coverage],
+                    [(x.schedules, x.edges, x.states) for x in vis_b.coverage],
+                )
+
+    def test_coverage(self):
+        vis = Visitor(lambda: cas_spinlock_factory(2))
+        vis.next()
+
+        vis_random = RandomVisitor(lambda: cas_spinlock_factory(2), seed=1)
+        vis_random.next(500)
+
+        self.assertEqual(set(vis.visited_edges.keys()), set(vis_random.visited_edges.keys()))
+        self.assertEqual(500, len(vis_random.coverage))
+        self.assertEqual(len(vis.visited_edges), vis_random.coverage[-1].edges)
+        self.assertEqual(
+            sorted(x.edges for x in vis_random.coverage),
+            [x.edges for x in vis_random.coverage],
+        )
+        self.assertGreater(vis_random.estimated_coverage, 0.9)
+
+        graph = graph_from_visitor(vis_random)
+        self.assertEqual(len(graph_from_visitor(vis).v), len(graph.v))
+
+    def test_pct(self):
+        vis = RandomVisitor(lambda: lost_update_factory(3), scheduler=Scheduler.PCT, seed=3, bug_depth=2)
+        vis.next(200)
+
+        self.assertTrue(
+            any(
+                isinstance(x, ValueError)
+                for post_states in vis.visited_edges.values()
+                for post_state in post_states
+                for x in post_state.states.values()
+            )
+        )
+
+    def test_max_duration(self):
+        vis = RandomVisitor(lambda: cas_spinlock_factory(3), max_duration=0.2)
+        vis.next()
+
+        self.assertGreater(len(vis.coverage), 0)
+        self.assertLess(vis.elapsed, 1.0)
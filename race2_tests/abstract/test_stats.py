@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor
+from race2.dpor import DPORVisitor
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2.preemption import PreemptionBoundedVisitor
+from race2.stats import Stats
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestStats(TestCase):
+    def test_stats(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        stats = vis.stats
+        self.assertEqual(sum(len(x) for x in vis.visited_edges.values()), stats.edges)
+        self.assertEqual(len(vis.states), stats.vertices)
+        self.assertEqual(stats.vertices, len(vis.visited_vertices))
+        self.assertEqual(stats.edges, stats.new_steps)
+        self.assertEqual(vis.edge_visit_ctr, stats.new_steps + stats.replay_steps)
+        self.assertGreater(stats.max_frontier, 0)
+        self.assertEqual(0, stats.frontier)
+
+        self.assertGreater(stats.elapsed, 0)
+        self.assertGreater(stats.factory_time, 0)
+        self.assertGreater(stats.next_time, 0)
+        self.assertGreater(stats.bookkeeping_time, 0)
+        self.assertGreater(stats.edges_per_second, 0)
+
+        self.assertEqual(1, len(stats.samples))
+
+    def test_callback(self):
+        samples = []
+
+        vis = Visitor(
+            lambda: cas_spinlock_factory(3),
+            stats=Stats(sample_interval=0.0, callback=lambda x: samples.append(x.samples[-1])),
+        )
+        vis.next()
+
+        self.assertEqual(vis.stats.samples, samples)
+        # a sample is taken after every queued path, including the ones that have been visited since
+        self.assertGreaterEqual(len(samples), vis.paths_found_ctr)
+        self.assertEqual(sorted(x.edges for x in samples), [x.edges for x in samples])
+        self.assertEqual(vis.paths_found_ctr, samples[-1].paths)
+        self.assertEqual(vis.stats.max_frontier, max(x.frontier for x in samples))
+
+    def test_discover(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+
+        edges = []
+        for x in vis.discover():
+            if x.pre_state is not None:
+                edges.append(x)
+                # polled while the exploration is suspended
+                self.assertLessEqual(len(edges), vis.stats.edges)
+
+        self.assertEqual(len(edges), vis.stats.edges)
+
+    def test_subclasses(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        for vis_stats in [
+            DPORVisitor(lambda: cas_spinlock_factory(3)),
+            PreemptionBoundedVisitor(lambda: cas_spinlock_factory(3)),
+            ParallelVisitor(lambda: cas_spinlock_factory(3), workers=2),
+        ]:
+            with self.subTest(cls=type(vis_stats).__name__):
+                vis_stats.next()
+
+                self.assertEqual(sum(len(x) for x in vis_stats.visited_edges.values()), vis_stats.stats.edges)
+                self.assertEqual(len(vis_stats.visited_vertices), vis_stats.stats.vertices)
+                self.assertGreater(vis_stats.stats.next_time, 0)
+                self.assertGreater(vis_stats.stats.new_steps, 0)
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, ProcessID, ExecutionState, SpecialState
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+def visited_states(vis: Visitor) -> set[ExecutionState]:
+    return set(
+        y
+        for (v1, _), v2_dict in vis.visited_edges.items()
+        for v2 in v2_dict.keys()
+        for y in [v1, v2]
+    )
+
+
+class TestSymmetry(TestCase):
+    factory = staticmethod(cas_spinlock_factory)
+
+    def test_canonical_states(self):
+        for count in [2, 3]:
+            with self.subTest(count=count):
+                vis = Visitor(lambda: self.factory(count, False))
+                vis.next()
+
+                vis_sym = Visitor(lambda: self.factory(count, True))
+                vis_sym.next()
+
+                groups = vis_sym.symmetric_groups
+
+                canonical_states = set(
+                    x.permute(x.symmetric_permutation(groups))
+                    for x in visited_states(vis)
+                )
+
+                self.assertEqual(canonical_states, visited_states(vis_sym))
+                self.assertLess(len(vis_sym.visited_edges), len(vis.visited_edges))
+                self.assertLess(vis_sym.instantiation_ctr, vis.instantiation_ctr)
+                self.assertIn(
+                    ExecutionState({ProcessID(i): SpecialState.Terminated for i in range(count)}),
+                    visited_states(vis_sym),
+                )
+
+    def test_permutation(self):
+        state = ExecutionState({ProcessID(0): 3, ProcessID(1): 1, ProcessID(2): 1, ProcessID(3): 7})
+        groups = [[ProcessID(0), ProcessID(1), ProcessID(2)]]
+
+        self.assertEqual(
+            ExecutionState({ProcessID(0): 1, ProcessID(1): 1, ProcessID(2): 3, ProcessID(3): 7}),
+            state.permute(state.symmetric_permutation(groups)),
+        )
+
+        # any of the processes with equal states is stepped as the first one of them
+        self.assertEqual(ProcessID(0), state.symmetric_permutation(groups, ProcessID(1))[ProcessID(1)])
+        self.assertEqual(ProcessID(0), state.symmetric_permutation(groups, ProcessID(2))[ProcessID(2)])
+
+    def test_parallel(self):
+        vis = Visitor(lambda: self.factory(3, True))
+        vis.next()
+
+        vis_parallel = ParallelVisitor(lambda: self.factory(3, True), workers=2)
+        vis_parallel.next()
+
+        self.assertEqual(
+            {k: set(v.keys()) for k, v in vis.visited_edges.items()},
+            {k: set(v.keys()) for k, v in vis_parallel.visited_edges.items()},
+        )
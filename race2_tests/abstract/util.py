@@ -1 +1,49 @@
+from race2.abstract import Execution, ProcessID, ProcessGenerator
+from race2_examples.util import DB
 
+
+def cas_spinlock_factory(count: int, is_symmetric: bool = False) -> Execution:
+    # keeps all of the state in memory, so it can also be used with snapshots
+    database = DB()
+
+    def thread_fun(lock_id: int) -> ProcessGenerator:
+        yield 1
+
+        while not database.compare_and_swap("1", None, lock_id):
+            yield 2
+
+        yield 3
+
+        while not database.compare_and_swap("1", lock_id, None):
+            yield 4
+
+        yield 5
+
+    rtn = Execution()
+    for i in range(count):
+        rtn.add_process(ProcessID(i), thread_fun(i))
+    if is_symmetric:
+        rtn.symmetric_groups = [[ProcessID(i) for i in range(count)]]
+    return rtn
+
+
+def lost_update_factory(count: int) -> Execution:
+    counter = [0]
+    done = [0]
+
+    def thread_fun() -> ProcessGenerator:
+        # states must tell apart the values read and written, otherwise the lost update is merged with the
+        # ordinary interleavings
+        value = counter[0]
+        yield "read", value
+        counter[0] = value + 1
+        yield "write", value + 1
+
+        done[0] += 1
+        if done[0] == count and counter[0] != count:
+            raise ValueError("lost update")
+
+    rtn = Execution()
+    for i in range(count):
+        rtn.add_process(ProcessID(i), thread_fun())
+    return rtn
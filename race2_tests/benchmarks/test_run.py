@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from race2_benchmarks.run import SUITES, measure, compare, scaling_exponent, run, load_results
+
+
+class TestRun(TestCase):
+    def test_measure(self):
+        for name, suite in SUITES.items():
+            with self.subTest(suite=name):
+                result = measure(name, suite.values[0], repeat=1, is_traced=True)
+
+                self.assertGreater(result.edges, 0)
+                self.assertGreater(result.elapsed, 0)
+                self.assertGreater(result.peak_rss, 0)
+                self.assertGreater(result.peak_traced, 0)
+
+    def test_report(self):
+        report = run(["steps"], repeat=1)
+        results = load_results(report)
+
+        self.assertEqual(SUITES["steps"].values, [x.value for x in results])
+        self.assertEqual(sorted(x.edges for x in results), [x.edges for x in results])
+        self.assertIsNotNone(report["curves"]["steps"]["scaling_exponent"])
+
+        comparison = compare(results, results)
+        self.assertTrue(all(x["counters_match"] for x in comparison))
+        self.assertTrue(all(x["speedup"] == 1.0 for x in comparison))
+
+    def test_scaling_exponent(self):
+        results = [measure("steps", 5, repeat=1)]
+        self.assertIsNone(scaling_exponent(results))
@@ -135,3 +135,31 @@ class Test(TestCase):
         )
 
     # todo add test for recursive_replacement_vertex
+
+    def test_chain(self):
+        # cycles of 3 vertices, each with an edge into the next one
+        count = 200
+        edges = []
+        for i in range(count):
+            edges += [(3 * i, 3 * i + 1), (3 * i + 1, 3 * i + 2), (3 * i + 2, 3 * i)]
+            if i + 1 < count:
+                edges.append((3 * i + 2, 3 * i + 3))
+
+        rtn = collapse_cycles(Graph.from_adjacency_list(edges))
+
+        # the last cycle of the chain is collapsed first
+        cycle_vertex_ids = list(range(3 * count, 4 * count))
+        self.assertEqual(cycle_vertex_ids, rtn.v)
+        self.assertEqual([], collect_cycles(rtn))
+        self.assertEqual(
+            {(4 * count - 1 - i, 4 * count - 2 - i) for i in range(count - 1)},
+            {(v1, v2) for _, v1, v2 in rtn.e},
+        )
+
+        first = rtn.v_labels[3 * count]
+        self.assertEqual({3 * (count - 1) + i for i in range(3)}, set(first.cycle))
+        self.assertEqual(4, len(first.sub_graph.e))
+
+        # the sub-graph of a later cycle refers to the cycle condensed before it
+        second = rtn.v_labels[3 * count + 1]
+        self.assertIs(first, second.sub_graph.v_labels[3 * count])
@@ -46,3 +46,10 @@ class Test(TestCase):
                 )
             ],
         )
+
+    def test_deep(self):
+        # deeper than the recursion limit
+        size = 10 ** 5
+        graph = Graph.from_adjacency_list([(i, i + 1) for i in range(size)] + [(size, 0), (size, size + 1)])
+
+        self.assertEqual([list(range(size + 1))], [sorted(x) for x in collect_cycles(graph)])
@@ -0,0 +1,58 @@
+import random
+from unittest import TestCase
+
+from race2.graph import algorithm, csr
+from race2.graph.abstract import Graph
+from race2.graph.csr import CSRGraph
+
+
+def random_graph(rng: random.Random, vertices: int, edges: int) -> Graph:
+    return Graph.from_adjacency_list(
+        [(rng.randrange(vertices), rng.randrange(vertices)) for _ in range(edges)],
+        vertices=[vertices + i for i in range(3)],
+    )
+
+
+class TestCSR(TestCase):
+    def test_csr(self):
+        graph = Graph.from_adjacency_list([(3, 1), (1, 2), (2, 1), (1, 3)])
+        graph_csr = CSRGraph.from_graph(graph)
+
+        self.assertEqual(
+            graph.adjacency_dict(),
+            {
+                x: [(e, graph_csr.vertices[y]) for e, y in zip(
+                    graph_csr.edges[graph_csr.offsets[i]:graph_csr.offsets[i + 1]],
+                    graph_csr.targets[graph_csr.offsets[i]:graph_csr.offsets[i + 1]],
+                )]
+                for i, x in enumerate(graph_csr.vertices)
+            },
+        )
+        self.assertIs(graph_csr, graph_csr.reverse().reverse())
+
+    def test_same(self):
+        rng = random.Random(7)
+
+        for vertices, edges in [(1, 0), (5, 10), (30, 40), (100, 150), (200, 800)]:
+            graph = random_graph(rng, vertices, edges)
+            graph_csr = CSRGraph.from_graph(graph)
+
+            with self.subTest(vertices=vertices, edges=edges):
+                self.assertEqual(algorithm.tarjan(graph), csr.tarjan(graph_csr))
+                self.assertEqual(list(algorithm.leaves(graph)), list(csr.leaves(graph_csr)))
+                self.assertEqual(algorithm.clean_graph(graph), csr.clean_graph(graph))
+
+                for x in graph.v[:10]:
+                    self.assertEqual(algorithm.paint(graph, x), csr.paint(graph_csr, x))
+                    self.assertEqual(algorithm.paint(graph.reverse(), x), csr.reachable(graph_csr, x))
+
+    def test_deep(self):
+        # deeper than the recursion limit of `algorithm.tarjan`
+        size = 10 ** 5
+        graph = Graph.from_adjacency_list([(i, i + 1) for i in range(size)] + [(size, 0), (size, size + 1)])
+
+        sccs = csr.tarjan(graph)
+
+        self.assertEqual([[size + 1], list(range(size + 1))], [sorted(x) for x in sccs])
+        self.assertEqual([size + 1], list(csr.leaves(graph)))
+        self.assertEqual(size + 2, len(csr.reachable(graph, 0)))
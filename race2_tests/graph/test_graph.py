@@ -0,0 +1,86 @@
+import dataclasses
+from unittest import TestCase
+
+from race2.graph.abstract import Graph
+from race2.graph.algorithm import leaves, paint
+
+
+class TestGraph(TestCase):
+    def test_adjacency(self):
+        graph = Graph.from_adjacency_list([(3, 1), (1, 2), (2, 1), (1, 3)])
+
+        self.assertEqual({1: [(1, 2), (3, 3)], 2: [(2, 1)], 3: [(0, 1)]}, graph.adjacency_dict())
+        self.assertEqual(graph.reverse().adjacency_dict(), graph.reverse_adjacency_dict())
+        self.assertIs(graph.adjacency_dict(), graph.adjacency_dict())
+
+    def test_invalidate(self):
+        graph = Graph.from_adjacency_list([(1, 2)])
+        self.assertEqual({1: [(0, 2)]}, graph.adjacency_dict())
+
+        graph.add_vertex(3, "three")
+        graph.add_edge(1, 2, 3)
+        self.assertEqual({1: [(0, 2)], 2: [(1, 3)]}, graph.adjacency_dict())
+        self.assertEqual({1, 2, 3}, graph.vertex_ids)
+        self.assertEqual("three", graph.v_labels[3])
+
+        graph.e = [(0, 3, 1)]
+        self.assertEqual({3: [(0, 1)]}, graph.adjacency_dict())
+        self.assertEqual({1: [(0, 3)]}, graph.reverse_adjacency_dict())
+
+        graph.e[0] = (0, 2, 1)
+        self.assertEqual({2: [(0, 1)]}, graph.adjacency_dict())
+
+        with self.assertRaises(AssertionError):
+            graph.add_vertex(3)
+
+        with self.assertRaises(AssertionError):
+            graph.add_edge(1, 1, 4)
+
+    def test_in_place(self):
+        graph = Graph.from_adjacency_list([(1, 2), (2, 3)])
+        self.assertEqual({1: [(0, 2)], 2: [(1, 3)]}, graph.adjacency_dict())
+
+        # the same length as before
+        graph.e[0] = (0, 1, 3)
+        self.assertEqual({1: [(0, 3)], 2: [(1, 3)]}, graph.adjacency_dict())
+
+        graph.e.reverse()
+        self.assertEqual({3: [(1, 2), (0, 1)]}, graph.reverse_adjacency_dict())
+
+        del graph.e[:]
+        graph.v.remove(2)
+        self.assertEqual({}, graph.adjacency_dict())
+        self.assertEqual({1, 3}, graph.vertex_ids)
+
+        # lists are copied, so that the lists of another graph are not changed along
+        other = dataclasses.replace(graph)
+        other.v.append(4)
+        self.assertEqual({1, 3}, graph.vertex_ids)
+        self.assertEqual({1, 3, 4}, other.vertex_ids)
+
+    def test_eq(self):
+        graph = Graph.from_adjacency_list([(1, 2), (2, 3)])
+        graph.adjacency_dict()
+
+        self.assertEqual(Graph.from_adjacency_list([(1, 2), (2, 3)]), graph)
+        self.assertEqual(graph, graph.copy())
+        self.assertEqual(graph, dataclasses.replace(graph))
+
+    def test_subset(self):
+        graph = Graph.from_adjacency_list([(1, 2), (2, 3), (3, 4)], v_labels={1: "a", 4: "d"}, e_labels=["x", "y", "z"])
+
+        self.assertEqual(
+            Graph(v=[1, 2], e=[(0, 1, 2)], v_labels={1: "a"}, e_labels={0: "x"}),
+            graph.subset([1, 2]),
+        )
+
+    def test_large(self):
+        size = 10 ** 5
+        graph = Graph.from_adjacency_list([(i, i + 1) for i in range(size)] + [(size, 0)])
+
+        self.assertEqual(size + 1, len(paint(graph, 0)))
+        self.assertEqual([], list(leaves(graph)))
+
+        half = graph.map(v=lambda x: x if x % 2 else None)
+        self.assertEqual(size // 2, len(half.v))
+        self.assertEqual([], half.e)
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor
+from race2.graph.abstract import Graph
+from race2.graph.algorithm import path_from_to, paths_from_to, shortest_paths, leaves
+from race2.graph.visitor import graph_from_visitor, graph_schedule, graph_schedule_from_to
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class Test(TestCase):
+    def test_path(self):
+        graph = Graph.from_adjacency_list([(1, 2), (2, 3), (1, 3), (3, 4), (4, 1), (5, 1)])
+
+        self.assertEqual([2, 3], path_from_to(graph, 1, 4))
+        self.assertEqual([], path_from_to(graph, 1, 1))
+        self.assertEqual([4, 0], path_from_to(graph, 4, 2))
+        self.assertIsNone(path_from_to(graph, 1, 5))
+
+        self.assertEqual({4: [2, 3], 2: [0]}, paths_from_to(graph, 1, [4, 5, 2]))
+
+    def test_shortest_paths(self):
+        graph = Graph.from_adjacency_list([(i, i + 1) for i in range(1000)] + [(0, 500)])
+        paths = shortest_paths(graph, 0)
+
+        self.assertEqual(1001, len(paths.predecessors) + 1)
+        self.assertEqual(501, len(paths.path_to(1000)))
+        self.assertEqual([1000], list(paths.paths_to(leaves(graph))))
+
+        # stops once the target is reached
+        self.assertEqual(2, len(shortest_paths(graph, 0, {500}).predecessors))
+
+    def test_schedule(self):
+        vis = Visitor(lambda: cas_spinlock_factory(3))
+        vis.next()
+
+        graph = graph_from_visitor(vis)
+        root, = [k for k, v in graph.v_labels.items() if v in vis.root_states]
+
+        leaves_vertices = list(leaves(graph))
+        self.assertGreater(len(leaves_vertices), 0)
+
+        paths = shortest_paths(graph, root)
+
+        for leaf, path in paths.paths_to(leaves_vertices).items():
+            schedule = graph_schedule(graph, path)
+            self.assertEqual(schedule, graph_schedule_from_to(graph, root, leaf))
+
+            execution = cas_spinlock_factory(3)
+            execution.run(schedule)
+            self.assertEqual(graph.v_labels[leaf], execution.curr_state)
+
+            self.assertEqual(len(vis.shortest_path(graph.v_labels[leaf])), len(schedule))
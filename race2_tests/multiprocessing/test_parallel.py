@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID, ProcessGenerator
+from race2.multiprocessing.parallel import ParallelVisitor
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestParallel(TestCase):
+    factory = staticmethod(cas_spinlock_factory)
+
+    def test_same_edges(self):
+        for count, workers in [(2, 1), (2, 4), (3, 4)]:
+            with self.subTest(count=count, workers=workers):
+                vis = Visitor(lambda: self.factory(count))
+                vis.next()
+
+                vis_parallel = ParallelVisitor(lambda: self.factory(count), workers=workers)
+                vis_parallel.next()
+
+                self.assertEqual(
+                    {k: set(v.keys()) for k, v in vis.visited_edges.items()},
+                    {k: set(v.keys()) for k, v in vis_parallel.visited_edges.items()},
+                )
+                self.assertEqual(vis.root_states, vis_parallel.root_states)
+                self.assertEqual(len(vis_parallel.edge_log), sum(len(v) for v in vis_parallel.visited_edges.values()))
+
+    def test_should_push_path_fun(self):
+        vis = Visitor(lambda: self.factory(2))
+        vis.next()
+
+        # the result of a bounded exploration depends on the order of the visits
+        vis_parallel = ParallelVisitor(lambda: self.factory(2), workers=2)
+        vis_parallel.next(should_push_path_fun=lambda path: len(path) <= 6)
+
+        self.assertLess(set(vis_parallel.visited_edges.keys()), set(vis.visited_edges.keys()))
+
+        vis_view = ParallelVisitor(lambda: self.factory(2), workers=2)
+        vis_view.next(should_push_view_path_fun=lambda view, path: view._can_push_path(path))
+
+        self.assertEqual(set(vis.visited_edges.keys()), set(vis_view.visited_edges.keys()))
+
+    def test_exception(self):
+        def factory() -> Execution:
+            def fail() -> ProcessGenerator:
+                yield 1
+                raise ValueError("fail")
+
+            rtn = Execution()
+            rtn.add_process(ProcessID(0), fail())
+            rtn.add_process(ProcessID(1), fail())
+            return rtn
+
+        vis = ParallelVisitor(factory, workers=2)
+        vis.next()
+
+        vis_ref = Visitor(factory)
+        vis_ref.next()
+
+        self.assertEqual(set(vis_ref.visited_edges.keys()), set(vis.visited_edges.keys()))
+
+    def test_factory_raises(self):
+        def factory() -> Execution:
+            raise ValueError("factory")
+
+        with self.assertRaises(ValueError):
+            ParallelVisitor(factory, workers=2).next()
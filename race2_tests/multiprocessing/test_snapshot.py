@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, Execution, ProcessID, ProcessGenerator
+from race2.multiprocessing.snapshot import SnapshotPool
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestSnapshot(TestCase):
+    factory = staticmethod(cas_spinlock_factory)
+
+    def test_same_edges(self):
+        for count in [2, 3]:
+            with self.subTest(count=count):
+                vis = Visitor(lambda: self.factory(count))
+                vis.next()
+
+                with SnapshotPool(max_size=16) as pool:
+                    vis_snapshot = Visitor(lambda: self.factory(count), snapshot_pool=pool)
+                    vis_snapshot.next()
+
+                    self.assertGreater(pool.park_ctr, 0)
+
+                self.assertEqual(set(vis.visited_edges.keys()), set(vis_snapshot.visited_edges.keys()))
+                self.assertEqual(
+                    {k: set(v.keys()) for k, v in vis.visited_edges.items()},
+                    {k: set(v.keys()) for k, v in vis_snapshot.visited_edges.items()},
+                )
+                self.assertEqual(vis.root_states, vis_snapshot.root_states)
+
+                self.assertLess(vis_snapshot.instantiation_ctr, vis.instantiation_ctr)
+                self.assertLess(vis_snapshot.edge_visit_ctr, vis.edge_visit_ctr)
+                self.assertGreater(vis_snapshot.replay_saved_ctr, 0)
+                self.assertEqual(0, vis.replay_saved_ctr)
+
+    def test_eviction(self):
+        vis_ref = Visitor(lambda: self.factory(2))
+        vis_ref.next()
+
+        for max_size in [1, 2]:
+            with self.subTest(max_size=max_size):
+                with SnapshotPool(max_size=max_size) as pool:
+                    vis = Visitor(lambda: self.factory(2), snapshot_pool=pool)
+                    vis.next()
+
+                    self.assertEqual(max_size, len(pool.snapshots))
+                    self.assertEqual(1, vis.instantiation_ctr)
+
+                    if max_size == 1:
+                        # only the root snapshot fits, nothing is parked
+                        self.assertEqual(0, pool.park_ctr)
+                        self.assertEqual(0, pool.evict_ctr)
+                    else:
+                        self.assertGreater(pool.evict_ctr, 0)
+
+                self.assertEqual(0, len(pool.snapshots))
+                self.assertEqual(set(vis_ref.visited_edges.keys()), set(vis.visited_edges.keys()))
+
+    def test_exception(self):
+        def factory() -> Execution:
+            def fail() -> ProcessGenerator:
+                yield 1
+                raise ValueError("fail")
+
+            def succeed() -> ProcessGenerator:
+                yield 1
+
+            return Execution({ProcessID(0): fail(), ProcessID(1): succeed()})
+
+        with SnapshotPool() as pool:
+            vis = Visitor(factory, snapshot_pool=pool)
+            vis.next()
+
+        vis_ref = Visitor(factory)
+        vis_ref.next()
+
+        self.assertEqual(set(vis_ref.visited_edges.keys()), set(vis.visited_edges.keys()))
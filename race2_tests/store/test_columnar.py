@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from race2.abstract import Visitor, ExecutionState, ProcessID
+from race2.graph.visitor import graph_from_visitor
+from race2.store.columnar import ColumnarEdgeStore
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestColumnar(TestCase):
+    factory = staticmethod(cas_spinlock_factory)
+
+    def test_same_edges(self):
+        for count in [2, 3]:
+            with self.subTest(count=count):
+                vis = Visitor(lambda: self.factory(count))
+                vis.next()
+
+                vis_columnar = Visitor(lambda: self.factory(count), visited_edges=ColumnarEdgeStore())
+                vis_columnar.next()
+
+                self.assertEqual(vis.visited_edges, vis_columnar.visited_edges)
+                self.assertIs(vis_columnar.states, vis_columnar.visited_edges.states)
+                self.assertEqual(list(vis.visited_edges.keys()), list(vis_columnar.visited_edges.keys()))
+                self.assertEqual(
+                    (vis.instantiation_ctr, vis.paths_found_ctr, vis.edge_visit_ctr),
+                    (vis_columnar.instantiation_ctr, vis_columnar.paths_found_ctr, vis_columnar.edge_visit_ctr),
+                )
+
+                graph = graph_from_visitor(vis_columnar)
+                self.assertEqual(len(vis_columnar.visited_edges.states), len(graph.v))
+
+    def test_chain(self):
+        store = ColumnarEdgeStore()
+        self.assertEqual({}, store)
+
+        a, b, c = [ExecutionState({ProcessID(0): x}) for x in range(3)]
+
+        self.assertTrue(store.add(a, ProcessID(0), b))
+        self.assertTrue(store.add(a, ProcessID(0), c))
+        self.assertFalse(store.add(a, ProcessID(0), b))
+        self.assertTrue(store.add(a, ProcessID(1), a))
+
+        self.assertEqual({b: 2, c: 1}, store[(a, ProcessID(0))])
+        self.assertEqual(b, store.successor(a, ProcessID(0)))
+        self.assertIsNone(store.successor(b, ProcessID(0)))
+        self.assertNotIn((b, ProcessID(0)), store)
+        self.assertEqual([(a, ProcessID(0)), (a, ProcessID(1))], list(store))
+
+        # the index is resized as it fills up
+        for i in range(3000):
+            store.add(ExecutionState({ProcessID(0): i}), ProcessID(2), a)
+
+        self.assertEqual(3002, len(store))
+        self.assertEqual({a: 1}, store[(ExecutionState({ProcessID(0): 1234}), ProcessID(2))])
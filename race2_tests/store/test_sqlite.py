@@ -0,0 +1,104 @@
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+
+from race2.abstract import Visitor, ExecutionState, ProcessID
+from race2.graph.visitor import graph_from_visitor
+from race2.store.sqlite import SqliteEdgeStore
+from race2_tests.abstract.util import cas_spinlock_factory
+
+
+class TestSqlite(TestCase):
+    factory = staticmethod(cas_spinlock_factory)
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "edges.sqlite")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_same_edges(self):
+        for count, cache_size in [(2, 1 << 16), (3, 1 << 16), (3, 4)]:
+            with self.subTest(count=count, cache_size=cache_size):
+                vis = Visitor(lambda: self.factory(count))
+                vis.next()
+
+                store = SqliteEdgeStore(self.path, cache_size=cache_size)
+                vis_sqlite = Visitor(lambda: self.factory(count), visited_edges=store)
+                vis_sqlite.next()
+
+                self.assertEqual(vis.visited_edges, dict(vis_sqlite.visited_edges.items()))
+                self.assertEqual(list(vis.visited_edges.keys()), list(vis_sqlite.visited_edges.keys()))
+                self.assertEqual(list(vis.states), list(vis_sqlite.states))
+                self.assertEqual(
+                    (vis.instantiation_ctr, vis.paths_found_ctr, vis.edge_visit_ctr),
+                    (vis_sqlite.instantiation_ctr, vis_sqlite.paths_found_ctr, vis_sqlite.edge_visit_ctr),
+                )
+
+                graph = graph_from_visitor(vis_sqlite)
+                self.assertEqual(len(vis.states), len(graph.v))
+
+                store.close()
+
+    def test_edges(self):
+        store = SqliteEdgeStore(self.path)
+        self.assertEqual({}, dict(store.items()))
+
+        a, b, c = [ExecutionState({ProcessID(0): x}) for x in range(3)]
+        d = ExecutionState({ProcessID(0): ValueError("d")})
+
+        self.assertTrue(store.add(a, ProcessID(0), b))
+        self.assertTrue(store.add(a, ProcessID(0), c))
+        self.assertFalse(store.add(a, ProcessID(0), b))
+        self.assertTrue(store.add(a, ProcessID(1), d))
+        # exceptions are equal by their type
+        self.assertFalse(store.add(a, ProcessID(1), ExecutionState({ProcessID(0): ValueError("e")})))
+
+        self.assertEqual({b: 2, c: 1}, store[(a, ProcessID(0))])
+        self.assertEqual(b, store.successor(a, ProcessID(0)))
+        self.assertIsNone(store.successor(b, ProcessID(0)))
+        self.assertNotIn((b, ProcessID(0)), store)
+        self.assertIn((a, ProcessID(1)), store)
+        self.assertEqual([(a, ProcessID(0)), (a, ProcessID(1))], list(store))
+        self.assertEqual(2, len(store))
+
+    def test_pickle(self):
+        a, b, c = [ExecutionState({ProcessID(0): x}) for x in range(3)]
+
+        store = SqliteEdgeStore(self.path)
+        store.add(a, ProcessID(0), b)
+
+        data = pickle.dumps(store)
+
+        # added after the store has been pickled
+        store.add(a, ProcessID(0), c)
+        store.add(b, ProcessID(0), c)
+        store.close()
+
+        store = pickle.loads(data)
+        self.assertEqual({(a, ProcessID(0)): {b: 1}}, dict(store.items()))
+        self.assertEqual(2, len(store.states))
+        self.assertIsNone(store.state_ids.get(c))
+
+    def test_checkpoint(self):
+        vis = Visitor(lambda: self.factory(3))
+        vis.next()
+
+        checkpoint_path = os.path.join(self.dir.name, "checkpoint")
+
+        vis_sqlite = Visitor(
+            lambda: self.factory(3), visited_edges=SqliteEdgeStore(self.path), checkpoint_path=checkpoint_path
+        )
+        vis_sqlite.next(max_iter_count=20)
+        # not in the checkpoint
+        vis_sqlite.checkpoint_path = None
+        vis_sqlite.next(max_iter_count=20)
+        vis_sqlite.visited_edges.close()
+
+        vis_resumed = Visitor.resume(checkpoint_path, lambda: self.factory(3))
+        self.assertLess(len(vis_resumed.visited_edges), len(vis_sqlite.visited_edges))
+
+        vis_resumed.next()
+        self.assertEqual(set(vis.visited_edges.keys()), set(vis_resumed.visited_edges.keys()))